@@ -3,6 +3,11 @@ from app.api.credentials import router as credentials_router
 from app.api.categories import router as categories_router
 from app.api.audit_logs import router as audit_logs_router
 from app.api.export import router as export_router
+from app.api.events import router as events_router
+from app.api.reports import router as reports_router
+from app.api.jobs import router as jobs_router
+from app.api.backups import router as backups_router
+from app.api.diagnostics import router as diagnostics_router
 
 __all__ = [
     "auth_router",
@@ -10,4 +15,9 @@ __all__ = [
     "categories_router",
     "audit_logs_router",
     "export_router",
+    "events_router",
+    "reports_router",
+    "jobs_router",
+    "backups_router",
+    "diagnostics_router",
 ]
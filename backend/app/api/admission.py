@@ -0,0 +1,70 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+
+settings = get_settings()
+
+
+class AdmissionLimiter:
+    """Dependency that caps concurrent requests to an expensive route.
+
+    Up to ``limit`` requests run at once and up to ``queue_size`` more wait
+    at most ``max_wait`` seconds for a slot; anything beyond that is shed
+    with ``503 Service Unavailable`` and a ``Retry-After`` header. Limits
+    apply per worker process.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, max_wait: float):
+        self.name = name
+        self._semaphore = asyncio.Semaphore(limit)
+        self._queue_size = queue_size
+        self._max_wait = max_wait
+        self._waiting = 0
+
+    def _reject(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Too many concurrent {self.name} requests, try again later",
+            headers={"Retry-After": str(max(1, math.ceil(self._max_wait)))},
+        )
+
+    async def __call__(self):
+        if self._semaphore.locked() and self._waiting >= self._queue_size:
+            raise self._reject()
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self._max_wait)
+        except asyncio.TimeoutError:
+            raise self._reject()
+        finally:
+            self._waiting -= 1
+
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self):
+        """Wait as long as needed for a slot; for background jobs, which have no client to shed."""
+        async with self._semaphore:
+            yield
+
+
+export_limiter = AdmissionLimiter(
+    "export",
+    limit=settings.export_concurrency,
+    queue_size=settings.admission_queue_size,
+    max_wait=settings.admission_max_wait_seconds,
+)
+import_limiter = AdmissionLimiter(
+    "import",
+    limit=settings.import_concurrency,
+    queue_size=settings.admission_queue_size,
+    max_wait=settings.admission_max_wait_seconds,
+)
@@ -1,35 +1,110 @@
+import csv
+import io
+from datetime import datetime, timezone
 from typing import Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, literal, String, Select
 import math
+import orjson
 
-from app.db.database import get_db
+from app.db.database import get_db, async_session, current_engine
 from app.api.auth import verify_token
+from app.api.conditional import conditional_get
+from app.api.responses import json_response
 from app.models import AuditLog, AuditAction
-from app.schemas.audit_log import AuditLogResponse, AuditLogListResponse
+from app.schemas.audit_log import AuditLogListResponse
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 
+EXPORT_COLUMNS = ("id", "created_at", "action", "credential_id", "credential_name", "ip_address", "user_agent")
+EXPORT_BATCH_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class AuditLogFilters:
+    """Query parameters shared by the list and export endpoints."""
+
+    def __init__(
+        self,
+        action: Optional[AuditAction] = None,
+        credential_id: Optional[int] = None,
+        ip_address: Optional[str] = None,
+        from_: Optional[datetime] = Query(None, alias="from", description="Inclusive lower bound of created_at"),
+        to: Optional[datetime] = Query(None, description="Exclusive upper bound of created_at"),
+    ):
+        self.action = action
+        self.credential_id = credential_id
+        self.ip_address = ip_address
+        self.from_ = from_
+        self.to = to
+
+    def apply(self, query: Select) -> Select:
+        if self.action:
+            query = query.where(AuditLog.action == self.action)
+
+        if self.credential_id:
+            query = query.where(AuditLog.credential_id == self.credential_id)
+
+        if self.ip_address:
+            query = query.where(AuditLog.ip_address == self.ip_address)
+
+        if self.from_:
+            query = query.where(AuditLog.created_at >= time_bound(self.from_))
+
+        if self.to:
+            query = query.where(AuditLog.created_at < time_bound(self.to))
+
+        return query
+
+
+def time_bound(value: datetime):
+    """Bind a created_at bound; naive values are taken as UTC.
+
+    SQLite keeps timestamps as text, with fractional seconds only on values
+    written by the app. Whole-second bounds are bound without a fraction so
+    that rows stamped by the server default at that second compare equal.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    if current_engine().dialect.name != "sqlite":
+        return value
+    text = value.strftime("%Y-%m-%d %H:%M:%S")
+    if value.microsecond:
+        text += f".{value.microsecond:06d}"
+    return literal(text, String)
+
+
+# Built once; filters derive new statements from it
+AUDIT_LOG_ROWS = select(
+    AuditLog.id,
+    AuditLog.credential_id,
+    AuditLog.credential_name,
+    AuditLog.action,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.created_at,
+)
+
 
 @router.get("", response_model=AuditLogListResponse)
 async def list_audit_logs(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
-    action: Optional[AuditAction] = None,
-    credential_id: Optional[int] = None,
+    filters: AuditLogFilters = Depends(),
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_token),
 ):
     """List audit logs with pagination and filters."""
-    query = select(AuditLog)
-
-    # Apply filters
-    if action:
-        query = query.where(AuditLog.action == action)
+    not_modified = await conditional_get(request, response, db, "audit_logs")
+    if not_modified:
+        return not_modified
 
-    if credential_id:
-        query = query.where(AuditLog.credential_id == credential_id)
+    query = filters.apply(AUDIT_LOG_ROWS)
 
     # Count total
     count_query = select(func.count()).select_from(query.subquery())
@@ -41,15 +116,79 @@ async def list_audit_logs(
     query = query.offset(offset).limit(page_size)
 
     result = await db.execute(query)
-    logs = result.scalars().all()
-
-    items = [AuditLogResponse.model_validate(log) for log in logs]
+    # Rows already have the AuditLogResponse shape
+    items = [dict(row) for row in result.mappings()]
     total_pages = math.ceil(total / page_size) if total else 0
 
-    return AuditLogListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
+    return json_response({
+        "items": items,
+        "total": total,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": total_pages,
+    }, response)
+
+
+def format_csv(rows: list[dict], header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow([
+            row["id"],
+            row["created_at"].isoformat() if row["created_at"] else "",
+            row["action"].value,
+            row["credential_id"],
+            row["credential_name"],
+            row["ip_address"],
+            row["user_agent"],
+        ])
+    return buffer.getvalue().encode()
+
+
+def format_ndjson(rows: list[dict], header: bool) -> bytes:
+    return b"".join(orjson.dumps(row) + b"\n" for row in rows)
+
+
+async def stream_audit_logs(query: Select, export_format: str):
+    """Yield the export in batches paged by id, each read in its own short session.
+
+    No read transaction stays open while a slow client drains the response:
+    in rollback journal mode (``DELETE``) an open reader would block every
+    writer until the download finished.
+    """
+    formatter = format_csv if export_format == "csv" else format_ndjson
+    header = True
+    last_id = 0
+    while True:
+        # The request's session is closed before the body is sent
+        async with async_session() as session:
+            result = await session.execute(
+                query.where(AuditLog.id > last_id).order_by(AuditLog.id).limit(EXPORT_BATCH_SIZE)
+            )
+            rows = [dict(row) for row in result.mappings()]
+        if not rows:
+            break
+        yield formatter(rows, header)
+        header = False
+        last_id = rows[-1]["id"]
+        if len(rows) < EXPORT_BATCH_SIZE:
+            break
+    if header:
+        # No rows: still send the CSV header
+        yield formatter([], True)
+
+
+@router.get("/export")
+async def export_audit_logs(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    filters: AuditLogFilters = Depends(),
+    _: bool = Depends(verify_token),
+):
+    """Stream all matching audit logs, oldest first, as CSV or NDJSON."""
+    return StreamingResponse(
+        stream_audit_logs(filters.apply(AUDIT_LOG_ROWS), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=audit-logs.{format}"},
     )
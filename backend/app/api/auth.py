@@ -1,25 +1,32 @@
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
 
 from app.config import get_settings
 from app.schemas.auth import LoginRequest, LoginResponse
+from app.services.tracing import get_tracer
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 settings = get_settings()
 
 
-def create_access_token() -> tuple[str, int]:
-    """Create JWT access token."""
-    expires_delta = timedelta(hours=settings.jwt_expire_hours)
+# Lifetime of an event stream ticket; it only has to outlast opening the stream
+STREAM_TICKET_SECONDS = 60
+
+
+def create_token(token_type: str, expires_delta: timedelta) -> tuple[str, int]:
+    """Create a JWT of the given type."""
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + expires_delta
 
     to_encode = {
         "exp": expire,
         "iat": datetime.now(timezone.utc),
-        "type": "access",
+        "type": token_type,
     }
 
     encoded_jwt = jwt.encode(
@@ -31,15 +38,29 @@ def create_access_token() -> tuple[str, int]:
     return encoded_jwt, int(expires_delta.total_seconds())
 
 
-def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> bool:
-    """Verify JWT token from Authorization header."""
+def create_access_token() -> tuple[str, int]:
+    """Create JWT access token."""
+    return create_token("access", timedelta(hours=settings.jwt_expire_hours))
+
+
+def create_stream_ticket() -> tuple[str, int]:
+    """Create a short-lived token that can only open the event stream."""
+    return create_token("stream", timedelta(seconds=STREAM_TICKET_SECONDS))
+
+
+def decode_token(token: str, token_type: str = "access") -> bool:
+    """Validate a JWT of the given type (an access token by default)."""
+    # Imported lazily to keep startup fast; warmed up in the background after start
+    from jose import JWTError, jwt
+
     try:
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.secret_key,
-            algorithms=[settings.jwt_algorithm],
-        )
-        if payload.get("type") != "access":
+        with get_tracer().span("auth.verify_token"):
+            payload = jwt.decode(
+                token,
+                settings.secret_key,
+                algorithms=[settings.jwt_algorithm],
+            )
+        if payload.get("type") != token_type:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token type",
@@ -52,6 +73,31 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security))
         )
 
 
+def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> bool:
+    """Verify JWT token from Authorization header."""
+    return decode_token(credentials.credentials)
+
+
+def verify_stream_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    ticket: Optional[str] = Query(None),
+) -> bool:
+    """Verify an access token from the Authorization header or a stream ticket from ``?ticket=``.
+
+    Browser EventSource connections cannot set headers, so streaming endpoints
+    accept a ticket in the query string. Query strings end up in access logs,
+    so only short-lived stream tickets are accepted there, never access tokens.
+    """
+    if credentials:
+        return decode_token(credentials.credentials)
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+    return decode_token(ticket, token_type="stream")
+
+
 @router.post("/login", response_model=LoginResponse)
 async def login(request: LoginRequest):
     """Login with master password."""
@@ -0,0 +1,44 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.api.auth import verify_token
+from app.schemas.backup import BackupStatus
+from app.services.backup import backup_dir, backup_running, database_path, get_backup_service, list_backups
+
+router = APIRouter(prefix="/backups", tags=["backups"])
+
+
+async def get_status() -> BackupStatus:
+    service = get_backup_service()
+    running = service.running or await asyncio.to_thread(backup_running, backup_dir())
+    return BackupStatus(
+        running=running,
+        last_error=service.last_error,
+        last_finished_at=service.last_finished_at,
+        backups=await asyncio.to_thread(list_backups, backup_dir()),
+    )
+
+
+@router.get("", response_model=BackupStatus)
+async def backup_status(_: bool = Depends(verify_token)):
+    """List backups and report whether one is being written."""
+    return await get_status()
+
+
+@router.post("", response_model=BackupStatus, status_code=status.HTTP_202_ACCEPTED)
+async def trigger_backup(_: bool = Depends(verify_token)):
+    """Start an online backup in the background."""
+    if database_path() is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Backups are only supported for SQLite databases",
+        )
+    if await asyncio.to_thread(backup_running, backup_dir()):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A backup is already running",
+        )
+
+    get_backup_service().start()
+    return await get_status()
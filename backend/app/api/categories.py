@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, select, func
 
-from app.db.database import get_db
+from app.db.database import get_db, async_session, current_vault
 from app.api.auth import verify_token
+from app.api.conditional import as_utc, conditional_get, conditional_response, row_version
+from app.api.responses import json_response
 from app.models import Category, Credential
+from app.services.cache import list_cache
+from app.services.changes import record_category_members
+from app.services.versioning import get_version
 from app.schemas.category import (
     CategoryCreate,
     CategoryUpdate,
@@ -13,64 +18,77 @@ from app.schemas.category import (
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
+# Hot queries, built once so their compiled-cache key is computed once
+CATEGORY_BY_ID = select(Category).where(Category.id == bindparam("category_id"))
+CREDENTIAL_COUNT = select(func.count(Credential.id)).where(Credential.category_id == bindparam("category_id"))
+
+# Categories with their credential counts
+_credential_counts = (
+    select(
+        Credential.category_id,
+        func.count(Credential.id).label("credential_count"),
+    )
+    .group_by(Credential.category_id)
+    .subquery()
+)
+CATEGORY_LIST = (
+    select(
+        Category,
+        func.coalesce(_credential_counts.c.credential_count, 0).label("credential_count"),
+    )
+    .outerjoin(_credential_counts, Category.id == _credential_counts.c.category_id)
+    .order_by(Category.name)
+)
+
 
 @router.get("", response_model=list[CategoryResponse])
 async def list_categories(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_token),
 ):
     """List all categories with credential counts."""
-    # Subquery for credential count
-    count_subquery = (
-        select(
-            Credential.category_id,
-            func.count(Credential.id).label("credential_count"),
-        )
-        .group_by(Credential.category_id)
-        .subquery()
-    )
-
-    query = (
-        select(
-            Category,
-            func.coalesce(count_subquery.c.credential_count, 0).label("credential_count"),
-        )
-        .outerjoin(count_subquery, Category.id == count_subquery.c.category_id)
-        .order_by(Category.name)
-    )
-
-    result = await db.execute(query)
-    rows = result.all()
-
-    return [
-        CategoryResponse(
-            id=row.Category.id,
-            name=row.Category.name,
-            color=row.Category.color,
-            created_at=row.Category.created_at,
-            updated_at=row.Category.updated_at,
-            credential_count=row.credential_count,
-        )
-        for row in rows
-    ]
+    not_modified = await conditional_get(request, response, db, "categories")
+    if not_modified:
+        return not_modified
+
+    async def compute() -> list[dict]:
+        # Shared by concurrent requests, so it runs in its own session
+        async with async_session() as session:
+            result = await session.execute(CATEGORY_LIST)
+            rows = result.all()
+
+        return [
+            {
+                "id": row.Category.id,
+                "name": row.Category.name,
+                "color": row.Category.color,
+                "created_at": row.Category.created_at,
+                "updated_at": row.Category.updated_at,
+                "credential_count": row.credential_count,
+            }
+            for row in rows
+        ]
+
+    key = ("categories", current_vault(), response.headers["ETag"])
+    return json_response(await list_cache.get_or_compute(key, compute), response)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: int,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_token),
 ):
-    """Get a single category by ID."""
-    # Count credentials
-    count_query = (
-        select(func.count(Credential.id))
-        .where(Credential.category_id == category_id)
-    )
-    credential_count = await db.scalar(count_query)
+    """Get a single category by ID.
 
-    query = select(Category).where(Category.id == category_id)
-    result = await db.execute(query)
+    The ETag is per category: its newest change log entry plus its
+    credential count, which moves without a category change.
+    """
+    result = await db.execute(CATEGORY_BY_ID, {"category_id": category_id})
     category = result.scalar_one_or_none()
 
     if not category:
@@ -79,6 +97,17 @@ async def get_category(
             detail="Category not found",
         )
 
+    # Count credentials
+    credential_count = await db.scalar(CREDENTIAL_COUNT, {"category_id": category_id})
+
+    version, last_modified = await row_version(db, "category", category)
+    # Credentials moving in or out don't touch the category's own changes
+    _, credentials_changed = await get_version(db, "credentials")
+    etag = f'W/"category-{current_vault()}-{category.id}-{version}-{credential_count}"'
+    not_modified = conditional_response(request, response, etag, max(last_modified, as_utc(credentials_changed)))
+    if not_modified:
+        return not_modified
+
     return CategoryResponse(
         id=category.id,
         name=category.name,
@@ -127,8 +156,7 @@ async def update_category(
     _: bool = Depends(verify_token),
 ):
     """Update an existing category."""
-    query = select(Category).where(Category.id == category_id)
-    result = await db.execute(query)
+    result = await db.execute(CATEGORY_BY_ID, {"category_id": category_id})
     category = result.scalar_one_or_none()
 
     if not category:
@@ -153,13 +181,14 @@ async def update_category(
         setattr(category, key, value)
 
     await db.flush()
+    await db.refresh(category)  # load the server-side updated_at
+
+    # Credential responses embed the category name and color
+    if {"name", "color"} & update_data.keys():
+        await record_category_members(db, category_id)
 
     # Count credentials
-    count_query = (
-        select(func.count(Credential.id))
-        .where(Credential.category_id == category_id)
-    )
-    credential_count = await db.scalar(count_query)
+    credential_count = await db.scalar(CREDENTIAL_COUNT, {"category_id": category_id})
 
     return CategoryResponse(
         id=category.id,
@@ -178,8 +207,7 @@ async def delete_category(
     _: bool = Depends(verify_token),
 ):
     """Delete a category. Credentials in this category will have their category_id set to null."""
-    query = select(Category).where(Category.id == category_id)
-    result = await db.execute(query)
+    result = await db.execute(CATEGORY_BY_ID, {"category_id": category_id})
     category = result.scalar_one_or_none()
 
     if not category:
@@ -190,6 +218,7 @@ async def delete_category(
 
     # Set category_id to null for related credentials
     from sqlalchemy import update
+    await record_category_members(db, category_id)
     await db.execute(
         update(Credential)
         .where(Credential.category_id == category_id)
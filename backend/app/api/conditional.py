@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import current_vault
+from app.services.changes import latest_change
+from app.services.versioning import get_version
+
+
+def as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; they are stored in UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``."""
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return last_modified.replace(microsecond=0) <= as_utc(since)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: datetime,
+) -> Optional[Response]:
+    """Set ETag/Last-Modified on ``response`` and evaluate the request's preconditions.
+
+    Returns a ``304 Not Modified`` response when the client's copy is
+    current, otherwise None and the endpoint builds the full response.
+    Last-Modified has one-second granularity, so two changes in the same
+    second are only told apart by the ETag; clients should send
+    If-None-Match, which takes precedence when both are present.
+    """
+    last_modified = as_utc(last_modified)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+        # The same URL answers for other vaults and other users
+        "Vary": "Authorization, X-Vault",
+    }
+    response.headers.update(headers)
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(if_modified_since) and _not_modified_since(if_modified_since, last_modified)
+
+    if not_modified:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+async def row_version(db: AsyncSession, entity: str, row) -> tuple[str, datetime]:
+    """ETag version and Last-Modified of one row, from its newest change log entry."""
+    change = await latest_change(db, entity, row.id)
+    if change:
+        seq, changed_at = change
+        return f"s{seq}", as_utc(changed_at)
+    # Changes older than the change log retention were pruned
+    last_modified = as_utc(row.updated_at or row.created_at)
+    return f"t{last_modified.timestamp():.6f}", last_modified
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession,
+    resource: str,
+) -> Optional[Response]:
+    """Set ETag/Last-Modified from the resource version; see :func:`conditional_response`.
+
+    Every vault counts its versions from zero, so the vault is part of the tag.
+    """
+    version, updated_at = await get_version(db, resource)
+    return conditional_response(request, response, f'W/"{resource}-{current_vault()}-{version}"', updated_at)
@@ -1,28 +1,48 @@
+import asyncio
+import time
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import bindparam, select, func, or_, insert, update, delete
+from sqlalchemy.orm import selectinload, joinedload
 import math
 
-from app.db.database import get_db
+from app.db.database import get_db, async_session, current_vault
 from app.api.auth import verify_token
-from app.models import Credential, Category, AuditLog, AuditAction, CredentialType
+from app.api.conditional import conditional_get, conditional_response, row_version
+from app.api.responses import json_response
+from app.models import Credential, Category, AuditLog, AuditAction, CredentialType, ChangeLog, ChangeOp
 from app.schemas.credential import (
     CredentialCreate,
     CredentialUpdate,
     CredentialResponse,
     CredentialListResponse,
+    CredentialChangesResponse,
+    CredentialBatchGet,
+    CredentialBatchResponse,
+    CredentialBulkDelete,
+    CredentialBulkUpdate,
+    CredentialBulkRetag,
+    CredentialBulkResult,
+    CredentialVerifyRequest,
+    CredentialVerifyResponse,
 )
 from app.services.crypto import get_crypto_service
+from app.services.tracing import get_tracer
+from app.services.credential_rows import select_credential_rows, decrypt_rows
+from app.services.cache import list_cache
+from app.services.changes import record_changes, get_sequence_bounds, latest_sequences
+from app.services.indexing import index_host, index_username, search_columns
+from app.services.connectivity import CheckTarget, get_connectivity_checker
 
 router = APIRouter(prefix="/credentials", tags=["credentials"])
-crypto = get_crypto_service()
 
 
 def encrypt_credential(data: dict) -> dict:
-    """Encrypt sensitive fields."""
+    """Encrypt sensitive fields and maintain their blind indexes and fingerprints."""
+    crypto = get_crypto_service()
     encrypted = data.copy()
+    encrypted.update(search_columns(data))
     if encrypted.get("host"):
         encrypted["host"] = crypto.encrypt(encrypted["host"])
     if encrypted.get("username"):
@@ -34,24 +54,84 @@ def encrypt_credential(data: dict) -> dict:
     return encrypted
 
 
-def decrypt_credential(credential: Credential) -> dict:
-    """Decrypt sensitive fields."""
+# Response field -> value getter; secret fields are decrypted on access
+_FIELD_GETTERS = {
+    "id": lambda c: c.id,
+    "name": lambda c: c.name,
+    "type": lambda c: c.type,
+    "host": lambda c: get_crypto_service().decrypt(c.host) if c.host else None,
+    "port": lambda c: c.port,
+    "username": lambda c: get_crypto_service().decrypt(c.username) if c.username else None,
+    "password": lambda c: get_crypto_service().decrypt(c.password) if c.password else None,
+    "extra_data": lambda c: get_crypto_service().decrypt_dict(c.extra_data) if c.extra_data else None,
+    "category_id": lambda c: c.category_id,
+    "tags": lambda c: c.tags or [],
+    "description": lambda c: c.description,
+    "created_at": lambda c: c.created_at,
+    "updated_at": lambda c: c.updated_at,
+    "category_name": lambda c: c.category.name if c.category else None,
+    "category_color": lambda c: c.category.color if c.category else None,
+}
+
+# Hot single-row lookups, built once so their compiled-cache key is computed once
+CREDENTIAL_BY_ID = select_credential_rows().where(Credential.id == bindparam("credential_id"))
+CATEGORY_INFO = select(Category.name, Category.color).where(Category.id == bindparam("category_id"))
+
+SECRET_FIELDS = ("host", "username", "password", "extra_data")
+CATEGORY_FIELDS = ("category_name", "category_color")
+DECRYPT_CHUNK_SIZE = 16
+
+
+def decrypt_credential(credential: Credential, fields: Optional[set[str]] = None) -> dict:
+    """Decrypt sensitive fields. Only ``fields`` are decrypted and returned when given."""
     return {
-        "id": credential.id,
-        "name": credential.name,
-        "type": credential.type,
-        "host": crypto.decrypt(credential.host) if credential.host else None,
-        "port": credential.port,
-        "username": crypto.decrypt(credential.username) if credential.username else None,
-        "password": crypto.decrypt(credential.password) if credential.password else None,
-        "extra_data": crypto.decrypt_dict(credential.extra_data) if credential.extra_data else None,
-        "category_id": credential.category_id,
-        "tags": credential.tags or [],
-        "description": credential.description,
-        "created_at": credential.created_at,
-        "updated_at": credential.updated_at,
-        "category_name": credential.category.name if credential.category else None,
-        "category_color": credential.category.color if credential.category else None,
+        key: getter(credential)
+        for key, getter in _FIELD_GETTERS.items()
+        if fields is None or key in fields
+    }
+
+
+async def decrypt_credentials(
+    credentials: list[Credential],
+    fields: Optional[set[str]] = None,
+) -> list[dict]:
+    """Decrypt many credentials in parallel on the default thread pool."""
+    def decrypt_chunk(chunk: list[Credential]) -> list[dict]:
+        return [decrypt_credential(c, fields) for c in chunk]
+
+    loop = asyncio.get_running_loop()
+    with get_tracer().span("crypto.decrypt", rows=len(credentials)):
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(None, decrypt_chunk, credentials[i:i + DECRYPT_CHUNK_SIZE])
+            for i in range(0, len(credentials), DECRYPT_CHUNK_SIZE)
+        ))
+    return [item for chunk in chunks for item in chunk]
+
+
+def build_response(credential: Credential, plaintext: dict, category: dict) -> dict:
+    """Build a response dict, decrypting only the secret fields missing from ``plaintext``."""
+    known = {k: plaintext[k] or None for k in SECRET_FIELDS if k in plaintext}
+    fields = _FIELD_GETTERS.keys() - known.keys() - set(CATEGORY_FIELDS)
+    response = decrypt_credential(credential, fields)
+    response.update(known)
+    response.update(category)
+    return response
+
+
+async def get_category_info(db: AsyncSession, category_id: Optional[int]) -> dict:
+    """Return the category name/color for a response.
+
+    Read in the request's transaction rather than cached per worker: a
+    category renamed through another worker must show up right away.
+    """
+    if category_id is None:
+        return {"category_name": None, "category_color": None}
+
+    result = await db.execute(CATEGORY_INFO, {"category_id": category_id})
+    row = result.first()
+    return {
+        "category_name": row.name if row else None,
+        "category_color": row.color if row else None,
     }
 
 
@@ -74,86 +154,361 @@ async def log_audit(
     await db.flush()
 
 
+async def log_audit_bulk(
+    db: AsyncSession,
+    request: Request,
+    action: AuditAction,
+    entries: list[tuple[Optional[int], Optional[str]]],
+):
+    """Log one audit event per (credential_id, credential_name) pair in a single insert."""
+    if not entries:
+        return
+    ip_address = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent", "")[:255]
+    await db.execute(
+        insert(AuditLog),
+        [
+            {
+                "credential_id": credential_id,
+                "credential_name": credential_name,
+                "action": action,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+            }
+            for credential_id, credential_name in entries
+        ],
+    )
+
+
+async def load_names(db: AsyncSession, ids: list[int]) -> dict[int, str]:
+    """Return {id: name} for the existing credentials among ``ids``."""
+    result = await db.execute(
+        select(Credential.id, Credential.name).where(Credential.id.in_(ids))
+    )
+    return dict(result.all())
+
+
 @router.get("", response_model=CredentialListResponse)
 async def list_credentials(
     request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     search: Optional[str] = None,
     type: Optional[CredentialType] = None,
     category_id: Optional[int] = None,
     tags: Optional[str] = None,  # comma separated
+    host: Optional[str] = None,  # exact match
+    username: Optional[str] = None,  # exact match
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_token),
 ):
     """List credentials with pagination and filters."""
-    query = select(Credential).options(selectinload(Credential.category))
-
-    # Apply filters
-    if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            or_(
-                Credential.name.ilike(search_term),
-                Credential.description.ilike(search_term),
+    not_modified = await conditional_get(request, response, db, "credentials")
+    if not_modified:
+        return not_modified
+
+    # Filters on encrypted fields are blind index values, which also normalizes them
+    host_index = index_host(host) if host else None
+    username_index = index_username(username) if username else None
+    key = (
+        "credentials", current_vault(), response.headers["ETag"], page, page_size, search,
+        type, category_id, host_index, username_index,
+    )
+
+    async def compute() -> dict:
+        query = select_credential_rows()
+
+        # Apply filters
+        if search:
+            search_term = f"%{search}%"
+            query = query.where(
+                or_(
+                    Credential.name.ilike(search_term),
+                    Credential.description.ilike(search_term),
+                )
             )
+
+        if type:
+            query = query.where(Credential.type == type)
+
+        if category_id:
+            query = query.where(Credential.category_id == category_id)
+
+        # Exact matches on encrypted fields use the blind index columns
+        if host_index:
+            query = query.where(Credential.host_index == host_index)
+
+        if username_index:
+            query = query.where(Credential.username_index == username_index)
+
+        # Shared by concurrent requests, so it runs in its own session
+        async with async_session() as session:
+            # Count total
+            count_query = select(func.count()).select_from(query.subquery())
+            total = await session.scalar(count_query)
+
+            # Pagination
+            offset = (page - 1) * page_size
+            query = query.order_by(Credential.updated_at.desc().nullsfirst(), Credential.created_at.desc())
+            query = query.offset(offset).limit(page_size)
+
+            result = await session.execute(query)
+            rows = result.all()
+
+        items = decrypt_rows(rows)
+        total_pages = math.ceil(total / page_size) if total else 0
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+        }
+
+    return json_response(await list_cache.get_or_compute(key, compute), response)
+
+
+@router.get("/changes", response_model=CredentialChangesResponse)
+async def list_credential_changes(
+    since: str = Query("0", description="Token from a previous response; 0 to start a full snapshot"),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Return credentials created, updated or deleted since a sync token.
+
+    ``since=0`` starts a snapshot of every credential, paged by id with the
+    same ``limit``/``has_more`` contract: its tokens look like ``<seq>:<id>``
+    and the last page returns the change sequence the snapshot started at,
+    so writes made while paging show up in the following sync.
+    """
+    try:
+        if ":" in since:
+            snapshot_seq, after_id = (int(part) for part in since.split(":", 1))
+            since_seq = 0
+        else:
+            since_seq, snapshot_seq, after_id = int(since), None, 0
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token",
+        )
+
+    oldest, newest = await get_sequence_bounds(db)
+    newest = newest or 0
+
+    if since_seq <= 0:
+        # The token is taken before the first page so later writes show up in the next sync
+        if snapshot_seq is None:
+            snapshot_seq = newest
+        query = (
+            select(Credential)
+            .options(selectinload(Credential.category))
+            .where(Credential.id > after_id)
+            .order_by(Credential.id)
+            .limit(limit)
         )
+        result = await db.execute(query)
+        page = result.scalars().all()
+        upserts = await decrypt_credentials(page)
+        has_more = len(page) == limit
+        return json_response({
+            "upserts": upserts,
+            "deletes": [],
+            "next_token": f"{snapshot_seq}:{page[-1].id}" if has_more else str(snapshot_seq),
+            "has_more": has_more,
+        })
+
+    if since_seq > newest or (oldest is not None and since_seq < oldest - 1):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync token expired, resync with since=0",
+        )
+
+    query = (
+        select(ChangeLog.seq, ChangeLog.entity_id)
+        .where(ChangeLog.entity == "credential", ChangeLog.seq > since_seq)
+        .order_by(ChangeLog.seq)
+        .limit(limit)
+    )
+    result = await db.execute(query)
+    changes = result.all()
+
+    changed_ids = list(dict.fromkeys(row.entity_id for row in changes))
+    found = {}
+    if changed_ids:
+        query = (
+            select(Credential)
+            .options(selectinload(Credential.category))
+            .where(Credential.id.in_(changed_ids))
+        )
+        result = await db.execute(query)
+        found = {c.id: c for c in result.scalars().all()}
+
+    # Ids that no longer exist were deleted, whatever their intermediate changes
+    upserts = await decrypt_credentials([found[i] for i in changed_ids if i in found])
+    return json_response({
+        "upserts": upserts,
+        "deletes": [i for i in changed_ids if i not in found],
+        "next_token": str(changes[-1].seq if changes else since_seq),
+        "has_more": len(changes) == limit,
+    })
+
+
+@router.post("/batch-get", response_model=CredentialBatchResponse)
+async def batch_get_credentials(
+    data: CredentialBatchGet,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Get many credentials by ID in one request."""
+    fields = None
+    if data.fields is not None:
+        unknown = set(data.fields) - _FIELD_GETTERS.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+            )
+        fields = set(data.fields) | {"id"}
+
+    ids = list(dict.fromkeys(data.ids))
+    query = (
+        select(Credential)
+        .options(joinedload(Credential.category))
+        .where(Credential.id.in_(ids))
+    )
+    result = await db.execute(query)
+    found = {c.id: c for c in result.scalars().all()}
+    credentials = [found[i] for i in ids if i in found]
 
-    if type:
-        query = query.where(Credential.type == type)
+    items = await decrypt_credentials(credentials, fields)
 
-    if category_id:
-        query = query.where(Credential.category_id == category_id)
+    await log_audit_bulk(
+        db, request, AuditAction.VIEW, [(c.id, c.name) for c in credentials]
+    )
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query)
+    return json_response({
+        "items": items,
+        "not_found": [i for i in ids if i not in found],
+    })
 
-    # Pagination
-    offset = (page - 1) * page_size
-    query = query.order_by(Credential.updated_at.desc().nullsfirst(), Credential.created_at.desc())
-    query = query.offset(offset).limit(page_size)
 
+@router.post("/verify", response_model=CredentialVerifyResponse)
+async def verify_credentials(
+    data: CredentialVerifyRequest,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Test connectivity of many credentials concurrently.
+
+    Results are cached for a few minutes unless ``force`` is set or the
+    credential changed.
+    """
+    started = time.perf_counter()
+
+    filters = []
+    if data.ids is not None:
+        filters.append(Credential.id.in_(data.ids))
+    if data.type:
+        filters.append(Credential.type == data.type)
+    if data.category_id:
+        filters.append(Credential.category_id == data.category_id)
+    query = select(Credential).options(selectinload(Credential.category)).where(*filters).order_by(Credential.id)
     result = await db.execute(query)
     credentials = result.scalars().all()
 
-    items = [CredentialResponse(**decrypt_credential(c)) for c in credentials]
-    total_pages = math.ceil(total / page_size) if total else 0
-
-    return CredentialListResponse(
-        items=items,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
+    # Only connection fields are decrypted; secrets never leave the server
+    plaintext = await decrypt_credentials(
+        credentials, {"id", "host", "port", "username", "password", "extra_data"}
     )
+    sequences = await latest_sequences(db, "credential", select(Credential.id).where(*filters))
+    targets = [
+        (
+            CheckTarget(
+                id=c.id,
+                type=c.type,
+                host=p["host"],
+                port=p["port"],
+                username=p["username"],
+                password=p["password"],
+                extra_data=p["extra_data"] or {},
+            ),
+            # Ids repeat across vaults; updated_at only has one-second resolution
+            (current_vault(), sequences.get(c.id, 0)),
+        )
+        for c, p in zip(credentials, plaintext)
+    ]
+    checks = await get_connectivity_checker().check_many(targets, force=data.force)
+
+    results = []
+    summary = {}
+    for c in credentials:
+        check = checks[c.id]
+        results.append({
+            "id": c.id,
+            "name": c.name,
+            "type": c.type,
+            "category_id": c.category_id,
+            "status": check.status,
+            "detail": check.detail,
+            "latency_ms": check.latency_ms,
+            "checked_at": check.checked_at,
+            "cached": check.cached,
+        })
+        group = summary.setdefault(c.category_id, {
+            "category_id": c.category_id,
+            "category_name": c.category.name if c.category else None,
+            "total": 0,
+            "statuses": {},
+        })
+        group["total"] += 1
+        group["statuses"][check.status] = group["statuses"].get(check.status, 0) + 1
+
+    found = {c.id for c in credentials}
+    return json_response({
+        "results": results,
+        "summary": list(summary.values()),
+        "not_found": [i for i in dict.fromkeys(data.ids or []) if i not in found],
+        "elapsed_ms": int((time.perf_counter() - started) * 1000),
+    })
 
 
 @router.get("/{credential_id}", response_model=CredentialResponse)
 async def get_credential(
     credential_id: int,
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
     _: bool = Depends(verify_token),
 ):
-    """Get a single credential by ID."""
-    query = (
-        select(Credential)
-        .options(selectinload(Credential.category))
-        .where(Credential.id == credential_id)
-    )
-    result = await db.execute(query)
-    credential = result.scalar_one_or_none()
+    """Get a single credential by ID.
 
-    if not credential:
+    The ETag is per credential: its latest change log sequence, which
+    also moves when its category is renamed or recolored.
+    """
+    result = await db.execute(CREDENTIAL_BY_ID, {"credential_id": credential_id})
+    row = result.first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Credential not found",
         )
 
-    await log_audit(db, request, AuditAction.VIEW, credential.id, credential.name)
+    # The client still displays the secret, so the view is audited even when not modified
+    await log_audit(db, request, AuditAction.VIEW, row.id, row.name)
 
-    return CredentialResponse(**decrypt_credential(credential))
+    version, last_modified = await row_version(db, "credential", row)
+    etag = f'W/"credential-{current_vault()}-{row.id}-{version}"'
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+
+    return CredentialResponse(**decrypt_rows([row])[0])
 
 
 @router.post("", response_model=CredentialResponse, status_code=status.HTTP_201_CREATED)
@@ -164,24 +519,17 @@ async def create_credential(
     _: bool = Depends(verify_token),
 ):
     """Create a new credential."""
-    encrypted_data = encrypt_credential(data.model_dump())
+    plaintext = data.model_dump()
 
-    credential = Credential(**encrypted_data)
+    # INSERT ... RETURNING fills id and server defaults in the same round trip
+    credential = Credential(**encrypt_credential(plaintext))
     db.add(credential)
     await db.flush()
 
-    # Reload with category
-    query = (
-        select(Credential)
-        .options(selectinload(Credential.category))
-        .where(Credential.id == credential.id)
-    )
-    result = await db.execute(query)
-    credential = result.scalar_one()
-
     await log_audit(db, request, AuditAction.CREATE, credential.id, credential.name)
 
-    return CredentialResponse(**decrypt_credential(credential))
+    category = await get_category_info(db, credential.category_id)
+    return CredentialResponse(**build_response(credential, plaintext, category))
 
 
 @router.put("/{credential_id}", response_model=CredentialResponse)
@@ -193,13 +541,27 @@ async def update_credential(
     _: bool = Depends(verify_token),
 ):
     """Update an existing credential."""
-    query = (
-        select(Credential)
-        .options(selectinload(Credential.category))
-        .where(Credential.id == credential_id)
-    )
-    result = await db.execute(query)
-    credential = result.scalar_one_or_none()
+    update_data = data.model_dump(exclude_unset=True)
+
+    if update_data and db.bind.dialect.update_returning:
+        # UPDATE ... RETURNING yields the full row without a separate SELECT
+        query = (
+            update(Credential)
+            .where(Credential.id == credential_id)
+            .values(**encrypt_credential(update_data))
+            .returning(Credential)
+        )
+        result = await db.execute(query)
+        credential = result.scalar_one_or_none()
+        if credential:
+            await record_changes(db, "credential", ChangeOp.UPSERT, [credential.id])
+    else:
+        credential = await db.get(Credential, credential_id)
+        if credential and update_data:
+            for key, value in encrypt_credential(update_data).items():
+                setattr(credential, key, value)
+            await db.flush()
+            await db.refresh(credential)
 
     if not credential:
         raise HTTPException(
@@ -207,26 +569,10 @@ async def update_credential(
             detail="Credential not found",
         )
 
-    update_data = data.model_dump(exclude_unset=True)
-    encrypted_data = encrypt_credential(update_data)
-
-    for key, value in encrypted_data.items():
-        setattr(credential, key, value)
-
-    await db.flush()
-
-    # Reload with category
-    query = (
-        select(Credential)
-        .options(selectinload(Credential.category))
-        .where(Credential.id == credential.id)
-    )
-    result = await db.execute(query)
-    credential = result.scalar_one()
-
     await log_audit(db, request, AuditAction.UPDATE, credential.id, credential.name)
 
-    return CredentialResponse(**decrypt_credential(credential))
+    category = await get_category_info(db, credential.category_id)
+    return CredentialResponse(**build_response(credential, update_data, category))
 
 
 @router.delete("/{credential_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -275,3 +621,101 @@ async def copy_credential(
     await log_audit(db, request, AuditAction.COPY, credential.id, f"{credential.name}:{field}")
 
     return {"success": True}
+
+
+@router.post("/bulk/update", response_model=CredentialBulkResult)
+async def bulk_update_credentials(
+    data: CredentialBulkUpdate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Set type, category, tags or description on many credentials at once."""
+    values = data.model_dump(exclude_unset=True, exclude={"ids"})
+    if not values:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update",
+        )
+
+    ids = list(dict.fromkeys(data.ids))
+    names = await load_names(db, ids)
+
+    if names:
+        await db.execute(
+            update(Credential)
+            .where(Credential.id.in_(names))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await record_changes(db, "credential", ChangeOp.UPSERT, names)
+        await log_audit_bulk(db, request, AuditAction.UPDATE, list(names.items()))
+
+    return CredentialBulkResult(
+        affected=len(names),
+        not_found=[i for i in ids if i not in names],
+    )
+
+
+@router.post("/bulk/retag", response_model=CredentialBulkResult)
+async def bulk_retag_credentials(
+    data: CredentialBulkRetag,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Add and/or remove tags on many credentials at once."""
+    ids = list(dict.fromkeys(data.ids))
+    result = await db.execute(
+        select(Credential.id, Credential.name, Credential.tags).where(Credential.id.in_(ids))
+    )
+    rows = result.all()
+
+    remove = set(data.remove)
+    changes = []
+    for row in rows:
+        tags = [t for t in (row.tags or []) if t not in remove]
+        tags += [t for t in dict.fromkeys(data.add) if t not in tags]
+        if tags != (row.tags or []):
+            changes.append({"id": row.id, "tags": tags})
+
+    if changes:
+        # ORM bulk UPDATE by primary key: one executemany statement
+        await db.execute(update(Credential), changes)
+        await record_changes(db, "credential", ChangeOp.UPSERT, [c["id"] for c in changes])
+        names = {row.id: row.name for row in rows}
+        await log_audit_bulk(
+            db, request, AuditAction.UPDATE, [(c["id"], names[c["id"]]) for c in changes]
+        )
+
+    found = {row.id for row in rows}
+    return CredentialBulkResult(
+        affected=len(changes),
+        not_found=[i for i in ids if i not in found],
+    )
+
+
+@router.post("/bulk/delete", response_model=CredentialBulkResult)
+async def bulk_delete_credentials(
+    data: CredentialBulkDelete,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Delete many credentials at once."""
+    ids = list(dict.fromkeys(data.ids))
+    names = await load_names(db, ids)
+
+    if names:
+        # Mirror the ORM cascade used by single deletes
+        await db.execute(delete(AuditLog).where(AuditLog.credential_id.in_(names)))
+        await db.execute(delete(Credential).where(Credential.id.in_(names)))
+        await record_changes(db, "credential", ChangeOp.DELETE, names)
+        await log_audit_bulk(
+            db, request, AuditAction.DELETE, [(None, name) for name in names.values()]
+        )
+
+    return CredentialBulkResult(
+        affected=len(names),
+        not_found=[i for i in ids if i not in names],
+    )
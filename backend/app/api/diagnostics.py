@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.api.auth import verify_token
+from app.db.database import current_engine
+from app.db.statement_cache import statement_cache_stats
+from app.schemas.diagnostics import StatementCacheStatus, TraceRecord
+from app.services.tracing import InMemoryExporter, get_tracer
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/statement-cache", response_model=StatementCacheStatus)
+async def statement_cache_status(_: bool = Depends(verify_token)):
+    """Compiled statement cache outcomes of the worker answering the request."""
+    return statement_cache_stats.snapshot(current_engine())
+
+
+@router.get("/traces", response_model=list[TraceRecord])
+async def recent_traces(
+    limit: int = Query(20, ge=1, le=200),
+    min_ms: float = Query(0, ge=0, description="Only traces at least this slow"),
+    _: bool = Depends(verify_token),
+):
+    """Recent traces kept by this worker, slowest first (memory exporter only)."""
+    exporter = get_tracer().exporter
+    if not isinstance(exporter, InMemoryExporter):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Traces are only kept with TRACING_EXPORTER=memory",
+        )
+    traces = [t for t in exporter.traces(limit) if t["duration_ms"] >= min_ms]
+    return sorted(traces, key=lambda t: t["duration_ms"], reverse=True)
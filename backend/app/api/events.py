@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.auth import create_stream_ticket, verify_stream_token, verify_token
+from app.config import get_settings
+from app.schemas.auth import StreamTicketResponse
+from app.services.events import EventBroker, Subscription, get_event_broker
+
+router = APIRouter(prefix="/events", tags=["events"])
+settings = get_settings()
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def event_stream(broker: EventBroker, subscription: Subscription):
+    try:
+        yield format_event("ready", {})
+        while True:
+            try:
+                item = await asyncio.wait_for(subscription.get(), settings.event_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if item is None:
+                if subscription.lagged:
+                    yield format_event("lagged", {"detail": "Subscriber too slow, resync required"})
+                break
+            yield format_event(item["event"], item["data"])
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.post("/ticket", response_model=StreamTicketResponse)
+async def create_ticket(_: bool = Depends(verify_token)):
+    """Short-lived ticket for opening the event stream where headers can't be set (EventSource)."""
+    ticket, expires_in = create_stream_ticket()
+    return {"ticket": ticket, "expires_in": expires_in}
+
+
+@router.get("")
+async def stream_events(_: bool = Depends(verify_stream_token)):
+    """Server-sent events feed of credential, category and audit changes."""
+    broker = get_event_broker()
+    subscription = broker.subscribe()
+    if subscription is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many event subscribers",
+        )
+
+    return StreamingResponse(
+        event_stream(broker, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
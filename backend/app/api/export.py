@@ -1,34 +1,104 @@
+import asyncio
 import io
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request
+from typing import Callable, Optional, Sequence
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from openpyxl import Workbook, load_workbook
+from sqlalchemy import Row, select, insert, update, tuple_
 
 from app.db.database import get_db
 from app.api.auth import verify_token
-from app.models import Credential, Category, AuditLog, AuditAction, CredentialType
-from app.services.crypto import get_crypto_service
+from app.api.admission import export_limiter, import_limiter
+from app.api.credentials import encrypt_credential
+from app.models import Credential, Category, AuditLog, AuditAction, CredentialType, ChangeOp
+from app.services.credential_rows import select_credential_rows, decrypt_rows
+from app.services.changes import record_changes
+from app.services.tracing import get_tracer
 
 router = APIRouter(prefix="/export", tags=["export"])
-crypto = get_crypto_service()
 
+# Import key field -> column holding a comparable value (blind index for encrypted fields)
+UPSERT_KEY_COLUMNS = {
+    "type": Credential.type,
+    "name": Credential.name,
+    "host": Credential.host_index,
+    "username": Credential.username_index,
+    "port": Credential.port,
+}
+# Columns that decide whether an existing credential changed; secrets compare by fingerprint
+UPSERT_COMPARED_COLUMNS = (
+    Credential.name,
+    Credential.type,
+    Credential.port,
+    Credential.category_id,
+    Credential.tags,
+    Credential.description,
+    Credential.host_index,
+    Credential.username_index,
+    Credential.password_fingerprint,
+    Credential.extra_data_fingerprint,
+)
+UPSERT_BATCH_SIZE = 200
+EXPORT_BATCH_SIZE = 500
 
-@router.get("/excel")
-async def export_to_excel(
-    db: AsyncSession = Depends(get_db),
-    _: bool = Depends(verify_token),
-):
-    """Export all credentials to Excel file."""
-    query = (
-        select(Credential)
-        .options(selectinload(Credential.category))
-        .order_by(Credential.type, Credential.name)
-    )
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Progress callback: (done, total)
+ProgressCallback = Optional[Callable[[int, int], None]]
+
+
+async def upsert_credentials(db: AsyncSession, rows: list[dict], key_fields: list[str]) -> dict:
+    """Insert new rows and update changed ones, matching existing credentials on ``key_fields``."""
+    key_columns = [UPSERT_KEY_COLUMNS[field] for field in key_fields]
+
+    # Later rows with the same key win
+    incoming = {}
+    for data in rows:
+        values = encrypt_credential(data)
+        incoming[tuple(values[column.key] for column in key_columns)] = values
+
+    # Prefetch existing credentials by key with indexed lookups
+    existing = {}
+    keys = list(incoming)
+    for i in range(0, len(keys), UPSERT_BATCH_SIZE):
+        result = await db.execute(
+            select(Credential.id, *UPSERT_COMPARED_COLUMNS)
+            .where(tuple_(*key_columns).in_(keys[i:i + UPSERT_BATCH_SIZE]))
+        )
+        for row in result.mappings():
+            existing[tuple(row[column.key] for column in key_columns)] = row
+
+    inserts, updates, unchanged = [], [], 0
+    for key, values in incoming.items():
+        current = existing.get(key)
+        if current is None:
+            inserts.append(values)
+        elif any(values[column.key] != current[column.key] for column in UPSERT_COMPARED_COLUMNS):
+            updates.append({"id": current["id"], **values})
+        else:
+            unchanged += 1
+
+    if inserts:
+        result = await db.execute(insert(Credential).returning(Credential.id), inserts)
+        await record_changes(db, "credential", ChangeOp.UPSERT, result.scalars().all())
+    if updates:
+        await db.execute(update(Credential), updates)
+        await record_changes(db, "credential", ChangeOp.UPSERT, [u["id"] for u in updates])
+
+    return {"inserted": len(inserts), "updated": len(updates), "unchanged": unchanged}
+
+
+async def load_export_credentials(db: AsyncSession) -> Sequence[Row]:
+    """Load all credential rows with their category name, in export order."""
+    query = select_credential_rows().order_by(Credential.type, Credential.name)
     result = await db.execute(query)
-    credentials = result.scalars().all()
+    return result.all()
+
+
+def build_workbook(credentials: Sequence[Row], progress: ProgressCallback = None) -> bytes:
+    """Decrypt credentials into an Excel workbook. CPU bound, run it in a worker thread."""
+    # openpyxl is slow to import and rarely needed; load it on first use
+    from openpyxl import Workbook
 
     # Create workbook
     wb = Workbook()
@@ -47,25 +117,25 @@ async def export_to_excel(
         cell = ws.cell(row=1, column=col)
         cell.font = cell.font.copy(bold=True)
 
-    # Data rows
-    for cred in credentials:
-        host = crypto.decrypt(cred.host) if cred.host else ""
-        username = crypto.decrypt(cred.username) if cred.username else ""
-        password = crypto.decrypt(cred.password) if cred.password else ""
-        extra_data = crypto.decrypt_dict(cred.extra_data) if cred.extra_data else {}
-
-        ws.append([
-            cred.type.value,
-            cred.name,
-            host,
-            cred.port or "",
-            username,
-            password,
-            cred.category.name if cred.category else "",
-            ",".join(cred.tags or []),
-            cred.description or "",
-            str(extra_data) if extra_data else "",
-        ])
+    # Data rows, decrypted a batch at a time
+    total = len(credentials)
+    with get_tracer().span("export.build_rows", rows=total):
+        for start in range(0, total, EXPORT_BATCH_SIZE):
+            for cred in decrypt_rows(credentials[start:start + EXPORT_BATCH_SIZE]):
+                ws.append([
+                    cred["type"].value,
+                    cred["name"],
+                    cred["host"] or "",
+                    cred["port"] or "",
+                    cred["username"] or "",
+                    cred["password"] or "",
+                    cred["category_name"] or "",
+                    ",".join(cred["tags"]),
+                    cred["description"] or "",
+                    str(cred["extra_data"]) if cred["extra_data"] else "",
+                ])
+            if progress:
+                progress(min(start + EXPORT_BATCH_SIZE, total), total)
 
     # Auto-adjust column widths
     for column in ws.columns:
@@ -82,126 +152,219 @@ async def export_to_excel(
 
     # Save to buffer
     buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
+    with get_tracer().span("export.save_workbook") as span:
+        wb.save(buffer)
+        span.set_attribute("bytes", buffer.tell())
+    if progress:
+        progress(len(credentials), len(credentials))
+    return buffer.getvalue()
 
-    return StreamingResponse(
-        buffer,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=credentials.xlsx"},
-    )
 
+def parse_workbook(
+    contents: bytes,
+    required_fields: list[str],
+    progress: ProgressCallback = None,
+) -> tuple[list[dict], list[str]]:
+    """Parse and validate workbook rows into plaintext credential dicts.
 
-@router.post("/excel")
-async def import_from_excel(
-    request: Request,
-    file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
-    _: bool = Depends(verify_token),
-):
-    """Import credentials from Excel file."""
-    if not file.filename.endswith((".xlsx", ".xls")):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid file format. Please upload an Excel file (.xlsx or .xls)",
-        )
+    Returns the valid rows (with a ``category_name`` entry instead of an id)
+    and the per-row error messages. CPU bound, run it in a worker thread.
+    """
+    from openpyxl import load_workbook
 
-    try:
-        contents = await file.read()
+    with get_tracer().span("import.load_workbook", bytes=len(contents)):
         wb = load_workbook(filename=io.BytesIO(contents))
-        ws = wb.active
+    ws = wb.active
+
+    rows = []
+    errors = []
+    total_rows = max(ws.max_row - 1, 0)
+
+    for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+        if progress and row_num % 100 == 0:
+            progress(row_num - 1, total_rows)
 
-        # Get existing categories
-        category_query = select(Category)
-        category_result = await db.execute(category_query)
-        categories = {c.name.lower(): c for c in category_result.scalars().all()}
+        if not row or not row[0]:  # Skip empty rows
+            continue
 
-        imported = 0
-        errors = []
+        try:
+            type_str, name, host, port, username, password, category_name, tags_str, description, extra_data_str = (
+                row + (None,) * (10 - len(row))
+            )[:10]
 
-        for row_num, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-            if not row or not row[0]:  # Skip empty rows
+            if not type_str or not name:
+                errors.append(f"Row {row_num}: Type and Name are required")
                 continue
 
+            # Validate type
             try:
-                type_str, name, host, port, username, password, category_name, tags_str, description, extra_data_str = (
-                    row + (None,) * (10 - len(row))
-                )[:10]
+                cred_type = CredentialType(type_str.lower())
+            except ValueError:
+                errors.append(f"Row {row_num}: Invalid type '{type_str}'")
+                continue
 
-                if not type_str or not name:
-                    errors.append(f"Row {row_num}: Type and Name are required")
-                    continue
+            # Parse tags
+            tags = [t.strip() for t in tags_str.split(",")] if tags_str else []
 
-                # Validate type
+            # Parse extra_data
+            extra_data = None
+            if extra_data_str:
                 try:
-                    cred_type = CredentialType(type_str.lower())
-                except ValueError:
-                    errors.append(f"Row {row_num}: Invalid type '{type_str}'")
-                    continue
-
-                # Get or create category
-                category_id = None
-                if category_name:
-                    category_key = category_name.lower()
-                    if category_key in categories:
-                        category_id = categories[category_key].id
-                    else:
-                        new_category = Category(name=category_name)
-                        db.add(new_category)
-                        await db.flush()
-                        categories[category_key] = new_category
-                        category_id = new_category.id
-
-                # Parse tags
-                tags = [t.strip() for t in tags_str.split(",")] if tags_str else []
-
-                # Parse extra_data
-                extra_data = None
-                if extra_data_str:
-                    try:
-                        import ast
-                        extra_data = ast.literal_eval(extra_data_str)
-                    except:
-                        pass
-
-                # Create credential
-                credential = Credential(
-                    type=cred_type,
-                    name=name,
-                    host=crypto.encrypt(host) if host else None,
-                    port=int(port) if port else None,
-                    username=crypto.encrypt(username) if username else None,
-                    password=crypto.encrypt(password) if password else None,
-                    category_id=category_id,
-                    tags=tags,
-                    description=description,
-                    extra_data=crypto.encrypt_dict(extra_data) if extra_data else None,
-                )
-                db.add(credential)
-                imported += 1
-
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
+                    import ast
+                    extra_data = ast.literal_eval(extra_data_str)
+                except:
+                    pass
+
+            data = {
+                "type": cred_type,
+                "name": name,
+                "host": host or None,
+                "port": int(port) if port else None,
+                "username": username or None,
+                "password": password or None,
+                "category_name": category_name or None,
+                "tags": tags,
+                "description": description,
+                "extra_data": extra_data or None,
+            }
+            if any(data[field] is None for field in required_fields):
+                errors.append(f"Row {row_num}: Upsert key fields ({','.join(required_fields)}) are required")
+                continue
+            rows.append(data)
+
+        except Exception as e:
+            errors.append(f"Row {row_num}: {str(e)}")
+
+    return rows, errors
 
+
+async def resolve_categories(db: AsyncSession, rows: list[dict]) -> None:
+    """Replace ``category_name`` with ``category_id``, creating missing categories."""
+    category_query = select(Category)
+    category_result = await db.execute(category_query)
+    categories = {c.name.lower(): c for c in category_result.scalars().all()}
+
+    for data in rows:
+        name = data.get("category_name")
+        if name and name.lower() not in categories:
+            new_category = Category(name=name)
+            db.add(new_category)
+            categories[name.lower()] = new_category
+    await db.flush()
+
+    for data in rows:
+        name = data.pop("category_name", None)
+        data["category_id"] = categories[name.lower()].id if name else None
+
+
+async def import_rows(
+    db: AsyncSession,
+    rows: list[dict],
+    errors: list[str],
+    mode: str,
+    key_fields: list[str],
+    ip_address: Optional[str],
+    user_agent: str,
+) -> dict:
+    """Write parsed rows and log the import. Returns the import summary."""
+    await resolve_categories(db, rows)
+
+    if mode == "upsert":
+        counts = await upsert_credentials(db, rows, key_fields)
+        summary = f"Excel import: {counts['inserted']} new, {counts['updated']} updated"
+    else:
+        db.add_all(Credential(**encrypt_credential(data)) for data in rows)
         await db.flush()
+        counts = {"inserted": len(rows), "updated": 0, "unchanged": 0}
+        summary = f"Excel import: {len(rows)} items"
+
+    # Log import action
+    log = AuditLog(
+        action=AuditAction.CREATE,
+        credential_name=summary,
+        ip_address=ip_address,
+        user_agent=user_agent[:255],
+    )
+    db.add(log)
+
+    return {
+        "imported": counts["inserted"] + counts["updated"],
+        **counts,
+        "errors": errors[:10],  # Return first 10 errors
+        "total_errors": len(errors),
+    }
+
+
+def parse_upsert_key(key: str) -> list[str]:
+    key_fields = [f.strip() for f in key.split(",") if f.strip()]
+    if not key_fields or set(key_fields) - UPSERT_KEY_COLUMNS.keys():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid upsert key. Allowed fields: {', '.join(UPSERT_KEY_COLUMNS)}",
+        )
+    return key_fields
 
-        # Log import action
-        log = AuditLog(
-            action=AuditAction.CREATE,
-            credential_name=f"Excel import: {imported} items",
-            ip_address=request.client.host if request.client else None,
-            user_agent=request.headers.get("user-agent", "")[:255],
+
+def check_excel_filename(filename: Optional[str]) -> None:
+    if not filename or not filename.endswith((".xlsx", ".xls")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid file format. Please upload an Excel file (.xlsx or .xls)",
         )
-        db.add(log)
 
-        return {
-            "imported": imported,
-            "errors": errors[:10],  # Return first 10 errors
-            "total_errors": len(errors),
-        }
 
+@router.get("/excel")
+async def export_to_excel(
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+    __: None = Depends(export_limiter),
+):
+    """Export all credentials to Excel file."""
+    credentials = await load_export_credentials(db)
+    content = await asyncio.to_thread(build_workbook, credentials)
+
+    return StreamingResponse(
+        io.BytesIO(content),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": "attachment; filename=credentials.xlsx"},
+    )
+
+
+@router.post("/excel")
+async def import_from_excel(
+    request: Request,
+    file: UploadFile = File(...),
+    mode: str = Query("insert", pattern="^(insert|upsert)$"),
+    key: str = Query("type,name", description="Comma separated upsert key fields"),
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+    __: None = Depends(import_limiter),
+):
+    """Import credentials from Excel file.
+
+    In upsert mode, rows matching an existing credential on the key fields
+    update it when something changed, and are skipped otherwise.
+    """
+    check_excel_filename(file.filename)
+    key_fields = parse_upsert_key(key)
+
+    try:
+        contents = await file.read()
+        rows, errors = await asyncio.to_thread(
+            parse_workbook, contents, key_fields if mode == "upsert" else []
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to parse Excel file: {str(e)}",
         )
+
+    return await import_rows(
+        db,
+        rows,
+        errors,
+        mode,
+        key_fields,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent", ""),
+    )
@@ -0,0 +1,156 @@
+import asyncio
+import os
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db, async_session
+from app.api.auth import verify_token
+from app.api.admission import export_limiter, import_limiter
+from app.api.export import (
+    XLSX_MEDIA_TYPE,
+    build_workbook,
+    check_excel_filename,
+    import_rows,
+    load_export_credentials,
+    parse_upsert_key,
+    parse_workbook,
+)
+from app.models import Job, JobKind, JobStatus
+from app.schemas.job import JobResponse
+from app.services.crypto import get_crypto_service
+from app.services.jobs import JobContext, JobQueueFull, get_job_manager
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def build_job_response(job: Job) -> JobResponse:
+    response = JobResponse.model_validate(job)
+    response.has_file = job.result_path is not None
+    return response
+
+
+async def submit_job(kind: JobKind, func) -> JobResponse:
+    try:
+        job = await get_job_manager().submit(kind, func)
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many jobs queued, try again later",
+            headers={"Retry-After": "30"},
+        )
+    return build_job_response(job)
+
+
+@router.post("/export", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_export(_: bool = Depends(verify_token)):
+    """Start an Excel export in the background."""
+
+    async def run(context: JobContext) -> dict:
+        # Shares the concurrency limit of the synchronous export
+        async with export_limiter.slot():
+            # Release the session before the slow part
+            async with async_session() as session:
+                credentials = await load_export_credentials(session)
+            content = await asyncio.to_thread(build_workbook, credentials, context.set_progress)
+            encrypted = await asyncio.to_thread(get_crypto_service().encrypt_bytes, content)
+            await asyncio.to_thread(context.write_result, encrypted)
+        return {"exported": len(credentials)}
+
+    return await submit_job(JobKind.EXPORT, run)
+
+
+@router.post("/import", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_import(
+    request: Request,
+    file: UploadFile = File(...),
+    mode: str = Query("insert", pattern="^(insert|upsert)$"),
+    key: str = Query("type,name", description="Comma separated upsert key fields"),
+    _: bool = Depends(verify_token),
+):
+    """Start an Excel import in the background. The result holds the import summary."""
+    check_excel_filename(file.filename)
+    key_fields = parse_upsert_key(key)
+    contents = await file.read()
+    ip_address = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent", "")
+
+    async def run(context: JobContext) -> dict:
+        async with import_limiter.slot():
+            try:
+                rows, errors = await asyncio.to_thread(
+                    parse_workbook, contents, key_fields if mode == "upsert" else [], context.set_progress
+                )
+            except Exception as e:
+                raise ValueError(f"Failed to parse Excel file: {str(e)}")
+
+            async with async_session() as session:
+                summary = await import_rows(
+                    session, rows, errors, mode, key_fields, ip_address, user_agent
+                )
+                await session.commit()
+        return summary
+
+    return await submit_job(JobKind.IMPORT, run)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Get job status and progress."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return build_job_response(job)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Download the file produced by a finished export job."""
+    job = await db.get(Job, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}",
+        )
+    if not job.result_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job has no result file",
+        )
+
+    expires_at = job.expires_at
+    if expires_at and expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    if (expires_at and expires_at < datetime.now(timezone.utc)) or not os.path.exists(job.result_path):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Job result has expired",
+        )
+
+    def read_result() -> bytes:
+        with open(job.result_path, "rb") as f:
+            return get_crypto_service().decrypt_bytes(f.read())
+
+    content = await asyncio.to_thread(read_result)
+    return Response(
+        content=content,
+        media_type=XLSX_MEDIA_TYPE,
+        headers={"Content-Disposition": "attachment; filename=credentials.xlsx"},
+    )
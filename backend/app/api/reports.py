@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from itertools import groupby
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, or_, tuple_
+
+from app.db.database import get_db
+from app.api.auth import verify_token
+from app.models import Credential, Category
+from app.schemas.report import ReportCredential, ReuseGroup, ReuseReport
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+async def find_groups(db: AsyncSession, *key_columns) -> list[ReuseGroup]:
+    """Group credentials sharing the same values in ``key_columns`` (all non-null)."""
+    not_null = [column.is_not(None) for column in key_columns]
+    shared_keys = (
+        select(*key_columns)
+        .where(*not_null)
+        .group_by(*key_columns)
+        .having(func.count() > 1)
+    )
+    key = tuple_(*key_columns) if len(key_columns) > 1 else key_columns[0]
+
+    query = (
+        select(*key_columns, Credential.id, Credential.name, Credential.type, Category.name.label("category_name"))
+        .outerjoin(Category, Credential.category_id == Category.id)
+        .where(*not_null, key.in_(shared_keys))
+        .order_by(*key_columns, Credential.name)
+    )
+    result = await db.execute(query)
+
+    groups = []
+    for _, rows in groupby(result.all(), key=lambda row: tuple(row[:len(key_columns)])):
+        credentials = [
+            ReportCredential(id=row.id, name=row.name, type=row.type, category_name=row.category_name)
+            for row in rows
+        ]
+        groups.append(ReuseGroup(count=len(credentials), credentials=credentials))
+    return sorted(groups, key=lambda group: group.count, reverse=True)
+
+
+@router.get("/reuse", response_model=ReuseReport)
+async def reuse_report(
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_token),
+):
+    """Report shared secrets and duplicate credentials using fingerprints, without decryption."""
+    unindexed = await db.scalar(
+        select(func.count(Credential.id)).where(or_(
+            (Credential.password != "") & Credential.password_fingerprint.is_(None),
+            (Credential.extra_data != "") & Credential.extra_data_fingerprint.is_(None),
+        ))
+    )
+
+    return ReuseReport(
+        password_reuse=await find_groups(db, Credential.password_fingerprint),
+        extra_data_reuse=await find_groups(db, Credential.extra_data_fingerprint),
+        duplicates=await find_groups(
+            db,
+            Credential.type,
+            Credential.host_index,
+            func.coalesce(Credential.port, 0),
+            func.coalesce(Credential.username_index, ""),
+        ),
+        unindexed=unindexed,
+        generated_at=datetime.now(timezone.utc),
+    )
@@ -0,0 +1,26 @@
+from typing import Any, Optional
+
+from fastapi import Response, status
+from fastapi.responses import ORJSONResponse
+
+from app.services.tracing import get_tracer
+
+
+def json_response(
+    content: Any,
+    response: Optional[Response] = None,
+    status_code: int = status.HTTP_200_OK,
+) -> ORJSONResponse:
+    """Serialize plain dicts and lists with orjson, skipping response_model validation.
+
+    Use it where the data is built from trusted columns and already has the
+    shape of the declared response_model. Headers set on the injected
+    ``response`` (e.g. ETag) are carried over.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    with get_tracer().span("serialize.json") as span:
+        rendered = ORJSONResponse(content, status_code=status_code, headers=headers)
+        span.set_attribute("bytes", len(rendered.body))
+    return rendered
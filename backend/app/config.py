@@ -18,6 +18,77 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./data/whatsmypasswd.db"
+    sqlite_journal_mode: str = "auto"  # "auto" = WAL on local disk, DELETE on network filesystems (NFS, SMB)
+    sqlite_busy_timeout_ms: int = 5000
+
+    # Vaults: extra named databases, selected per request with X-Vault or ?vault=
+    vaults: dict[str, str] = {}  # e.g. {"team-a": "sqlite+aiosqlite:///./data/team-a.db"}
+    vault_idle_timeout_seconds: int = 600  # close unused vault engines; 0 = keep open
+
+    # Query diagnostics (slow query log, per-request query counts)
+    db_diagnostics: bool = False
+    slow_query_ms: float = 200  # 0 = don't log slow queries
+    query_budget: int = 20  # warn when a request runs more queries; 0 = off
+    repeated_query_threshold: int = 5  # same statement this often in a request looks like N+1
+
+    # Tracing: "" (off), "memory", "console" or "otlp"
+    tracing_exporter: str = ""
+    tracing_otlp_endpoint: str = "http://localhost:4318"
+    tracing_memory_spans: int = 10000
+
+    # Background tasks (run by exactly one worker)
+    leader_lock_path: str = "./data/.leader.lock"
+    scheduler_tick_seconds: int = 30
+    audit_retention_days: int = 0  # 0 = keep forever
+    audit_retention_interval_minutes: int = 60
+    change_log_retention_days: int = 30
+
+    # Event stream
+    event_queue_size: int = 256
+    event_max_subscribers: int = 100
+    event_poll_interval_seconds: float = 2.0
+    event_heartbeat_seconds: float = 15.0
+
+    # Admission control for memory-heavy requests (per worker process)
+    export_concurrency: int = 1
+    import_concurrency: int = 1
+    admission_queue_size: int = 4  # requests allowed to wait for a slot
+    admission_max_wait_seconds: float = 10.0
+
+    # Export/import jobs
+    job_workers: int = 2
+    job_queue_size: int = 20
+    job_storage_dir: str = "./data/jobs"
+    job_result_ttl_hours: int = 24
+    job_heartbeat_seconds: int = 10
+    job_stale_after_seconds: int = 60  # unfinished jobs without a heartbeat this long are failed by the leader
+
+    # Identical concurrent list requests share one query; results are reused briefly
+    list_cache_ttl_seconds: float = 1.0
+
+    # Online backups
+    backup_dir: str = "./data/backups"
+    backup_interval_hours: int = 0  # 0 = no scheduled backups (opt-in, e.g. 24)
+    backup_keep: int = 7
+    backup_pages_per_step: int = 256
+    backup_step_sleep_seconds: float = 0.01
+
+    # Database maintenance (integrity check, ANALYZE, incremental VACUUM, WAL checkpoint)
+    maintenance_interval_hours: int = 24  # 0 = no scheduled maintenance
+    maintenance_pages_per_step: int = 1000  # free pages released per incremental vacuum step
+    maintenance_step_sleep_seconds: float = 0.05
+    maintenance_analysis_limit: int = 1000  # rows ANALYZE samples per index; 0 = all
+
+    # Connectivity checks
+    verify_concurrency: int = 100
+    verify_timeout_seconds: float = 5.0
+    verify_type_timeouts: dict[str, float] = {}  # e.g. {"oracle": 15}
+    verify_cache_ttl_seconds: int = 300
+    verify_ssh_known_hosts: str = ""  # known_hosts file; "" = SSH host keys are not verified
+
+    # Response compression
+    compression_minimum_size: int = 1024  # bytes; 0 disables compression
+    compression_gzip_level: int = 6
 
     # CORS
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -1,3 +1,23 @@
-from app.db.database import Base, get_db, init_db, engine, async_session
+from app.db.database import (
+    Base,
+    DEFAULT_VAULT,
+    get_db,
+    init_db,
+    engine,
+    async_session,
+    current_vault,
+    use_vault,
+    get_vault_registry,
+)
 
-__all__ = ["Base", "get_db", "init_db", "engine", "async_session"]
+__all__ = [
+    "Base",
+    "DEFAULT_VAULT",
+    "get_db",
+    "init_db",
+    "engine",
+    "async_session",
+    "current_vault",
+    "use_vault",
+    "get_vault_registry",
+]
@@ -1,26 +1,273 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import URL, event, inspect, text
+from sqlalchemy.schema import CreateColumn
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import get_settings
+from app.db.statement_cache import install as install_statement_cache_stats
+
+logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-)
+DEFAULT_VAULT = "default"
+
+
+# Filesystems whose locking SQLite's WAL mode can't rely on: the WAL index is
+# shared memory, which only works between processes on the same host
+NETWORK_FILESYSTEMS = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "ceph", "glusterfs", "fuse.glusterfs", "fuse.sshfs",
+})
+MOUNTS_PATH = "/proc/mounts"
+
+
+def filesystem_type(path: str) -> Optional[str]:
+    """Type of the filesystem holding ``path`` (from /proc/mounts), or None if unknown."""
+    path = os.path.realpath(path)
+    best, fstype = "", None
+    try:
+        with open(MOUNTS_PATH) as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace("\\040", " ")
+                contains = path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+                if contains and len(mount_point) > len(best):
+                    best, fstype = mount_point, fields[2]
+    except OSError:
+        return None
+    return fstype
+
+
+def resolve_journal_mode(url: URL) -> str:
+    """Journal mode for a database: ``SQLITE_JOURNAL_MODE``, with ``auto`` choosing
+    WAL on local disk and DELETE on a network filesystem."""
+    mode = settings.sqlite_journal_mode.upper()
+    if mode != "AUTO":
+        return mode
+    if url.database in (None, "", ":memory:"):
+        return "WAL"
+    directory = os.path.dirname(os.path.abspath(url.database))
+    fstype = filesystem_type(directory)
+    if fstype in NETWORK_FILESYSTEMS:
+        logger.warning(
+            "%s is on a network filesystem (%s); using journal_mode=DELETE instead of WAL", url.database, fstype
+        )
+        return "DELETE"
+    return "WAL"
+
+
+def _sqlite_pragmas(journal_mode: str, new_file: bool) -> Callable:
+    """Connect listener configuring every new SQLite connection for concurrent access from several workers."""
+    pending_auto_vacuum = new_file
+
+    def set_pragmas(dbapi_connection, connection_record):
+        nonlocal pending_auto_vacuum
+        cursor = dbapi_connection.cursor()
+        if pending_auto_vacuum:
+            # Only possible before the first table is created (journal_mode=WAL writes the
+            # header too); existing files are converted by maintenance --full-vacuum
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            pending_auto_vacuum = False
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        if journal_mode == "WAL":
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+    return set_pragmas
+
+
+def create_vault_engine(url: str) -> AsyncEngine:
+    """Create an engine with the connection setup and instrumentation shared by all vaults."""
+    vault_engine = create_async_engine(url, echo=settings.debug)
+    if vault_engine.dialect.name == "sqlite":
+        path = vault_engine.url.database
+        new_file = path in (None, "", ":memory:") or not os.path.exists(path) or os.path.getsize(path) == 0
+        listener = _sqlite_pragmas(resolve_journal_mode(vault_engine.url), new_file)
+        event.listen(vault_engine.sync_engine, "connect", listener)
+
+    install_statement_cache_stats(vault_engine)
+
+    if settings.db_diagnostics:
+        from app.db.diagnostics import install as install_diagnostics
 
-async_session = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+        install_diagnostics(vault_engine, slow_query_ms=settings.slow_query_ms)
+
+    if settings.tracing_exporter:
+        from app.services.tracing import install_sql_tracing
+
+        install_sql_tracing(vault_engine)
+    return vault_engine
+
+
+# Engine of the default vault
+engine = create_vault_engine(settings.database_url)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class UnknownVault(Exception):
+    """Raised for a vault name that is not configured."""
+
+
+class Vault:
+    """A named database with its own engine and connection pool."""
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.active = 0  # requests and tasks currently using the vault
+        self.last_used = time.monotonic()
+
+
+class VaultRegistry:
+    """Opens vault databases on first use and closes the ones left idle.
+
+    Each vault is a separate database (``VAULTS``), so writes to different
+    vaults don't contend for the same SQLite lock. The default vault is
+    ``DATABASE_URL`` and stays open.
+    """
+
+    def __init__(self, urls: dict[str, str], idle_timeout: float):
+        self._urls = {**urls, DEFAULT_VAULT: settings.database_url}
+        self._idle_timeout = idle_timeout
+        self._vaults: dict[str, Vault] = {DEFAULT_VAULT: Vault(DEFAULT_VAULT, engine)}
+        self._lock = asyncio.Lock()
+        self._reaper: Optional[asyncio.Task] = None
+
+    @property
+    def names(self) -> list[str]:
+        return sorted(self._urls)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._urls
+
+    def get(self, name: str) -> Vault:
+        """An open vault; use ``open`` (or ``use_vault``) to open it first."""
+        vault = self._vaults.get(name)
+        if vault is None:
+            raise RuntimeError(f"Vault {name!r} is not open")
+        return vault
+
+    async def open(self, name: str) -> Vault:
+        """Return the vault, creating its engine and schema on first use."""
+        vault = self._vaults.get(name)
+        if vault is not None:
+            return vault
+        if name not in self._urls:
+            raise UnknownVault(name)
+
+        async with self._lock:
+            vault = self._vaults.get(name)
+            if vault is None:
+                vault_engine = create_vault_engine(self._urls[name])
+                try:
+                    await init_db(vault_engine)
+                except Exception:
+                    await vault_engine.dispose()
+                    raise
+                vault = self._vaults[name] = Vault(name, vault_engine)
+                logger.info("Opened vault %s", name)
+        return vault
+
+    def start(self) -> None:
+        if self._idle_timeout > 0 and len(self._urls) > 1:
+            self._reaper = asyncio.create_task(self._close_idle_periodically())
+
+    async def close_idle(self) -> int:
+        """Dispose the engines of vaults unused for longer than the idle timeout."""
+        cutoff = time.monotonic() - self._idle_timeout
+        idle = [
+            vault for vault in self._vaults.values()
+            if vault.name != DEFAULT_VAULT and vault.active == 0 and vault.last_used < cutoff
+        ]
+        for vault in idle:
+            del self._vaults[vault.name]
+            await vault.engine.dispose()
+            logger.info("Closed idle vault %s", vault.name)
+        return len(idle)
+
+    async def close_all(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            await asyncio.gather(self._reaper, return_exceptions=True)
+            self._reaper = None
+        for vault in list(self._vaults.values()):
+            await vault.engine.dispose()
+        self._vaults = {DEFAULT_VAULT: self._vaults[DEFAULT_VAULT]}
+
+    async def _close_idle_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(min(self._idle_timeout, 60))
+            await self.close_idle()
+
+
+# Singleton instance
+_vault_registry: VaultRegistry | None = None
+
+
+def get_vault_registry() -> VaultRegistry:
+    global _vault_registry
+    if _vault_registry is None:
+        _vault_registry = VaultRegistry(settings.vaults, settings.vault_idle_timeout_seconds)
+    return _vault_registry
+
+
+# Vault of the current request or task
+_current_vault: ContextVar[str] = ContextVar("current_vault", default=DEFAULT_VAULT)
+
+
+def current_vault() -> str:
+    return _current_vault.get()
+
+
+def current_engine() -> AsyncEngine:
+    return get_vault_registry().get(_current_vault.get()).engine
+
+
+@asynccontextmanager
+async def use_vault(name: str):
+    """Route sessions opened inside the block to the vault ``name``."""
+    vault = await get_vault_registry().open(name)
+    token = _current_vault.set(name)
+    vault.active += 1
+    try:
+        yield vault
+    finally:
+        vault.active -= 1
+        vault.last_used = time.monotonic()
+        _current_vault.reset(token)
+
+
+def in_each_vault(func: Callable[[], Awaitable[object]]) -> Callable[[], Awaitable[None]]:
+    """Wrap a periodic job so it runs once per configured vault."""
+    async def run() -> None:
+        for name in get_vault_registry().names:
+            try:
+                async with use_vault(name):
+                    await func()
+            except Exception:
+                logger.exception("%s failed for vault %s", getattr(func, "__name__", func), name)
+    return run
+
+
+def async_session() -> AsyncSession:
+    """New session on the current vault."""
+    return get_vault_registry().get(_current_vault.get()).sessionmaker()
+
+
 async def get_db() -> AsyncSession:
     async with async_session() as session:
         try:
@@ -33,6 +280,32 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
-async def init_db():
-    async with engine.begin() as conn:
+def add_missing_columns(connection) -> None:
+    """Add columns and indexes introduced after a table was first created.
+
+    create_all() only creates missing tables, so existing databases are
+    brought up to date here.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=connection.dialect)
+                connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+async def init_db(target: Optional[AsyncEngine] = None):
+    """Create or upgrade the schema of a vault database (the default vault by default)."""
+    # Imported here: the models depend on Base defined in this module
+    from app.services.versioning import seed_resource_versions
+
+    async with (target or engine).begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(add_missing_columns)
+        await conn.run_sync(seed_resource_versions)
@@ -0,0 +1,149 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_START_KEY = "diagnostics_query_start"
+_EXPLAINING_KEY = "diagnostics_explaining"
+
+
+class RequestStats:
+    """Queries issued while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _one_line(statement: str, limit: int = 500) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def explain(connection, statement: str, parameters) -> list[str]:
+    """Return the query plan of a statement, one line per plan step."""
+    prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    # Raw DBAPI cursor: the plan query must not go through the engine events again
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+    if connection.dialect.name == "sqlite":
+        # (id, parent, notused, detail)
+        return [row[3] for row in rows]
+    return [" ".join(str(value) for value in row) for row in rows]
+
+
+def install(engine: AsyncEngine, slow_query_ms: float) -> None:
+    """Time every statement, count it for the current request and log slow ones with their plan."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_START_KEY, []).append((context, time.perf_counter()))
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        _, started = conn.info[_START_KEY].pop()
+        duration = time.perf_counter() - started
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+
+        if slow_query_ms <= 0 or duration * 1000 < slow_query_ms or conn.info.get(_EXPLAINING_KEY):
+            return
+        plan = []
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if not executemany and verb in ("SELECT", "WITH", "UPDATE", "DELETE"):
+            conn.info[_EXPLAINING_KEY] = True
+            try:
+                plan = explain(conn, statement, parameters)
+            except Exception as e:
+                plan = [f"(plan unavailable: {e})"]
+            finally:
+                conn.info[_EXPLAINING_KEY] = False
+        logger.warning(
+            "Slow query (%.1f ms): %s%s",
+            duration * 1000,
+            _one_line(statement),
+            "".join(f"\n    {step}" for step in plan),
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _drop_timer(exception_context):
+        # A statement that raised never reaches after_cursor_execute; without
+        # this its start time would be paired with the next statement's end.
+        # Only its own entry is dropped: errors can also come before the
+        # timer started or after it was stopped.
+        if exception_context.connection is None:
+            return
+        starts = exception_context.connection.info.get(_START_KEY)
+        if starts and starts[-1][0] is exception_context.execution_context:
+            starts.pop()
+
+
+class QueryDiagnosticsMiddleware:
+    """Counts queries per request and warns about budget overruns and likely N+1 patterns.
+
+    The count is also returned in an ``X-Query-Count`` header (queries made
+    before the response started; streaming bodies may add more).
+    """
+
+    def __init__(self, app: ASGIApp, query_budget: int, repeat_threshold: int) -> None:
+        self.app = app
+        self.query_budget = query_budget
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_count(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Query-Count"] = str(stats.count)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _request_stats.reset(token)
+            self.report(f"{scope['method']} {scope['path']}", stats)
+
+    def report(self, request: str, stats: RequestStats) -> None:
+        if self.query_budget > 0 and stats.count > self.query_budget:
+            logger.warning(
+                "%s ran %d queries (budget %d) in %.1f ms",
+                request, stats.count, self.query_budget, stats.duration * 1000,
+            )
+        if self.repeat_threshold > 0:
+            for statement, count in stats.statements.most_common():
+                if count < self.repeat_threshold:
+                    break
+                logger.warning(
+                    "%s ran the same statement %d times, possible N+1: %s",
+                    request, count, _one_line(statement, 200),
+                )
@@ -0,0 +1,41 @@
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class StatementCacheStats:
+    """Per-worker counts of compiled statement cache outcomes."""
+
+    def __init__(self):
+        self.outcomes: Counter[str] = Counter()
+
+    def record(self, outcome: str) -> None:
+        self.outcomes[outcome] += 1
+
+    def snapshot(self, engine: AsyncEngine) -> dict:
+        hits = self.outcomes[CACHE_HIT.name]
+        misses = self.outcomes[CACHE_MISS.name]
+        compiled_cache = engine.sync_engine._compiled_cache
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "outcomes": dict(self.outcomes),
+            "cached_statements": len(compiled_cache) if compiled_cache is not None else 0,
+            "cache_capacity": compiled_cache.capacity if compiled_cache is not None else 0,
+        }
+
+
+statement_cache_stats = StatementCacheStats()
+
+
+def install(engine: AsyncEngine) -> None:
+    """Count whether each executed statement's compiled form came from the cache."""
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _record_cache_outcome(conn, cursor, statement, parameters, context, executemany):
+        # Driver-level SQL (e.g. PRAGMAs) is never compiled, so there is nothing to cache
+        outcome = getattr(context, "cache_hit", None) if context.compiled is not None else None
+        statement_cache_stats.record(outcome.name if outcome is not None else "RAW_SQL")
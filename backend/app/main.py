@@ -1,27 +1,87 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
-from app.db.database import init_db
+from app.db.database import init_db, get_vault_registry, in_each_vault
+from app.db.diagnostics import QueryDiagnosticsMiddleware
+from app.middleware import CompressionMiddleware, VaultMiddleware
 from app.api import (
     auth_router,
     credentials_router,
     categories_router,
     audit_logs_router,
     export_router,
+    events_router,
+    reports_router,
+    jobs_router,
+    backups_router,
+    diagnostics_router,
 )
+from app.services.background import get_scheduler
+from app.services.crypto import get_crypto_service
+from app.services.retention import purge_expired_audit_logs
+from app.services.changes import prune_change_log
+from app.services.events import stop_event_brokers
+from app.services.indexing import backfill_search_columns
+from app.services.jobs import fail_stale_jobs, get_job_manager, purge_expired_jobs
+from app.services.backup import scheduled_backup, stop_backup_services
+from app.services.maintenance import scheduled_maintenance
+from app.services.tracing import TracingMiddleware, get_tracer
 
 settings = get_settings()
+tracer = get_tracer()
+
+
+def warm_up() -> None:
+    """Derive the encryption keys and load the JWT library ahead of the first request."""
+    get_crypto_service()
+    import jose.jwt  # noqa: F401
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup; warming up runs in a thread so health checks pass right away
+    warm_up_task = asyncio.create_task(asyncio.to_thread(warm_up))
     await init_db()
+
+    # Periodic jobs run in a single elected worker, once for every vault
+    scheduler = get_scheduler()
+    if settings.audit_retention_days > 0:
+        scheduler.add_job(
+            "audit-retention",
+            settings.audit_retention_interval_minutes * 60,
+            in_each_vault(purge_expired_audit_logs),
+        )
+    scheduler.add_job("search-column-backfill", 60 * 60, in_each_vault(backfill_search_columns))
+    if settings.change_log_retention_days > 0:
+        scheduler.add_job("change-log-pruning", 6 * 60 * 60, in_each_vault(prune_change_log))
+    scheduler.add_job("job-expiry", 15 * 60, in_each_vault(purge_expired_jobs))
+    scheduler.add_job("stale-jobs", settings.job_stale_after_seconds, in_each_vault(fail_stale_jobs))
+    if settings.backup_interval_hours > 0:
+        scheduler.add_job("backup", settings.backup_interval_hours * 60 * 60, in_each_vault(scheduled_backup))
+    # Checked hourly; runs once the last maintenance report is older than the interval
+    if settings.maintenance_interval_hours > 0:
+        scheduler.add_job("maintenance", 60 * 60, in_each_vault(scheduled_maintenance))
+    await scheduler.start()
+    await get_job_manager().start()
+    get_vault_registry().start()
+    if tracer.enabled:
+        tracer.exporter.start()
+
     yield
+
     # Shutdown
-    pass
+    await warm_up_task
+    await stop_event_brokers()
+    await get_job_manager().stop()
+    await scheduler.stop()
+    await stop_backup_services()
+    await get_vault_registry().close_all()
+    if tracer.enabled:
+        await tracer.exporter.shutdown()
 
 
 app = FastAPI(
@@ -29,8 +89,44 @@ app = FastAPI(
     description="Secure credential management system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Per-request query counting; innermost so it sees the handler's queries
+if settings.db_diagnostics:
+    app.add_middleware(
+        QueryDiagnosticsMiddleware,
+        query_budget=settings.query_budget,
+        repeat_threshold=settings.repeated_query_threshold,
+    )
+
+# Compression; the event stream must not be buffered, compressed formats are passed through
+if settings.compression_minimum_size > 0:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        exclude_paths=("/api/events",),
+        # Already compressed: zip containers such as xlsx exports, gzip, common image formats
+        exclude_media_types=(
+            "application/vnd.openxmlformats-officedocument.",
+            "application/zip",
+            "application/gzip",
+            "application/x-gzip",
+            "image/png",
+            "image/jpeg",
+            "image/gif",
+            "image/webp",
+        ),
+    )
+
+# Vault routing; inside CORS so its 404s carry CORS headers
+app.add_middleware(VaultMiddleware)
+
+# Root span per request; outside vault routing so opening a vault is timed too
+if tracer.enabled:
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -46,6 +142,11 @@ app.include_router(credentials_router, prefix="/api")
 app.include_router(categories_router, prefix="/api")
 app.include_router(audit_logs_router, prefix="/api")
 app.include_router(export_router, prefix="/api")
+app.include_router(events_router, prefix="/api")
+app.include_router(reports_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
+app.include_router(backups_router, prefix="/api")
+app.include_router(diagnostics_router, prefix="/api")
 
 
 @app.get("/api/health")
@@ -0,0 +1,97 @@
+import logging
+from functools import partial
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.database import DEFAULT_VAULT, get_vault_registry, use_vault
+
+logger = logging.getLogger(__name__)
+
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:  # optional dependency
+    BrotliMiddleware = None
+
+
+class CompressionMiddleware:
+    """Brotli (when installed) or gzip response compression above a size threshold.
+
+    Streaming endpoints listed in ``exclude_paths`` are passed through
+    untouched: compressors buffer output, which would hold back events.
+    Responses whose Content-Type starts with one of ``exclude_media_types``
+    (zip containers such as xlsx, images, ...) are already compressed and
+    are passed through as well.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        exclude_paths: tuple[str, ...] = (),
+        exclude_media_types: tuple[str, ...] = (),
+    ) -> None:
+        self.app = app
+        self.exclude_paths = exclude_paths
+        self.exclude_media_types = exclude_media_types
+        if BrotliMiddleware is not None:
+            # Falls back to gzip for clients without brotli support
+            self.compressor = partial(
+                BrotliMiddleware, quality=brotli_quality, minimum_size=minimum_size, gzip_fallback=True
+            )
+        else:
+            self.compressor = partial(GZipMiddleware, minimum_size=minimum_size, compresslevel=gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_paths):
+            await self.app(scope, receive, send)
+            return
+
+        async def app(scope: Scope, receive: Receive, compress: Send) -> None:
+            # The compressor waits for the body before deciding, so the response
+            # can still bypass it once its start message shows the media type
+            target = compress
+
+            async def choose(message: Message) -> None:
+                nonlocal target
+                if message["type"] == "http.response.start":
+                    content_type = Headers(raw=message["headers"]).get("content-type", "")
+                    if content_type.startswith(self.exclude_media_types):
+                        target = send
+                await target(message)
+
+            await self.app(scope, receive, choose)
+
+        await self.compressor(app)(scope, receive, send)
+
+
+class VaultMiddleware:
+    """Routes each request to the vault named by ``X-Vault`` or the ``vault`` query parameter.
+
+    Requests without either use the default vault; unknown names get a 404.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        name = (
+            Headers(scope=scope).get("x-vault")
+            or QueryParams(scope["query_string"]).get("vault")
+            or DEFAULT_VAULT
+        )
+        if name not in get_vault_registry():
+            response = JSONResponse({"detail": "Vault not found"}, status_code=404)
+            await response(scope, receive, send)
+            return
+
+        async with use_vault(name):
+            await self.app(scope, receive, send)
@@ -1,5 +1,20 @@
 from app.models.category import Category
 from app.models.credential import Credential, CredentialType
 from app.models.audit_log import AuditLog, AuditAction
+from app.models.resource_version import ResourceVersion
+from app.models.change_log import ChangeLog, ChangeOp
+from app.models.job import Job, JobKind, JobStatus
 
-__all__ = ["Category", "Credential", "CredentialType", "AuditLog", "AuditAction"]
+__all__ = [
+    "Category",
+    "Credential",
+    "CredentialType",
+    "AuditLog",
+    "AuditAction",
+    "ResourceVersion",
+    "ChangeLog",
+    "ChangeOp",
+    "Job",
+    "JobKind",
+    "JobStatus",
+]
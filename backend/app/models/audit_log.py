@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -27,3 +27,10 @@ class AuditLog(Base):
 
     # Relationships
     credential = relationship("Credential", back_populates="audit_logs")
+
+    # Filters are combined with a created_at range and ordered by it
+    __table_args__ = (
+        Index("ix_audit_logs_action_created_at", "action", "created_at"),
+        Index("ix_audit_logs_credential_id_created_at", "credential_id", "created_at"),
+        Index("ix_audit_logs_ip_address_created_at", "ip_address", "created_at"),
+    )
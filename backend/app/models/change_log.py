@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Index
+from sqlalchemy.sql import func
+import enum
+
+from app.db.database import Base
+
+
+class ChangeOp(str, enum.Enum):
+    UPSERT = "upsert"
+    DELETE = "delete"  # tombstone
+
+
+class ChangeLog(Base):
+    """Append-only log of entity changes, ordered by a monotonically increasing sequence."""
+
+    __tablename__ = "change_log"
+
+    seq = Column(Integer, primary_key=True)
+    entity = Column(String(20), nullable=False)  # "credential" or "category"
+    entity_id = Column(Integer, nullable=False)
+    op = Column(Enum(ChangeOp), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_change_log_entity_seq", "entity", "seq"),
+        # Latest change of given entities (per-row versions)
+        Index("ix_change_log_entity_id_seq", "entity", "entity_id", "seq"),
+        # Never reuse sequence numbers, even after pruning the newest rows
+        {"sqlite_autoincrement": True},
+    )
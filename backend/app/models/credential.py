@@ -26,6 +26,14 @@ class Credential(Base):
     username = Column(Text, nullable=True)  # Encrypted
     password = Column(Text, nullable=True)  # Encrypted
 
+    # Keyed HMAC blind indexes for exact-match lookup without decryption
+    host_index = Column(String(64), nullable=True, index=True)
+    username_index = Column(String(64), nullable=True, index=True)
+
+    # Keyed HMAC fingerprints of secrets for reuse reports
+    password_fingerprint = Column(String(64), nullable=True, index=True)
+    extra_data_fingerprint = Column(String(64), nullable=True, index=True)
+
     # Extra data (encrypted JSON string)
     # Oracle: service_name, tns
     # Linux: ssh_key
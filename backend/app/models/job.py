@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, JSON
+from sqlalchemy.sql import func
+import enum
+
+from app.db.database import Base
+
+
+class JobKind(str, enum.Enum):
+    EXPORT = "export"
+    IMPORT = "import"
+
+
+class JobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    """Long-running export or import executed outside the request."""
+
+    __tablename__ = "jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    kind = Column(Enum(JobKind), nullable=False)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.PENDING, index=True)
+    progress = Column(Integer, nullable=False, default=0)  # percent
+
+    error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)  # import summary
+    result_path = Column(String(255), nullable=True)  # encrypted export file
+
+    # Process that accepted the job; it refreshes heartbeat_at while the job is queued or running
+    worker_pid = Column(Integer, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class ResourceVersion(Base):
+    """Monotonic change counter per API resource, used for ETag / Last-Modified."""
+
+    __tablename__ = "resource_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,10 +1,21 @@
-from app.schemas.auth import LoginRequest, LoginResponse
+from app.schemas.auth import LoginRequest, LoginResponse, StreamTicketResponse
 from app.schemas.credential import (
     CredentialBase,
     CredentialCreate,
     CredentialUpdate,
     CredentialResponse,
     CredentialListResponse,
+    CredentialChangesResponse,
+    CredentialBatchGet,
+    CredentialBatchResponse,
+    CredentialBulkDelete,
+    CredentialBulkUpdate,
+    CredentialBulkRetag,
+    CredentialBulkResult,
+    CredentialVerifyRequest,
+    CredentialCheckResult,
+    CategoryCheckSummary,
+    CredentialVerifyResponse,
 )
 from app.schemas.category import (
     CategoryBase,
@@ -13,19 +24,44 @@ from app.schemas.category import (
     CategoryResponse,
 )
 from app.schemas.audit_log import AuditLogResponse, AuditLogListResponse
+from app.schemas.report import ReportCredential, ReuseGroup, ReuseReport
+from app.schemas.job import JobResponse
+from app.schemas.backup import BackupFile, BackupStatus
+from app.schemas.diagnostics import StatementCacheStatus, SpanRecord, TraceRecord
 
 __all__ = [
     "LoginRequest",
     "LoginResponse",
+    "StreamTicketResponse",
     "CredentialBase",
     "CredentialCreate",
     "CredentialUpdate",
     "CredentialResponse",
     "CredentialListResponse",
+    "CredentialChangesResponse",
+    "CredentialBatchGet",
+    "CredentialBatchResponse",
+    "CredentialBulkDelete",
+    "CredentialBulkUpdate",
+    "CredentialBulkRetag",
+    "CredentialBulkResult",
+    "CredentialVerifyRequest",
+    "CredentialCheckResult",
+    "CategoryCheckSummary",
+    "CredentialVerifyResponse",
     "CategoryBase",
     "CategoryCreate",
     "CategoryUpdate",
     "CategoryResponse",
     "AuditLogResponse",
     "AuditLogListResponse",
+    "ReportCredential",
+    "ReuseGroup",
+    "ReuseReport",
+    "JobResponse",
+    "BackupFile",
+    "BackupStatus",
+    "StatementCacheStatus",
+    "SpanRecord",
+    "TraceRecord",
 ]
@@ -9,3 +9,8 @@ class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int  # seconds
+
+
+class StreamTicketResponse(BaseModel):
+    ticket: str  # pass as ?ticket= to GET /api/events
+    expires_in: int  # seconds to open the stream with it
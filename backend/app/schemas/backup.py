@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class BackupFile(BaseModel):
+    name: str
+    size: int  # bytes, compressed
+    created_at: datetime
+
+
+class BackupStatus(BaseModel):
+    running: bool
+    last_error: Optional[str] = None  # last failure seen by this worker
+    last_finished_at: Optional[datetime] = None
+    backups: list[BackupFile]  # newest first
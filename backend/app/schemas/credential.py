@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from typing import Optional
 
@@ -48,6 +48,13 @@ class CredentialCreate(CredentialBase):
     pass
 
 
+def reject_explicit_nulls(model: BaseModel, fields: tuple[str, ...]) -> None:
+    """Fail validation for ``fields`` sent as null; they may only be omitted."""
+    nulls = [f for f in fields if f in model.model_fields_set and getattr(model, f) is None]
+    if nulls:
+        raise ValueError(f"{', '.join(nulls)} cannot be null")
+
+
 class CredentialUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     type: Optional[CredentialType] = None
@@ -60,6 +67,12 @@ class CredentialUpdate(BaseModel):
     tags: Optional[list[str]] = None
     description: Optional[str] = None
 
+    @model_validator(mode="after")
+    def reject_nulls(self) -> "CredentialUpdate":
+        # Optional only so they can be left out; the columns are required
+        reject_explicit_nulls(self, ("name", "type", "tags"))
+        return self
+
 
 class CredentialResponse(CredentialBase):
     id: int
@@ -78,3 +91,90 @@ class CredentialListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+
+
+# Delta sync
+class CredentialChangesResponse(BaseModel):
+    upserts: list[CredentialResponse]
+    deletes: list[int]
+    next_token: str
+    has_more: bool
+
+
+# Batch fetch
+class CredentialBatchGet(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=500)
+    fields: Optional[list[str]] = None  # None = all fields
+
+
+class CredentialBatchResponse(BaseModel):
+    items: list[dict]
+    not_found: list[int] = []
+
+
+# Bulk operations
+class CredentialBulkDelete(BaseModel):
+    ids: list[int] = Field(..., min_length=1, max_length=500)
+
+
+class CredentialBulkUpdate(CredentialBulkDelete):
+    type: Optional[CredentialType] = None
+    category_id: Optional[int] = None
+    tags: Optional[list[str]] = None
+    description: Optional[str] = None
+
+    @model_validator(mode="after")
+    def reject_nulls(self) -> "CredentialBulkUpdate":
+        reject_explicit_nulls(self, ("type", "tags"))
+        return self
+
+
+class CredentialBulkRetag(CredentialBulkDelete):
+    add: list[str] = []
+    remove: list[str] = []
+
+
+class CredentialBulkResult(BaseModel):
+    affected: int
+    not_found: list[int] = []
+
+
+# Connectivity checks
+class CredentialVerifyRequest(BaseModel):
+    ids: Optional[list[int]] = Field(None, min_length=1, max_length=5000)  # None = all matching filters
+    type: Optional[CredentialType] = None
+    category_id: Optional[int] = None
+    force: bool = False  # ignore cached results
+
+    @model_validator(mode="after")
+    def require_filter(self) -> "CredentialVerifyRequest":
+        # Checking the whole vault in one request would outlive request timeouts
+        if self.ids is None and self.type is None and self.category_id is None:
+            raise ValueError("Give ids, type or category_id")
+        return self
+
+
+class CredentialCheckResult(BaseModel):
+    id: int
+    name: str
+    type: CredentialType
+    category_id: Optional[int] = None
+    status: str  # ok, reachable, auth_failed, unreachable, timeout, error, skipped
+    detail: Optional[str] = None
+    latency_ms: Optional[int] = None
+    checked_at: datetime
+    cached: bool = False
+
+
+class CategoryCheckSummary(BaseModel):
+    category_id: Optional[int] = None
+    category_name: Optional[str] = None
+    total: int
+    statuses: dict[str, int]
+
+
+class CredentialVerifyResponse(BaseModel):
+    results: list[CredentialCheckResult]
+    summary: list[CategoryCheckSummary]
+    not_found: list[int] = []
+    elapsed_ms: int
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+
+
+class StatementCacheStatus(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: Optional[float] = None  # None until a compiled statement ran
+    outcomes: dict[str, int]  # every cache outcome seen, including RAW_SQL
+    cached_statements: int
+    cache_capacity: int
+
+
+class SpanRecord(BaseModel):
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_ns: int  # unix epoch, nanoseconds
+    duration_ms: float
+    attributes: dict[str, Any]
+    error: Optional[str] = None
+
+
+class TraceRecord(BaseModel):
+    trace_id: str
+    name: str  # root span
+    duration_ms: float
+    spans: list[SpanRecord]  # in start order
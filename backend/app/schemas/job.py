@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+from app.models.job import JobKind, JobStatus
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    progress: int
+    error: Optional[str] = None
+    result: Optional[dict] = None  # import summary
+    has_file: bool = False
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
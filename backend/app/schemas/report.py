@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+from app.models.credential import CredentialType
+
+
+class ReportCredential(BaseModel):
+    id: int
+    name: str
+    type: CredentialType
+    category_name: Optional[str] = None
+
+
+class ReuseGroup(BaseModel):
+    count: int
+    credentials: list[ReportCredential]
+
+
+class ReuseReport(BaseModel):
+    password_reuse: list[ReuseGroup]
+    extra_data_reuse: list[ReuseGroup]
+    duplicates: list[ReuseGroup]  # same type, host, port and username
+    unindexed: int  # rows still waiting for the fingerprint backfill
+    generated_at: datetime
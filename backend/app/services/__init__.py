@@ -1,3 +1,10 @@
 from app.services.crypto import CryptoService, get_crypto_service
+from app.services.background import BackgroundScheduler, LeaderLock, get_scheduler
 
-__all__ = ["CryptoService", "get_crypto_service"]
+__all__ = [
+    "CryptoService",
+    "get_crypto_service",
+    "BackgroundScheduler",
+    "LeaderLock",
+    "get_scheduler",
+]
@@ -0,0 +1,129 @@
+import asyncio
+import fcntl
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock:
+    """Non-blocking file lock that elects a single worker process as leader.
+
+    The lock is released by the kernel when the holding process exits, so a
+    replacement worker can take over on its next attempt.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        """Acquire the lock if it is free. Returns True while this process holds it."""
+        if self._fd is not None:
+            return True
+
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        logger.info("Worker %s acquired background leader lock", os.getpid())
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+
+@dataclass
+class PeriodicJob:
+    name: str
+    interval: float
+    func: Callable[[], Awaitable[None]]
+    next_run: float = 0.0
+
+
+class BackgroundScheduler:
+    """Runs periodic jobs in whichever worker currently holds the leader lock.
+
+    Every worker runs the scheduler loop, but only the leader executes jobs;
+    the others keep retrying the lock so a replacement takes over when the
+    leader dies.
+    """
+
+    def __init__(self, lock: LeaderLock, tick_seconds: float):
+        self._lock = lock
+        self._tick = tick_seconds
+        self._jobs: dict[str, PeriodicJob] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock.held
+
+    def add_job(self, name: str, interval_seconds: float, func: Callable[[], Awaitable[None]]) -> None:
+        """Register a coroutine function to run every ``interval_seconds``."""
+        self._jobs[name] = PeriodicJob(name=name, interval=interval_seconds, func=func)
+
+    async def start(self) -> None:
+        if self._task is None and self._jobs:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._lock.release()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._lock.try_acquire():
+                for job in self._jobs.values():
+                    if loop.time() < job.next_run:
+                        continue
+                    try:
+                        await job.func()
+                    except Exception:
+                        logger.exception("Background job %s failed", job.name)
+                    job.next_run = loop.time() + job.interval
+            await asyncio.sleep(self._tick)
+
+
+# Singleton instance
+_scheduler: BackgroundScheduler | None = None
+
+
+def get_scheduler() -> BackgroundScheduler:
+    global _scheduler
+    if _scheduler is None:
+        settings = get_settings()
+        _scheduler = BackgroundScheduler(
+            LeaderLock(settings.leader_lock_path),
+            tick_seconds=settings.scheduler_tick_seconds,
+        )
+    return _scheduler
@@ -0,0 +1,282 @@
+import asyncio
+import fcntl
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.config import get_settings
+from app.db.database import DEFAULT_VAULT, current_engine, current_vault
+
+logger = logging.getLogger(__name__)
+
+BACKUP_PREFIX = "whatsmypasswd-"
+BACKUP_SUFFIX = ".db.gz"
+
+# Times a stepwise copy may start over (after writes by other connections)
+# before the rest is copied in a single step
+BACKUP_MAX_RESTARTS = 3
+# Outside WAL mode a single-step copy blocks writers throughout; only databases
+# up to this many pages (8 MiB at 4 KiB pages) are copied that way
+BACKUP_MAX_BLOCKING_PAGES = 2048
+
+
+class BackupInProgress(Exception):
+    """Raised when another process is already writing a backup."""
+
+
+class BackupKeepsRestarting(Exception):
+    """Raised when a copy keeps starting over and copying in one step would block writers too long."""
+
+
+class _BackupRestarting(Exception):
+    """Aborts a stepwise copy that keeps starting over."""
+
+
+def copy_database(
+    source: sqlite3.Connection,
+    target: sqlite3.Connection,
+    pages_per_step: int,
+    step_sleep: float,
+) -> int:
+    """Copy ``source`` into ``target``; returns how often the stepwise copy started over.
+
+    A write to the source by another connection restarts a stepwise copy from
+    the first page, and every credential read writes an audit row, so under
+    steady traffic the copy might never finish. After BACKUP_MAX_RESTARTS the
+    copy is redone in one step. In WAL mode that holds only a read
+    transaction and does not block writers. In rollback journal modes it
+    holds a shared lock that blocks every writer until the copy is done, so
+    it is only done for databases up to BACKUP_MAX_BLOCKING_PAGES; larger
+    ones raise BackupKeepsRestarting and are retried later.
+    """
+    restarts = 0
+    remaining_before = None
+
+    def progress(status, remaining, total):
+        nonlocal restarts, remaining_before
+        if remaining_before is not None and remaining > remaining_before:
+            restarts += 1
+            if restarts > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarting()
+        remaining_before = remaining
+
+    try:
+        source.backup(target, pages=pages_per_step, sleep=step_sleep, progress=progress)
+    except _BackupRestarting:
+        wal = source.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        pages = source.execute("PRAGMA page_count").fetchone()[0]
+        if not wal and pages > BACKUP_MAX_BLOCKING_PAGES:
+            raise BackupKeepsRestarting(
+                f"Backup restarted {restarts} times under concurrent writes; copying {pages} pages "
+                "in one step would block writers outside WAL mode"
+            )
+        logger.info("Backup restarted %d times under concurrent writes, copying in one step", restarts)
+        source.backup(target, pages=-1)
+    return restarts
+
+
+def database_path() -> Optional[str]:
+    """Path of the current vault's SQLite database file, or None for other databases."""
+    engine = current_engine()
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return None
+    return engine.url.database
+
+
+def backup_dir() -> str:
+    """Backup directory of the current vault; other vaults use a subdirectory."""
+    settings = get_settings()
+    vault = current_vault()
+    if vault == DEFAULT_VAULT:
+        return settings.backup_dir
+    return os.path.join(settings.backup_dir, vault)
+
+
+def list_backups(backup_dir: str) -> list[dict]:
+    """Finished backups, newest first."""
+    try:
+        names = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return []
+
+    backups = []
+    for name in names:
+        if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIX):
+            stat = os.stat(os.path.join(backup_dir, name))
+            backups.append({
+                "name": name,
+                "size": stat.st_size,
+                "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+            })
+    # Names carry a UTC timestamp, so they sort chronologically
+    return sorted(backups, key=lambda b: b["name"], reverse=True)
+
+
+@contextmanager
+def backup_lock(backup_dir: str):
+    """Exclusive non-blocking lock shared by all worker processes."""
+    fd = os.open(os.path.join(backup_dir, ".backup.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            raise BackupInProgress()
+        yield
+    finally:
+        os.close(fd)
+
+
+def backup_running(backup_dir: str) -> bool:
+    """Whether any worker currently holds the backup lock."""
+    if not os.path.isdir(backup_dir):
+        return False
+    try:
+        with backup_lock(backup_dir):
+            return False
+    except BackupInProgress:
+        return True
+
+
+def run_backup(
+    source_path: str,
+    backup_dir: str,
+    keep: int,
+    pages_per_step: int,
+    step_sleep: float,
+    busy_timeout_ms: int,
+) -> dict:
+    """Copy the live database with the online backup API, gzip it and rotate old copies.
+
+    Pages are copied ``pages_per_step`` at a time with a pause in between,
+    so writers are only held up for one step (see copy_database for copies
+    that keep starting over). Blocking, run it in a thread.
+    """
+    os.makedirs(backup_dir, mode=0o700, exist_ok=True)
+    with backup_lock(backup_dir):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        name = f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}"
+        snapshot_path = os.path.join(backup_dir, f".{stamp}.db")
+        partial_path = os.path.join(backup_dir, f".{name}.part")
+
+        try:
+            source = sqlite3.connect(source_path, timeout=busy_timeout_ms / 1000)
+            snapshot = sqlite3.connect(snapshot_path)
+            try:
+                copy_database(source, snapshot, pages_per_step, step_sleep)
+                check = snapshot.execute("PRAGMA quick_check").fetchone()[0]
+            finally:
+                snapshot.close()
+                source.close()
+            if check != "ok":
+                raise RuntimeError(f"Backup snapshot failed quick_check: {check}")
+
+            fd = os.open(partial_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(snapshot_path, "rb") as src, os.fdopen(fd, "wb") as raw, \
+                    gzip.GzipFile(filename=f"whatsmypasswd-{stamp}.db", mode="wb", fileobj=raw) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(partial_path, os.path.join(backup_dir, name))
+        finally:
+            for path in (snapshot_path, partial_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        for old in list_backups(backup_dir)[keep:]:
+            os.remove(os.path.join(backup_dir, old["name"]))
+
+    return next(b for b in list_backups(backup_dir) if b["name"] == name)
+
+
+class BackupService:
+    """Runs backups of one vault off the event loop and remembers this worker's last outcome."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_error: Optional[str] = None
+        self.last_finished_at: Optional[datetime] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start a backup in the background unless one is already running here."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run_logged())
+
+    async def backup(self) -> dict:
+        """Take a backup now. Raises BackupInProgress if any worker is already at it."""
+        settings = get_settings()
+        source_path = database_path()
+        if source_path is None:
+            raise RuntimeError("Backups are only supported for SQLite databases")
+
+        try:
+            backup = await asyncio.to_thread(
+                run_backup,
+                source_path,
+                backup_dir(),
+                settings.backup_keep,
+                settings.backup_pages_per_step,
+                settings.backup_step_sleep_seconds,
+                settings.sqlite_busy_timeout_ms,
+            )
+        except BackupInProgress:
+            raise
+        except Exception as e:
+            self.last_error = str(e) or type(e).__name__
+            self.last_finished_at = datetime.now(timezone.utc)
+            raise
+
+        self.last_error = None
+        self.last_finished_at = datetime.now(timezone.utc)
+        logger.info("Wrote backup %s (%d bytes)", backup["name"], backup["size"])
+        return backup
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run_logged(self) -> None:
+        try:
+            await self.backup()
+        except BackupInProgress:
+            logger.info("Skipped backup: another worker is already writing one")
+        except Exception:
+            logger.exception("Backup failed")
+
+
+# One service per vault; backups started in the background keep the caller's vault
+_backup_services: dict[str, BackupService] = {}
+
+
+def get_backup_service() -> BackupService:
+    """Backup service of the current vault."""
+    return _backup_services.setdefault(current_vault(), BackupService())
+
+
+async def stop_backup_services() -> None:
+    for service in _backup_services.values():
+        await service.stop()
+
+
+async def scheduled_backup() -> None:
+    """Leader job: take a backup unless a recent one exists or one is running."""
+    settings = get_settings()
+    # The schedule restarts with every deploy; don't rotate out older backups early
+    backups = await asyncio.to_thread(list_backups, backup_dir())
+    interval = timedelta(hours=settings.backup_interval_hours)
+    if backups and backups[0]["created_at"] > datetime.now(timezone.utc) - interval:
+        return
+
+    try:
+        await get_backup_service().backup()
+    except BackupInProgress:
+        logger.info("Skipped scheduled backup: another one is in progress")
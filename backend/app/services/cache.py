@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from app.config import get_settings
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after ``ttl`` seconds.
+
+    Each worker process has its own copy, so cached values may lag behind
+    writes made by other workers for at most ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or everything when ``key`` is None."""
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one in-flight computation."""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # A caller that disconnects must not cancel the computation for the others
+        return await asyncio.shield(task)
+
+
+class CoalescingCache:
+    """Short-lived result cache in front of a SingleFlight.
+
+    Keys should include the resource version (ETag) so that writes, from
+    any worker, move readers to a fresh key instead of a stale entry.
+    ``func`` is shared between requests and must not use a request's
+    database session.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self._cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._flight = SingleFlight()
+
+    async def get_or_compute(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        value = self._cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        async def compute() -> Any:
+            value = await func()
+            self._cache.set(key, value)
+            return value
+
+        return await self._flight.do(key, compute)
+
+
+_MISSING = object()
+
+# Rendered list pages, shared by identical concurrent requests
+list_cache = CoalescingCache(ttl=get_settings().list_cache_ttl_seconds)
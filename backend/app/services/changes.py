@@ -0,0 +1,117 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import Select, event, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.database import async_session
+from app.models import Category, ChangeLog, ChangeOp, Credential
+
+logger = logging.getLogger(__name__)
+
+# Mapped class -> change log entity name
+TRACKED_ENTITIES = {Credential: "credential", Category: "category"}
+
+
+@event.listens_for(Session, "after_flush")
+def _log_flushed_changes(session, flush_context):
+    rows = []
+    for obj in (*session.new, *session.dirty):
+        entity = TRACKED_ENTITIES.get(type(obj))
+        if entity and (obj in session.new or session.is_modified(obj)):
+            rows.append({"entity": entity, "entity_id": obj.id, "op": ChangeOp.UPSERT})
+    for obj in session.deleted:
+        entity = TRACKED_ENTITIES.get(type(obj))
+        if entity:
+            rows.append({"entity": entity, "entity_id": obj.id, "op": ChangeOp.DELETE})
+    if rows:
+        session.connection().execute(insert(ChangeLog.__table__), rows)
+
+
+async def record_changes(
+    db: AsyncSession,
+    entity: str,
+    op: ChangeOp,
+    ids: Iterable[int],
+) -> None:
+    """Log changes made by bulk statements, which bypass the flush hook."""
+    rows = [{"entity": entity, "entity_id": i, "op": op} for i in ids]
+    if rows:
+        await db.execute(insert(ChangeLog), rows)
+
+
+async def record_category_members(db: AsyncSession, category_id: int) -> None:
+    """Log an upsert for every credential in a category with one INSERT ... SELECT."""
+    await db.execute(
+        insert(ChangeLog).from_select(
+            ["entity", "entity_id", "op"],
+            select(
+                literal("credential"),
+                Credential.id,
+                literal(ChangeOp.UPSERT, ChangeLog.op.type),
+            ).where(Credential.category_id == category_id),
+        )
+    )
+
+
+async def latest_sequences(db: AsyncSession, entity: str, ids: Iterable[int] | Select) -> dict[int, int]:
+    """Newest change sequence number of each id (a list or a SELECT of ids).
+
+    Sequence numbers are never reused, so they make per-row versions that
+    change with every write, unlike the one-second ``updated_at``. Ids
+    without retained changes are left out.
+    """
+    if not isinstance(ids, Select):
+        ids = list(ids)
+    result = await db.execute(
+        select(ChangeLog.entity_id, func.max(ChangeLog.seq))
+        .where(ChangeLog.entity == entity, ChangeLog.entity_id.in_(ids))
+        .group_by(ChangeLog.entity_id)
+    )
+    return dict(result.all())
+
+
+async def latest_change(db: AsyncSession, entity: str, entity_id: int) -> Optional[tuple[int, datetime]]:
+    """(sequence number, time) of the newest retained change of one row, or None."""
+    result = await db.execute(
+        select(ChangeLog.seq, ChangeLog.changed_at)
+        .where(ChangeLog.entity == entity, ChangeLog.entity_id == entity_id)
+        .order_by(ChangeLog.seq.desc())
+        .limit(1)
+    )
+    row = result.first()
+    return tuple(row) if row else None
+
+
+async def get_sequence_bounds(db: AsyncSession) -> tuple[Optional[int], Optional[int]]:
+    """Return the (oldest, newest) retained change sequence numbers."""
+    result = await db.execute(select(func.min(ChangeLog.seq), func.max(ChangeLog.seq)))
+    return tuple(result.one())
+
+
+async def prune_change_log() -> int:
+    """Delete change log entries older than the retention period.
+
+    The newest entry is always kept so clients can detect that their sync
+    token predates the retained history.
+    """
+    settings = get_settings()
+    if settings.change_log_retention_days <= 0:
+        return 0
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.change_log_retention_days)
+    async with async_session() as session:
+        result = await session.execute(
+            delete(ChangeLog).where(
+                ChangeLog.changed_at < cutoff,
+                ChangeLog.seq < select(func.max(ChangeLog.seq)).scalar_subquery(),
+            )
+        )
+        await session.commit()
+
+    if result.rowcount:
+        logger.info("Pruned %d change log entries older than %s", result.rowcount, cutoff.isoformat())
+    return result.rowcount
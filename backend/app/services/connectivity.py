@@ -0,0 +1,395 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from urllib.parse import quote, urlsplit
+
+from app.config import get_settings
+from app.models import CredentialType
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+try:
+    import asyncssh
+except ImportError:  # optional dependency, SSH falls back to a banner check
+    asyncssh = None
+
+try:
+    import oracledb
+except ImportError:  # optional dependency, Oracle falls back to a TCP check
+    oracledb = None
+
+
+class CheckStatus:
+    OK = "ok"  # logged in
+    REACHABLE = "reachable"  # service answered, login not verified
+    AUTH_FAILED = "auth_failed"
+    UNREACHABLE = "unreachable"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    SKIPPED = "skipped"  # not enough connection info
+
+
+@dataclass
+class CheckTarget:
+    """Decrypted connection info of one credential."""
+
+    id: int
+    type: CredentialType
+    host: Optional[str] = None
+    port: Optional[int] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    extra_data: dict = field(default_factory=dict)
+
+
+@dataclass
+class CheckResult:
+    status: str
+    detail: Optional[str] = None
+    latency_ms: Optional[int] = None
+    checked_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    cached: bool = False
+
+
+class CheckFailed(Exception):
+    """Raised by checkers with the status to report."""
+
+    def __init__(self, status: str, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+Checker = Callable[[CheckTarget], Awaitable[CheckResult]]
+
+# Credential type -> checker; register_checker() adds or replaces one
+CHECKERS: dict[CredentialType, Checker] = {}
+
+DEFAULT_PORTS = {
+    CredentialType.ORACLE: 1521,
+    CredentialType.LINUX: 22,
+    CredentialType.FTP: 21,
+}
+
+
+def register_checker(credential_type: CredentialType):
+    def decorator(func: Checker) -> Checker:
+        CHECKERS[credential_type] = func
+        return func
+    return decorator
+
+
+async def open_connection(target: CheckTarget):
+    if not target.host:
+        raise CheckFailed(CheckStatus.SKIPPED, "No host")
+    port = target.port or DEFAULT_PORTS[target.type]
+    try:
+        return await asyncio.open_connection(target.host, port)
+    except OSError as e:
+        raise CheckFailed(CheckStatus.UNREACHABLE, f"{target.host}:{port}: {e.strerror or e}")
+
+
+async def close_connection(writer: asyncio.StreamWriter) -> None:
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+
+# FTP
+
+async def read_ftp_reply(reader: asyncio.StreamReader) -> tuple[int, str]:
+    """Read a (possibly multi-line) FTP reply."""
+    line = (await reader.readline()).decode("latin-1").rstrip("\r\n")
+    if len(line) < 3 or not line[:3].isdigit():
+        raise CheckFailed(CheckStatus.ERROR, f"Unexpected FTP reply: {line[:80]!r}")
+    code, text = line[:3], line
+    if line[3:4] == "-":
+        while True:
+            more = (await reader.readline()).decode("latin-1")
+            if not more:
+                raise CheckFailed(CheckStatus.ERROR, "Connection closed during FTP reply")
+            if more.startswith(code + " "):
+                text = more.rstrip("\r\n")
+                break
+    return int(code), text
+
+
+@register_checker(CredentialType.FTP)
+async def check_ftp(target: CheckTarget) -> CheckResult:
+    """Log in over the FTP control connection."""
+    reader, writer = await open_connection(target)
+    try:
+        code, text = await read_ftp_reply(reader)
+        if code != 220:
+            raise CheckFailed(CheckStatus.ERROR, text)
+        if not target.username:
+            return CheckResult(CheckStatus.REACHABLE, "No username to log in with")
+        # A line break would end the command and smuggle the rest in as another one
+        if any(c in value for value in (target.username, target.password or "") for c in "\r\n"):
+            raise CheckFailed(CheckStatus.ERROR, "Username or password contains a line break")
+
+        writer.write(f"USER {target.username}\r\n".encode("latin-1"))
+        code, text = await read_ftp_reply(reader)
+        if code == 331:
+            writer.write(f"PASS {target.password or ''}\r\n".encode("latin-1"))
+            code, text = await read_ftp_reply(reader)
+        if code == 230:
+            writer.write(b"QUIT\r\n")
+            return CheckResult(CheckStatus.OK)
+        if code == 530:
+            raise CheckFailed(CheckStatus.AUTH_FAILED, text)
+        raise CheckFailed(CheckStatus.ERROR, text)
+    finally:
+        await close_connection(writer)
+
+
+# SSH
+
+@register_checker(CredentialType.LINUX)
+async def check_ssh(target: CheckTarget) -> CheckResult:
+    """Authenticate with asyncssh when installed, otherwise check the SSH banner."""
+    if asyncssh is not None and target.username:
+        return await _check_ssh_login(target)
+
+    reader, writer = await open_connection(target)
+    try:
+        banner = (await reader.readline()).decode("latin-1").strip()
+    finally:
+        await close_connection(writer)
+    if not banner.startswith("SSH-"):
+        raise CheckFailed(CheckStatus.ERROR, f"Not an SSH server: {banner[:80]!r}")
+    return CheckResult(CheckStatus.REACHABLE, banner)
+
+
+async def _check_ssh_login(target: CheckTarget) -> CheckResult:
+    if not target.host:
+        raise CheckFailed(CheckStatus.SKIPPED, "No host")
+    ssh_key = target.extra_data.get("ssh_key")
+    # Without a known_hosts file the server's host key is accepted unchecked
+    known_hosts = get_settings().verify_ssh_known_hosts or None
+    try:
+        connection = await asyncssh.connect(
+            target.host,
+            port=target.port or DEFAULT_PORTS[target.type],
+            username=target.username,
+            password=target.password,
+            client_keys=[asyncssh.import_private_key(ssh_key)] if ssh_key else None,
+            known_hosts=known_hosts,
+        )
+    except asyncssh.PermissionDenied as e:
+        raise CheckFailed(CheckStatus.AUTH_FAILED, str(e))
+    except asyncssh.HostKeyNotVerifiable as e:
+        raise CheckFailed(CheckStatus.ERROR, f"Host key not verified: {e}")
+    except OSError as e:
+        raise CheckFailed(CheckStatus.UNREACHABLE, str(e))
+    connection.close()
+    return CheckResult(CheckStatus.OK, None if known_hosts else "Host key not verified")
+
+
+# Oracle
+
+@register_checker(CredentialType.ORACLE)
+async def check_oracle(target: CheckTarget) -> CheckResult:
+    """Log in with python-oracledb when installed, otherwise check the listener port."""
+    if oracledb is not None and target.username:
+        return await _check_oracle_login(target)
+
+    _, writer = await open_connection(target)
+    await close_connection(writer)
+    return CheckResult(CheckStatus.REACHABLE, "Listener port open")
+
+
+async def _check_oracle_login(target: CheckTarget) -> CheckResult:
+    dsn = target.extra_data.get("tns")
+    if not dsn:
+        if not target.host:
+            raise CheckFailed(CheckStatus.SKIPPED, "No host or TNS entry")
+        port = target.port or DEFAULT_PORTS[target.type]
+        dsn = f"{target.host}:{port}/{target.extra_data.get('service_name') or ''}"
+    try:
+        connection = await oracledb.connect_async(user=target.username, password=target.password, dsn=dsn)
+    except oracledb.Error as e:
+        message = str(e)
+        # ORA-01017: invalid username/password
+        status = CheckStatus.AUTH_FAILED if "ORA-01017" in message else CheckStatus.ERROR
+        raise CheckFailed(status, message)
+    await connection.close()
+    return CheckResult(CheckStatus.OK)
+
+
+# S3
+
+def sign_v4(
+    method: str,
+    url: str,
+    region: str,
+    access_key: str,
+    secret_key: str,
+    service: str = "s3",
+    now: Optional[datetime] = None,
+) -> dict:
+    """AWS Signature Version 4 headers for a request without a body or query string."""
+    now = now or datetime.now(timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date = amz_date[:8]
+    parts = urlsplit(url)
+    payload_hash = hashlib.sha256(b"").hexdigest()
+
+    headers = {"host": parts.netloc, "x-amz-content-sha256": payload_hash, "x-amz-date": amz_date}
+    signed_headers = ";".join(sorted(headers))
+    canonical_request = "\n".join([
+        method,
+        parts.path or "/",  # already URI-encoded
+        "",  # query string
+        "".join(f"{k}:{headers[k]}\n" for k in sorted(headers)),
+        signed_headers,
+        payload_hash,
+    ])
+    scope = f"{date}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256",
+        amz_date,
+        scope,
+        hashlib.sha256(canonical_request.encode()).hexdigest(),
+    ])
+
+    key = f"AWS4{secret_key}".encode()
+    for part in (date, region, service, "aws4_request"):
+        key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+    headers["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={access_key}/{scope}, "
+        f"SignedHeaders={signed_headers}, Signature={signature}"
+    )
+    del headers["host"]  # set by the HTTP client from the URL
+    return headers
+
+
+@register_checker(CredentialType.S3)
+async def check_s3(target: CheckTarget) -> CheckResult:
+    """Signed HEAD of the bucket, or ListBuckets when no bucket is configured."""
+    import httpx
+
+    extra = target.extra_data
+    access_key = extra.get("access_key") or target.username
+    secret_key = extra.get("secret_key") or target.password
+    if not access_key or not secret_key:
+        raise CheckFailed(CheckStatus.SKIPPED, "No access key")
+
+    region = extra.get("region") or "us-east-1"
+    endpoint = (extra.get("endpoint") or target.host or f"https://s3.{region}.amazonaws.com").rstrip("/")
+    if "://" not in endpoint:
+        endpoint = f"https://{endpoint}"
+    bucket = extra.get("bucket")
+    method = "HEAD" if bucket else "GET"
+    url = f"{endpoint}/{quote(bucket)}" if bucket else f"{endpoint}/"
+
+    headers = sign_v4(method, url, region, access_key, secret_key)
+    try:
+        async with httpx.AsyncClient() as client:
+            response = await client.request(method, url, headers=headers)
+    except httpx.TransportError as e:
+        raise CheckFailed(CheckStatus.UNREACHABLE, f"{endpoint}: {e}")
+
+    if response.status_code == 200:
+        return CheckResult(CheckStatus.OK)
+    if response.status_code in (401, 403):
+        raise CheckFailed(CheckStatus.AUTH_FAILED, f"HTTP {response.status_code}")
+    if response.status_code == 404:
+        raise CheckFailed(CheckStatus.ERROR, f"Bucket {bucket!r} not found")
+    if response.status_code == 301:
+        raise CheckFailed(CheckStatus.ERROR, "Bucket is in another region")
+    raise CheckFailed(CheckStatus.ERROR, f"HTTP {response.status_code}")
+
+
+class ConnectivityChecker:
+    """Runs checkers concurrently with a semaphore and caches their results.
+
+    Cached results are keyed by credential id and a version that changes
+    with every edit (the vault and the credential's latest change log
+    sequence number), so editing a credential invalidates its result. The
+    cache is per worker process.
+    """
+
+    def __init__(self, concurrency: int, timeout: float, type_timeouts: dict[str, float], cache_ttl: float):
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._timeout = timeout
+        self._type_timeouts = type_timeouts
+        self._cache = TTLCache(ttl=cache_ttl, maxsize=20000)
+
+    def timeout_for(self, credential_type: CredentialType) -> float:
+        return self._type_timeouts.get(credential_type.value, self._timeout)
+
+    def cached(self, target: CheckTarget, version: object) -> Optional[CheckResult]:
+        result = self._cache.get((target.id, version))
+        if result is None:
+            return None
+        return CheckResult(result.status, result.detail, result.latency_ms, result.checked_at, cached=True)
+
+    async def check_many(
+        self,
+        targets: list[tuple[CheckTarget, object]],
+        force: bool = False,
+    ) -> dict[int, CheckResult]:
+        """Check ``(target, version)`` pairs; results are reused unless ``force``."""
+        results = {}
+        pending = []
+        for target, version in targets:
+            result = None if force else self.cached(target, version)
+            if result is None:
+                pending.append((target, version))
+            else:
+                results[target.id] = result
+
+        checked = await asyncio.gather(*(self.check(target) for target, _ in pending))
+        for (target, version), result in zip(pending, checked):
+            self._cache.set((target.id, version), result)
+            results[target.id] = result
+        return results
+
+    async def check(self, target: CheckTarget) -> CheckResult:
+        checker = CHECKERS.get(target.type)
+        if checker is None:
+            return CheckResult(CheckStatus.SKIPPED, f"No checker for {target.type.value}")
+
+        timeout = self.timeout_for(target.type)
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(checker(target), timeout)
+            except CheckFailed as e:
+                result = CheckResult(e.status, e.detail)
+            except asyncio.TimeoutError:
+                result = CheckResult(CheckStatus.TIMEOUT, f"No answer within {timeout:g}s")
+            except Exception as e:
+                logger.debug("Connectivity check of credential %s failed", target.id, exc_info=True)
+                result = CheckResult(CheckStatus.ERROR, str(e) or type(e).__name__)
+            if result.status != CheckStatus.SKIPPED:
+                result.latency_ms = int((time.perf_counter() - started) * 1000)
+        return result
+
+
+# Singleton instance
+_checker: ConnectivityChecker | None = None
+
+
+def get_connectivity_checker() -> ConnectivityChecker:
+    global _checker
+    if _checker is None:
+        settings = get_settings()
+        _checker = ConnectivityChecker(
+            concurrency=settings.verify_concurrency,
+            timeout=settings.verify_timeout_seconds,
+            type_timeouts=settings.verify_type_timeouts,
+            cache_ttl=settings.verify_cache_ttl_seconds,
+        )
+    return _checker
@@ -0,0 +1,58 @@
+import json
+from typing import Sequence
+
+from sqlalchemy import Row, Select, select
+
+from app.models import Category, Credential
+from app.services.crypto import get_crypto_service
+from app.services.tracing import get_tracer
+
+# Columns of a credential response, in response field order. Selecting these
+# with Core skips ORM identity-map bookkeeping and the category relationship
+# load; rows come back as plain tuples with attribute access.
+RESPONSE_COLUMNS = (
+    Credential.id,
+    Credential.name,
+    Credential.type,
+    Credential.host,
+    Credential.port,
+    Credential.username,
+    Credential.password,
+    Credential.extra_data,
+    Credential.category_id,
+    Credential.tags,
+    Credential.description,
+    Credential.created_at,
+    Credential.updated_at,
+    Category.name.label("category_name"),
+    Category.color.label("category_color"),
+)
+RESPONSE_FIELDS = tuple(column.key for column in RESPONSE_COLUMNS)
+ENCRYPTED_FIELDS = ("host", "username", "password")
+
+
+def select_credential_rows() -> Select:
+    """Select response columns with the category joined in."""
+    return select(*RESPONSE_COLUMNS).outerjoin(Category, Credential.category_id == Category.id)
+
+
+def decrypt_rows(rows: Sequence[Row]) -> list[dict]:
+    """Decrypt rows column by column and return response dicts.
+
+    Each encrypted column is decrypted in one batch, which keeps the per-row
+    work down to building the dict.
+    """
+    if not rows:
+        return []
+
+    crypto = get_crypto_service()
+    with get_tracer().span("crypto.decrypt", rows=len(rows)):
+        columns = dict(zip(RESPONSE_FIELDS, zip(*rows)))
+        for field in ENCRYPTED_FIELDS:
+            columns[field] = crypto.decrypt_many(columns[field])
+        columns["extra_data"] = [
+            json.loads(value) if value else None
+            for value in crypto.decrypt_many(columns["extra_data"])
+        ]
+        columns["tags"] = [tags or [] for tags in columns["tags"]]
+        return [dict(zip(RESPONSE_FIELDS, values)) for values in zip(*columns.values())]
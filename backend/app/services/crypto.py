@@ -1,5 +1,8 @@
 import base64
+import hashlib
+import hmac
 import json
+from typing import Iterable, Optional
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -10,19 +13,21 @@ from app.config import get_settings
 class CryptoService:
     def __init__(self):
         settings = get_settings()
-        self._fernet = self._create_fernet(settings.encryption_key)
+        master_key = self._derive_key(settings.encryption_key)
+        self._fernet = Fernet(base64.urlsafe_b64encode(master_key))
+        # Separate key for blind indexes, so index values reveal nothing about the Fernet key
+        self._index_key = hmac.new(master_key, b"whatsmypasswd_blind_index", hashlib.sha256).digest()
+        self._fingerprint_key = hmac.new(master_key, b"whatsmypasswd_fingerprint", hashlib.sha256).digest()
 
-    def _create_fernet(self, key: str) -> Fernet:
-        """Create Fernet instance from encryption key."""
-        # Derive a proper Fernet key from the provided key
+    def _derive_key(self, key: str) -> bytes:
+        """Derive 32 bytes of key material from the encryption key."""
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=b"whatsmypasswd_salt",  # Fixed salt for consistency
             iterations=100000,
         )
-        derived_key = base64.urlsafe_b64encode(kdf.derive(key.encode()))
-        return Fernet(derived_key)
+        return kdf.derive(key.encode())
 
     def encrypt(self, plaintext: str) -> str:
         """Encrypt a string and return base64 encoded ciphertext."""
@@ -38,6 +43,31 @@ class CryptoService:
         encrypted = base64.urlsafe_b64decode(ciphertext.encode())
         return self._fernet.decrypt(encrypted).decode()
 
+    def decrypt_many(self, ciphertexts: Iterable[Optional[str]]) -> list[Optional[str]]:
+        """Decrypt a column of ciphertexts; empty values become None."""
+        fernet_decrypt = self._fernet.decrypt
+        b64decode = base64.urlsafe_b64decode
+        return [
+            fernet_decrypt(b64decode(ciphertext)).decode() if ciphertext else None
+            for ciphertext in ciphertexts
+        ]
+
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt raw bytes, e.g. a file stored at rest."""
+        return self._fernet.encrypt(data)
+
+    def decrypt_bytes(self, token: bytes) -> bytes:
+        """Decrypt bytes produced by encrypt_bytes."""
+        return self._fernet.decrypt(token)
+
+    def blind_index(self, value: str) -> str:
+        """Return a keyed HMAC of a value for exact-match lookups."""
+        return hmac.new(self._index_key, value.encode(), hashlib.sha256).hexdigest()
+
+    def fingerprint(self, value: str) -> str:
+        """Return a keyed HMAC of a secret, used to detect reuse without decryption."""
+        return hmac.new(self._fingerprint_key, value.encode(), hashlib.sha256).hexdigest()
+
     def encrypt_dict(self, data: dict) -> str:
         """Encrypt a dictionary as JSON string."""
         if not data:
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.db.database import async_session, current_vault
+from app.models import AuditLog, ChangeLog
+
+logger = logging.getLogger(__name__)
+
+_WROTE_KEY = "publish_events"
+# Longest wait between attempts to read the feed's starting position
+RETRY_MAX_DELAY = 30.0
+
+
+class Subscription:
+    """Bounded event queue of a single feed subscriber."""
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    def offer(self, item: Optional[dict]) -> bool:
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def get(self) -> Optional[dict]:
+        """Next event, or None once the subscription has been closed."""
+        return await self._queue.get()
+
+    def close(self) -> None:
+        # Make room for the close marker so the reader always wakes up
+        while not self.offer(None):
+            self._queue.get_nowait()
+
+
+class EventBroker:
+    """In-process pub/sub for committed credential, category and audit events.
+
+    Events are read from the change_log and audit_logs tables, so writes made
+    by other worker processes are delivered too. A local commit wakes the
+    reader immediately; otherwise it polls every ``poll_interval`` seconds,
+    and only while someone is subscribed. Subscribers that fall more than
+    ``queue_size`` events behind are disconnected instead of slowing down
+    the others; they can catch up through the delta sync endpoint.
+    """
+
+    def __init__(self, queue_size: int, max_subscribers: int, poll_interval: float):
+        self._queue_size = queue_size
+        self._max_subscribers = max_subscribers
+        self._poll_interval = poll_interval
+        self._subscribers: set[Subscription] = set()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Optional[Subscription]:
+        """Register a subscriber. Returns None when the subscriber limit is reached."""
+        if len(self._subscribers) >= self._max_subscribers:
+            return None
+        subscription = Subscription(self._queue_size)
+        self._subscribers.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def notify(self) -> None:
+        """Signal that new rows were committed."""
+        if self._subscribers:
+            self._wakeup.set()
+
+    def publish(self, item: dict) -> None:
+        for subscription in list(self._subscribers):
+            if not subscription.offer(item):
+                subscription.lagged = True
+                subscription.close()
+                self._subscribers.discard(subscription)
+
+    async def stop(self) -> None:
+        for subscription in self._subscribers:
+            subscription.close()
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        positions = None
+        delay = self._poll_interval
+        while self._subscribers:
+            if positions is None:
+                # Until the feed's starting point is known there is nothing to poll from
+                try:
+                    positions = await self._latest_positions()
+                except Exception:
+                    logger.exception("Failed to read change feed position, retrying in %.1f s", delay)
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, RETRY_MAX_DELAY)
+                    continue
+                last_seq, last_audit_id = positions
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                last_seq, last_audit_id = await self._poll(last_seq, last_audit_id)
+            except Exception:
+                logger.exception("Failed to read change feed")
+
+    async def _latest_positions(self) -> tuple[int, int]:
+        """Newest change sequence and audit log id; the feed starts after them."""
+        async with async_session() as session:
+            last_seq = await session.scalar(select(func.max(ChangeLog.seq))) or 0
+            last_audit_id = await session.scalar(select(func.max(AuditLog.id))) or 0
+        return last_seq, last_audit_id
+
+    async def _poll(self, last_seq: int, last_audit_id: int) -> tuple[int, int]:
+        async with async_session() as session:
+            changes = (await session.execute(
+                select(ChangeLog)
+                .where(ChangeLog.seq > last_seq)
+                .order_by(ChangeLog.seq)
+                .limit(500)
+            )).scalars().all()
+            audits = (await session.execute(
+                select(AuditLog)
+                .where(AuditLog.id > last_audit_id)
+                .order_by(AuditLog.id)
+                .limit(500)
+            )).scalars().all()
+
+        for change in changes:
+            self.publish({
+                "event": change.entity,
+                "data": {"seq": change.seq, "op": change.op.value, "id": change.entity_id},
+            })
+        for log in audits:
+            self.publish({
+                "event": "audit",
+                "data": {
+                    "id": log.id,
+                    "action": log.action.value,
+                    "credential_id": log.credential_id,
+                    "credential_name": log.credential_name,
+                    "created_at": log.created_at.isoformat() if log.created_at else None,
+                },
+            })
+
+        if changes:
+            last_seq = changes[-1].seq
+        if audits:
+            last_audit_id = audits[-1].id
+        # A full batch means more rows are waiting
+        if len(changes) == 500 or len(audits) == 500:
+            self._wakeup.set()
+        return last_seq, last_audit_id
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_statement(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_commit(session):
+    if session.info.pop(_WROTE_KEY, False):
+        broker = _brokers.get(current_vault())
+        if broker is not None:
+            broker.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_flag(session):
+    session.info.pop(_WROTE_KEY, None)
+
+
+# One broker per vault; its reader task inherits the vault of the first subscriber
+_brokers: dict[str, EventBroker] = {}
+
+
+def get_event_broker() -> EventBroker:
+    """Broker of the current vault."""
+    vault = current_vault()
+    broker = _brokers.get(vault)
+    if broker is None:
+        settings = get_settings()
+        broker = _brokers[vault] = EventBroker(
+            queue_size=settings.event_queue_size,
+            max_subscribers=settings.event_max_subscribers,
+            poll_interval=settings.event_poll_interval_seconds,
+        )
+    return broker
+
+
+async def stop_event_brokers() -> None:
+    for broker in _brokers.values():
+        await broker.stop()
@@ -0,0 +1,102 @@
+import json
+import logging
+from typing import Optional
+
+from sqlalchemy import bindparam, or_, select, update
+
+from app.db.database import async_session
+from app.models import Credential
+from app.services.crypto import get_crypto_service
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def index_host(host: Optional[str]) -> Optional[str]:
+    """Blind index of a host name (case-insensitive, like DNS names)."""
+    return get_crypto_service().blind_index(host.strip().lower()) if host else None
+
+
+def index_username(username: Optional[str]) -> Optional[str]:
+    """Blind index of a user name (case-sensitive)."""
+    return get_crypto_service().blind_index(username.strip()) if username else None
+
+
+def fingerprint_password(password: Optional[str]) -> Optional[str]:
+    return get_crypto_service().fingerprint(password) if password else None
+
+
+def fingerprint_extra_data(extra_data: Optional[dict]) -> Optional[str]:
+    """Fingerprint of the extra data, independent of key order."""
+    if not extra_data:
+        return None
+    return get_crypto_service().fingerprint(json.dumps(extra_data, sort_keys=True, ensure_ascii=False))
+
+
+def search_columns(data: dict) -> dict:
+    """Blind index and fingerprint values for the plaintext fields present in ``data``."""
+    columns = {}
+    if "host" in data:
+        columns["host_index"] = index_host(data["host"])
+    if "username" in data:
+        columns["username_index"] = index_username(data["username"])
+    if "password" in data:
+        columns["password_fingerprint"] = fingerprint_password(data["password"])
+    if "extra_data" in data:
+        columns["extra_data_fingerprint"] = fingerprint_extra_data(data["extra_data"])
+    return columns
+
+
+async def backfill_search_columns() -> int:
+    """Compute missing blind indexes and fingerprints for older rows, in batches."""
+    crypto = get_crypto_service()
+    table = Credential.__table__
+    # Core UPDATE keeps updated_at untouched: the visible data did not change
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(
+            host_index=bindparam("host_index"),
+            username_index=bindparam("username_index"),
+            password_fingerprint=bindparam("password_fingerprint"),
+            extra_data_fingerprint=bindparam("extra_data_fingerprint"),
+            updated_at=table.c.updated_at,
+        )
+    )
+
+    total = 0
+    while True:
+        async with async_session() as session:
+            result = await session.execute(
+                select(Credential.id, Credential.host, Credential.username,
+                       Credential.password, Credential.extra_data)
+                .where(or_(
+                    (Credential.host != "") & Credential.host_index.is_(None),
+                    (Credential.username != "") & Credential.username_index.is_(None),
+                    (Credential.password != "") & Credential.password_fingerprint.is_(None),
+                    (Credential.extra_data != "") & Credential.extra_data_fingerprint.is_(None),
+                ))
+                .limit(BACKFILL_BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            params = []
+            for row in rows:
+                values = search_columns({
+                    "host": crypto.decrypt(row.host) if row.host else None,
+                    "username": crypto.decrypt(row.username) if row.username else None,
+                    "password": crypto.decrypt(row.password) if row.password else None,
+                    "extra_data": crypto.decrypt_dict(row.extra_data) if row.extra_data else None,
+                })
+                params.append({"row_id": row.id, **values})
+
+            await session.execute(statement, params)
+            await session.commit()
+            total += len(rows)
+
+    if total:
+        logger.info("Backfilled search columns for %d credentials", total)
+    return total
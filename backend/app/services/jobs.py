@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import delete, func, select, update
+
+from app.config import get_settings
+from app.db.database import async_session, current_vault, use_vault
+from app.models import Job, JobKind, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress writes of a running job
+PROGRESS_FLUSH_INTERVAL = 1.0
+
+
+class JobQueueFull(Exception):
+    """Raised when no more jobs can be queued."""
+
+
+class JobContext:
+    """Handle passed to a running job for progress reporting and result storage."""
+
+    def __init__(self, job_id: str, storage_dir: str):
+        self.job_id = job_id
+        self.result_path = os.path.join(storage_dir, f"{job_id}.bin")
+        self.progress = 0
+
+    def set_progress(self, done: int, total: int) -> None:
+        """Record progress; safe to call from a worker thread."""
+        if total > 0:
+            self.progress = min(100, done * 100 // total)
+
+    def write_result(self, data: bytes) -> None:
+        """Store the result file, readable by the owner only."""
+        fd = os.open(self.result_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+
+# A job returns an optional JSON summary; files are written through the context
+JobFunc = Callable[[JobContext], Awaitable[Optional[dict]]]
+
+
+class JobManager:
+    """Bounded worker pool for exports and imports that outlive a request.
+
+    Job state lives in the jobs table of the submitting request's vault, so
+    any worker process can report on a job; the job itself runs in the
+    process that accepted it, against the same vault. That process records
+    its pid and refreshes a heartbeat on its unfinished jobs, so the leader
+    can fail the jobs of a worker that crashed or was recycled.
+    """
+
+    def __init__(self, workers: int, queue_size: int, storage_dir: str, ttl_hours: int, heartbeat_seconds: float):
+        self._workers = workers
+        self._storage_dir = storage_dir
+        self._ttl = timedelta(hours=ttl_hours)
+        self._heartbeat_interval = heartbeat_seconds
+        self._queue: asyncio.Queue[tuple[str, str, JobFunc]] = asyncio.Queue(queue_size)
+        self._tasks: list[asyncio.Task] = []
+        self._unfinished: dict[str, str] = {}  # job id -> vault
+        self._reserved = 0  # queue slots held by submits still writing their job row
+
+    async def start(self) -> None:
+        os.makedirs(self._storage_dir, mode=0o700, exist_ok=True)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self._workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        # Jobs still waiting in the queue will never run
+        pending = []
+        while not self._queue.empty():
+            job_id, vault, _ = self._queue.get_nowait()
+            pending.append((job_id, vault))
+        for job_id, vault in pending:
+            async with use_vault(vault):
+                await self._finish(job_id, JobStatus.FAILED, error="Interrupted by server shutdown")
+
+    async def submit(self, kind: JobKind, func: JobFunc) -> Job:
+        """Queue a job. Raises JobQueueFull when the queue is at capacity."""
+        # The slot is taken before the first await, so concurrent submits can't all pass the check
+        if self._queue.maxsize and self._queue.qsize() + self._reserved >= self._queue.maxsize:
+            raise JobQueueFull()
+        self._reserved += 1
+        try:
+            job = await self._create(kind)
+        finally:
+            self._reserved -= 1
+
+        self._queue.put_nowait((job.id, current_vault(), func))
+        self._unfinished[job.id] = current_vault()
+        return job
+
+    async def _create(self, kind: JobKind) -> Job:
+        job = Job(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            status=JobStatus.PENDING,
+            progress=0,
+            worker_pid=os.getpid(),
+            heartbeat_at=datetime.now(timezone.utc),
+            # Bounds the lifetime of jobs orphaned by a crashed worker
+            expires_at=datetime.now(timezone.utc) + self._ttl,
+        )
+        async with async_session() as session:
+            session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job_id, vault, func = await self._queue.get()
+            try:
+                async with use_vault(vault):
+                    await self._run(job_id, func)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str, func: JobFunc) -> None:
+        context = JobContext(job_id, self._storage_dir)
+        await self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.now(timezone.utc))
+        reporter = asyncio.create_task(self._report_progress(context))
+        try:
+            result = await func(context)
+        except asyncio.CancelledError:
+            await self._finish(job_id, JobStatus.FAILED, error="Interrupted by server shutdown")
+            raise
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            await self._finish(job_id, JobStatus.FAILED, error=str(e) or type(e).__name__)
+        else:
+            await self._finish(
+                job_id,
+                JobStatus.SUCCEEDED,
+                result=result,
+                result_path=context.result_path if os.path.exists(context.result_path) else None,
+            )
+        finally:
+            reporter.cancel()
+
+    async def _report_progress(self, context: JobContext) -> None:
+        reported = 0
+        while True:
+            await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+            if context.progress != reported:
+                reported = context.progress
+                try:
+                    await self._update(context.job_id, progress=reported)
+                except Exception:
+                    logger.exception("Failed to record progress of job %s", context.job_id)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self._heartbeat_interval)
+            by_vault: dict[str, list[str]] = {}
+            for job_id, vault in self._unfinished.items():
+                by_vault.setdefault(vault, []).append(job_id)
+            now = datetime.now(timezone.utc)
+            for vault, job_ids in by_vault.items():
+                try:
+                    async with use_vault(vault):
+                        async with async_session() as session:
+                            await session.execute(
+                                update(Job).where(Job.id.in_(job_ids)).values(heartbeat_at=now)
+                            )
+                            await session.commit()
+                except Exception:
+                    logger.exception("Failed to record job heartbeats in vault %s", vault)
+
+    async def _finish(self, job_id: str, status: JobStatus, **values) -> None:
+        self._unfinished.pop(job_id, None)
+        now = datetime.now(timezone.utc)
+        if status == JobStatus.SUCCEEDED:
+            values["progress"] = 100
+        await self._update(job_id, status=status, finished_at=now, expires_at=now + self._ttl, **values)
+
+    async def _update(self, job_id: str, **values) -> None:
+        async with async_session() as session:
+            await session.execute(update(Job).where(Job.id == job_id).values(**values))
+            await session.commit()
+
+
+async def fail_stale_jobs() -> int:
+    """Fail unfinished jobs whose worker stopped sending heartbeats (crashed or recycled)."""
+    settings = get_settings()
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(seconds=settings.job_stale_after_seconds)
+    async with async_session() as session:
+        result = await session.execute(
+            update(Job)
+            .where(
+                Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+                # Jobs created before heartbeats were recorded fall back to their start time
+                func.coalesce(Job.heartbeat_at, Job.started_at, Job.created_at) < cutoff,
+            )
+            .values(
+                status=JobStatus.FAILED,
+                error="Worker stopped before the job finished",
+                finished_at=now,
+                expires_at=now + timedelta(hours=settings.job_result_ttl_hours),
+            )
+        )
+        await session.commit()
+
+    if result.rowcount:
+        logger.warning("Failed %d jobs left unfinished by a stopped worker", result.rowcount)
+    return result.rowcount
+
+
+async def purge_expired_jobs() -> int:
+    """Delete expired jobs and their result files."""
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        result = await session.execute(
+            select(Job.id, Job.result_path).where(Job.expires_at < now)
+        )
+        expired = result.all()
+        if not expired:
+            return 0
+
+        for row in expired:
+            if row.result_path:
+                try:
+                    os.remove(row.result_path)
+                except FileNotFoundError:
+                    pass
+        await session.execute(delete(Job).where(Job.id.in_([row.id for row in expired])))
+        await session.commit()
+
+    logger.info("Purged %d expired jobs", len(expired))
+    return len(expired)
+
+
+# Singleton instance
+_job_manager: JobManager | None = None
+
+
+def get_job_manager() -> JobManager:
+    global _job_manager
+    if _job_manager is None:
+        settings = get_settings()
+        _job_manager = JobManager(
+            workers=settings.job_workers,
+            queue_size=settings.job_queue_size,
+            storage_dir=settings.job_storage_dir,
+            ttl_hours=settings.job_result_ttl_hours,
+            heartbeat_seconds=settings.job_heartbeat_seconds,
+        )
+    return _job_manager
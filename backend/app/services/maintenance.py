@@ -0,0 +1,282 @@
+"""SQLite maintenance: integrity check, index rebuilds, ANALYZE, incremental VACUUM and WAL checkpoint.
+
+Runs on the leader's schedule (``MAINTENANCE_INTERVAL_HOURS``) or by hand:
+
+    python -m app.services.maintenance
+    python -m app.services.maintenance --vault team-a --full-vacuum --json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from app.config import get_settings
+from app.db.database import current_vault, get_vault_registry, use_vault
+from app.services.backup import BackupInProgress, backup_dir, backup_lock, database_path
+
+logger = logging.getLogger(__name__)
+
+# Index problems reported by integrity_check that REINDEX repairs
+INDEX_PROBLEM = re.compile(r"\bindex (\S+)$")
+
+# auto_vacuum modes
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def report_path(source_path: str) -> str:
+    """Where the last maintenance report of a database is kept."""
+    return f"{source_path}.maintenance.json"
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def database_stats(conn: sqlite3.Connection, source_path: str) -> dict:
+    """File sizes and page counts; the WAL is counted since it holds uncheckpointed pages."""
+    wal_path = f"{source_path}-wal"
+    return {
+        "size": os.path.getsize(source_path),
+        "wal_size": os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+        "page_count": conn.execute("PRAGMA page_count").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count").fetchone()[0],
+    }
+
+
+def run_maintenance(
+    source_path: str,
+    pages_per_step: int,
+    step_sleep: float,
+    analysis_limit: int,
+    busy_timeout_ms: int,
+    full_vacuum: bool = False,
+    reindex: bool = False,
+) -> dict:
+    """Maintain the database in short steps with a pause in between.
+
+    Every statement runs in its own transaction, so writers are held up for
+    one step at a time. Damage other than broken indexes stops the run before
+    anything is rewritten. Blocking, run it in a thread.
+    """
+    started = time.perf_counter()
+    conn = sqlite3.connect(source_path, timeout=busy_timeout_ms / 1000, isolation_level=None)
+    steps: list[dict] = []
+
+    def step(name: str, func: Callable[[], dict]) -> dict:
+        step_started = time.perf_counter()
+        detail = func()
+        steps.append({"step": name, "duration_ms": round((time.perf_counter() - step_started) * 1000, 1), **detail})
+        time.sleep(step_sleep)
+        return detail
+
+    def integrity_check() -> dict:
+        messages = [row[0] for row in conn.execute("PRAGMA integrity_check(100)")]
+        return {"ok": messages == ["ok"], "messages": [] if messages == ["ok"] else messages}
+
+    def rebuild_indexes(names: list[str]) -> dict:
+        for name in names:
+            conn.execute(f"REINDEX {_quote(name)}")
+            time.sleep(step_sleep)
+        return {"indexes": names}
+
+    def analyze() -> dict:
+        conn.execute(f"PRAGMA analysis_limit={int(analysis_limit)}")
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )]
+        for table in tables:
+            conn.execute(f"ANALYZE {_quote(table)}")
+            time.sleep(step_sleep)
+        # Refreshes planner state after the new statistics
+        conn.execute("PRAGMA optimize")
+        return {"tables": len(tables)}
+
+    def vacuum() -> dict:
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if mode == AUTO_VACUUM_INCREMENTAL:
+            released = 0
+            while free_pages > 0:
+                # executescript steps the pragma to completion; execute() frees a single page
+                conn.executescript(f"PRAGMA incremental_vacuum({int(pages_per_step)})")
+                remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if remaining >= free_pages:
+                    break
+                released += free_pages - remaining
+                free_pages = remaining
+                time.sleep(step_sleep)
+            return {"mode": "incremental", "pages_released": released}
+        if full_vacuum:
+            # Rewrites the whole file once and switches it to incremental auto_vacuum
+            conn.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}")
+            conn.execute("VACUUM")
+            return {"mode": "full", "pages_released": free_pages}
+        return {"mode": "skipped", "pages_released": 0, "free_pages": free_pages}
+
+    def checkpoint() -> dict:
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+            return {"skipped": True}
+        busy, wal_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+        return {"busy": bool(busy), "wal_frames": wal_frames, "checkpointed": checkpointed}
+
+    try:
+        before = database_stats(conn, source_path)
+        integrity = step("integrity_check", integrity_check)
+        broken = [INDEX_PROBLEM.search(m) for m in integrity["messages"]]
+        repairable = not integrity["ok"] and all(broken)
+
+        if integrity["ok"] or repairable:
+            if reindex:
+                names = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+                step("reindex", lambda: rebuild_indexes(names))
+            elif repairable:
+                step("reindex", lambda: rebuild_indexes(sorted({m.group(1) for m in broken})))
+            if repairable:
+                integrity = step("integrity_check", integrity_check)
+            step("analyze", analyze)
+            step("vacuum", vacuum)
+            step("wal_checkpoint", checkpoint)
+        else:
+            logger.error("Integrity check of %s failed, skipped maintenance: %s", source_path, integrity["messages"])
+        after = database_stats(conn, source_path)
+    finally:
+        conn.close()
+
+    return {
+        "database": source_path,
+        "ok": integrity["ok"],
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "before": before,
+        "after": after,
+        "steps": steps,
+    }
+
+
+def write_report(source_path: str, report: dict) -> None:
+    fd = os.open(report_path(source_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+async def maintain_database(full_vacuum: bool = False, reindex: bool = False) -> Optional[dict]:
+    """Maintain the current vault's database; None for databases other than SQLite.
+
+    Holds the vault's backup lock: pages rewritten mid-backup would make the
+    online backup start over. Raises BackupInProgress while a backup runs.
+    """
+    settings = get_settings()
+    source_path = database_path()
+    if source_path is None:
+        return None
+
+    def run() -> dict:
+        directory = backup_dir()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        with backup_lock(directory):
+            report = run_maintenance(
+                source_path,
+                settings.maintenance_pages_per_step,
+                settings.maintenance_step_sleep_seconds,
+                settings.maintenance_analysis_limit,
+                settings.sqlite_busy_timeout_ms,
+                full_vacuum=full_vacuum,
+                reindex=reindex,
+            )
+        report["vault"] = current_vault()
+        write_report(source_path, report)
+        return report
+
+    # The vault is read from the context, which to_thread carries over
+    report = await asyncio.to_thread(run)
+    before, after = report["before"], report["after"]
+    logger.info(
+        "Maintained vault %s in %.0f ms: %d -> %d bytes (WAL %d -> %d), integrity %s",
+        report["vault"], report["duration_ms"], before["size"], after["size"],
+        before["wal_size"], after["wal_size"], "ok" if report["ok"] else "FAILED",
+    )
+    return report
+
+
+def last_maintenance(source_path: str) -> Optional[datetime]:
+    try:
+        return datetime.fromtimestamp(os.stat(report_path(source_path)).st_mtime, timezone.utc)
+    except FileNotFoundError:
+        return None
+
+
+async def scheduled_maintenance() -> None:
+    """Leader job: maintain the database unless that was done within the interval."""
+    settings = get_settings()
+    source_path = database_path()
+    if source_path is None:
+        return
+    # The schedule restarts with every deploy; the report file remembers the last run
+    last = last_maintenance(source_path)
+    if last is not None and last > datetime.now(timezone.utc) - timedelta(hours=settings.maintenance_interval_hours):
+        return
+
+    try:
+        await maintain_database()
+    except BackupInProgress:
+        logger.info("Postponed maintenance: a backup is in progress")
+
+
+def format_report(report: dict) -> str:
+    before, after = report["before"], report["after"]
+    lines = [
+        f"vault {report['vault']} ({report['database']}): "
+        f"integrity {'ok' if report['ok'] else 'FAILED'}, {report['duration_ms']:.0f} ms",
+        f"  size      {before['size']:>12,} -> {after['size']:>12,} bytes",
+        f"  wal       {before['wal_size']:>12,} -> {after['wal_size']:>12,} bytes",
+        f"  free      {before['freelist_count']:>12,} -> {after['freelist_count']:>12,} pages",
+    ]
+    for step in report["steps"]:
+        detail = ", ".join(f"{k}={v}" for k, v in step.items() if k not in ("step", "duration_ms"))
+        lines.append(f"  {step['step']:<16}{step['duration_ms']:>9.1f} ms  {detail}")
+    return "\n".join(lines)
+
+
+async def main(vaults: list[str], full_vacuum: bool, reindex: bool, as_json: bool) -> int:
+    registry = get_vault_registry()
+    unknown = [name for name in vaults if name not in registry]
+    if unknown:
+        print(f"Unknown vault(s): {', '.join(unknown)}")
+        return 2
+
+    failed = False
+    try:
+        for name in vaults or registry.names:
+            async with use_vault(name):
+                try:
+                    report = await maintain_database(full_vacuum=full_vacuum, reindex=reindex)
+                except BackupInProgress:
+                    print(f"vault {name}: skipped, a backup is in progress")
+                    failed = True
+                    continue
+            if report is None:
+                print(f"vault {name}: skipped, not a SQLite database")
+                continue
+            failed = failed or not report["ok"]
+            print(json.dumps(report) if as_json else format_report(report))
+    finally:
+        await registry.close_all()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", action="append", default=[], help="Vault to maintain (repeatable; default: all)")
+    parser.add_argument("--full-vacuum", action="store_true",
+                        help="Rewrite databases without incremental auto_vacuum once (blocks writers meanwhile)")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild every index, not only broken ones")
+    parser.add_argument("--json", action="store_true", help="Print the reports as JSON lines")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.vault, args.full_vacuum, args.reindex, args.json)))
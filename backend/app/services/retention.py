@@ -0,0 +1,28 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from app.config import get_settings
+from app.db.database import async_session
+from app.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+
+async def purge_expired_audit_logs() -> int:
+    """Delete audit logs older than the configured retention period."""
+    settings = get_settings()
+    if settings.audit_retention_days <= 0:
+        return 0
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.audit_retention_days)
+    async with async_session() as session:
+        result = await session.execute(
+            delete(AuditLog).where(AuditLog.created_at < cutoff)
+        )
+        await session.commit()
+
+    if result.rowcount:
+        logger.info("Purged %d audit logs older than %s", result.rowcount, cutoff.isoformat())
+    return result.rowcount
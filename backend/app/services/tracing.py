@@ -0,0 +1,410 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+_SQL_SPANS_KEY = "tracing_sql_spans"
+
+
+class Span:
+    """One timed stage of a trace, OpenTelemetry style."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """Stands in for a span while tracing is off, so call sites need no checks."""
+
+    __slots__ = ()
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class SpanExporter:
+    """Receives finished spans. ``export`` runs inline, so it must not block."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def start(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the most recent spans, for tests and the diagnostics endpoint."""
+
+    def __init__(self, maxlen: int = 10000):
+        self.spans: deque[Span] = deque(maxlen=maxlen)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def clear(self) -> None:
+        self.spans.clear()
+
+    def traces(self, limit: int) -> list[dict]:
+        """Most recent traces with their spans, newest first."""
+        traces: dict[str, list[Span]] = {}
+        for span in self.spans:
+            traces.setdefault(span.trace_id, []).append(span)
+        latest = sorted(traces, key=lambda t: max(s.start_ns for s in traces[t]), reverse=True)[:limit]
+        traces = {trace_id: traces[trace_id] for trace_id in latest}
+        result = []
+        for trace_id, spans in traces.items():
+            spans.sort(key=lambda s: s.start_ns)
+            root = next((s for s in spans if s.parent_id is None), spans[0])
+            result.append({
+                "trace_id": trace_id,
+                "name": root.name,
+                "duration_ms": round(root.duration_ms, 3),
+                "spans": [span.to_dict() for span in spans],
+            })
+        return result
+
+
+class ConsoleExporter(SpanExporter):
+    """Logs one line per finished span."""
+
+    def export(self, span: Span) -> None:
+        logger.info(
+            "span %s %.1f ms trace=%s parent=%s %s%s",
+            span.name, span.duration_ms, span.trace_id, span.parent_id or "-",
+            " ".join(f"{k}={v!r}" for k, v in span.attributes.items()),
+            f" error={span.error!r}" if span.error else "",
+        )
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPExporter(SpanExporter):
+    """Sends spans in batches to an OTLP/HTTP collector (JSON encoding).
+
+    Spans are buffered and posted from a background task; when the collector
+    is down the buffer drops the oldest spans instead of growing.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, flush_interval: float = 5.0, max_buffer: int = 20000):
+        self._url = endpoint.rstrip("/") + "/v1/traces"
+        self._service_name = service_name
+        self._flush_interval = flush_interval
+        self._buffer: deque[Span] = deque(maxlen=max_buffer)
+        self._task: Optional[asyncio.Task] = None
+
+    def export(self, span: Span) -> None:
+        self._buffer.append(span)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_periodically())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        import httpx
+
+        if not self._buffer:
+            return
+        spans = [self._buffer.popleft() for _ in range(len(self._buffer))]
+        try:
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(self._url, json=self._payload(spans))
+                response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning("Failed to export %d spans to %s: %s", len(spans), self._url, e)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
+
+    def _payload(self, spans: list[Span]) -> dict:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self._service_name}},
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "whatsmypasswd"},
+                    "spans": [
+                        {
+                            "traceId": span.trace_id,
+                            "spanId": span.span_id,
+                            **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                            "name": span.name,
+                            "kind": 2 if "http.method" in span.attributes else 1,  # server / internal
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": [
+                                {"key": key, "value": _otlp_value(value)}
+                                for key, value in span.attributes.items()
+                            ],
+                            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                        }
+                        for span in spans
+                    ],
+                }],
+            }],
+        }
+
+
+class _SpanScope:
+    __slots__ = ("_tracer", "_name", "_attributes", "_span", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        self._span = self._tracer.start_span(self._name, self._attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self._span.record_error(exc)
+        _current_span.reset(self._token)
+        self._tracer.end_span(self._span)
+
+
+class _NoopScope:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SCOPE = _NoopScope()
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter.
+
+    The current span is kept in a contextvar, so spans opened in awaited
+    code and in ``asyncio.to_thread`` calls nest under the request span.
+    Without an exporter every call is a no-op.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter]):
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def span(self, name: str, **attributes):
+        """Context manager timing a block as a child of the current span."""
+        if self.exporter is None:
+            return _NOOP_SCOPE
+        return _SpanScope(self, name, attributes)
+
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[dict] = None,
+        trace_id: Optional[str] = None,
+        parent_id: Optional[str] = None,
+    ) -> Span:
+        """Start a span without making it current; finish it with ``end_span``."""
+        if trace_id is None:
+            parent = _current_span.get()
+            if parent is not None:
+                trace_id, parent_id = parent.trace_id, parent.span_id
+            else:
+                trace_id = os.urandom(16).hex()
+        return Span(name, trace_id, parent_id, attributes if attributes is not None else {})
+
+    def end_span(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        try:
+            self.exporter.export(span)
+        except Exception:
+            logger.exception("Span exporter failed")
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def create_exporter(name: str) -> Optional[SpanExporter]:
+    settings = get_settings()
+    if name in ("", "none"):
+        return None
+    if name == "memory":
+        return InMemoryExporter(settings.tracing_memory_spans)
+    if name == "console":
+        return ConsoleExporter()
+    if name == "otlp":
+        return OTLPExporter(settings.tracing_otlp_endpoint, settings.app_name)
+    raise ValueError(f"Unknown tracing exporter: {name!r}")
+
+
+# Singleton instance
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(create_exporter(get_settings().tracing_exporter))
+    return _tracer
+
+
+def install_sql_tracing(engine: AsyncEngine) -> None:
+    """Record a ``db.query`` span for every statement run on the engine."""
+    sync_engine = engine.sync_engine
+    tracer = get_tracer()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_span(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span("db.query", {
+            "db.system": conn.dialect.name,
+            "db.statement": " ".join(statement.split())[:300],
+        })
+        conn.info.setdefault(_SQL_SPANS_KEY, []).append((context, span))
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_span(conn, cursor, statement, parameters, context, executemany):
+        _, span = conn.info[_SQL_SPANS_KEY].pop()
+        if cursor.rowcount >= 0:
+            span.set_attribute("db.rows_affected", cursor.rowcount)
+        tracer.end_span(span)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _fail_span(exception_context):
+        spans = exception_context.connection.info.get(_SQL_SPANS_KEY) if exception_context.connection else None
+        # Only the failed statement's own span: errors can also come before
+        # its span started or after it ended
+        if spans and spans[-1][0] is exception_context.execution_context:
+            _, span = spans.pop()
+            span.record_error(exception_context.original_exception)
+            tracer.end_span(span)
+
+
+class TracingMiddleware:
+    """Opens the root span of each HTTP request.
+
+    A W3C ``traceparent`` header continues the caller's trace; the trace id
+    is returned in ``X-Trace-Id``.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer) -> None:
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace_id = parent_id = None
+        match = _TRACEPARENT.match(Headers(scope=scope).get("traceparent", ""))
+        if match:
+            trace_id, parent_id = match.groups()
+
+        span = self.tracer.start_span(
+            f"{scope['method']} {scope['path']}",
+            {"http.method": scope["method"], "http.target": scope["path"]},
+            trace_id=trace_id,
+            parent_id=parent_id,
+        )
+        token = _current_span.set(span)
+        response_bytes = 0
+
+        async def send_traced(message: Message) -> None:
+            nonlocal response_bytes
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                MutableHeaders(scope=message)["X-Trace-Id"] = span.trace_id
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_traced)
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                span.name = f"{scope['method']} {route.path}"
+                span.set_attribute("http.route", route.path)
+            span.set_attribute("http.response_bytes", response_bytes)
+            _current_span.reset(token)
+            self.tracer.end_span(span)
@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import ResourceVersion
+
+# Table written -> API resources whose responses change as a result
+TABLE_RESOURCES = {
+    "credentials": ("credentials", "categories"),  # category credential_count
+    "categories": ("categories", "credentials"),  # credential category_name/color
+    "audit_logs": ("audit_logs",),
+}
+RESOURCES = ("credentials", "categories", "audit_logs")
+
+_PENDING_KEY = "changed_resources"
+
+
+def mark_changed(session: Session, table_name: str) -> None:
+    """Record that ``table_name`` was written in the current transaction."""
+    resources = TABLE_RESOURCES.get(table_name)
+    if resources:
+        session.info.setdefault(_PENDING_KEY, set()).update(resources)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table and (obj not in session.dirty or session.is_modified(obj)):
+            mark_changed(session, table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    # ORM-enabled insert()/update()/delete() statements bypass the flush
+    if orm_execute_state.is_select or orm_execute_state.bind_mapper is None:
+        return
+    mark_changed(
+        orm_execute_state.session,
+        orm_execute_state.bind_mapper.local_table.name,
+    )
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session):
+    # Pending ORM changes are flushed after this hook; flush them now so they are counted
+    session.flush()
+    resources = session.info.pop(_PENDING_KEY, None)
+    if not resources:
+        return
+    table = ResourceVersion.__table__
+    session.connection().execute(
+        update(table)
+        .where(table.c.name.in_(sorted(resources)))
+        .values(version=table.c.version + 1, updated_at=datetime.now(timezone.utc))
+    )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def seed_resource_versions(connection) -> None:
+    """Create missing version rows (run inside init_db)."""
+    table = ResourceVersion.__table__
+    existing = set(connection.scalars(select(table.c.name)))
+    missing = [{"name": name, "version": 0} for name in RESOURCES if name not in existing]
+    if missing:
+        connection.execute(table.insert(), missing)
+
+
+# Runs on every conditional GET; built once so its cache key is computed once
+VERSION_BY_NAME = (
+    select(ResourceVersion.version, ResourceVersion.updated_at)
+    .where(ResourceVersion.name == bindparam("resource"))
+)
+
+
+async def get_version(db: AsyncSession, resource: str) -> tuple[int, datetime]:
+    """Return (version, last change time) for a resource with a single primary-key lookup."""
+    result = await db.execute(VERSION_BY_NAME, {"resource": resource})
+    row = result.one()
+    return row.version, row.updated_at
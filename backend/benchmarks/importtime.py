@@ -0,0 +1,111 @@
+"""Startup benchmarks: import time of app.main and time to first healthy response.
+
+Run from the backend directory:
+
+    python benchmarks/importtime.py            # -X importtime report
+    python benchmarks/importtime.py --serve    # also start uvicorn and poll /api/health
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def benchmark_env(tmp: str) -> dict:
+    env = os.environ.copy()
+    env.setdefault("MASTER_PASSWORD", "benchmark")
+    env.setdefault("SECRET_KEY", "benchmark-secret-key-at-least-32-chars")
+    env.setdefault("ENCRYPTION_KEY", "benchmark-encryption-key-32-chars!")
+    env["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/benchmark.db"
+    env["LEADER_LOCK_PATH"] = f"{tmp}/.leader.lock"
+    env["JOB_STORAGE_DIR"] = f"{tmp}/jobs"
+    return env
+
+
+def import_times(env: dict) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) for every module imported by app.main."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def report_imports(env: dict, top: int) -> None:
+    rows = import_times(env)
+    total = next(cumulative for _, cumulative, module in rows if module.strip() == "app.main")
+    print(f"import app.main: {total / 1000:.1f} ms ({len(rows)} modules)\n")
+
+    print(f"Top {top} by cumulative time:")
+    for _, cumulative, module in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    print(f"\nTop {top} by self time:")
+    for self_us, _, module in sorted(rows, key=lambda r: r[0], reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {module.strip()}")
+
+    heavy = ("openpyxl", "jose")
+    loaded = sorted({m.strip().split(".")[0] for _, _, m in rows} & set(heavy))
+    print(f"\nLazily loaded modules imported at startup: {', '.join(loaded) or 'none'}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_healthy(env: dict, timeout: float = 60.0) -> float:
+    """Start uvicorn and return the seconds until /api/health answers 200."""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/api/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"{url} not healthy after {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--top", type=int, default=15, help="modules to list")
+    parser.add_argument("--serve", action="store_true", help="measure time to first healthy response")
+    parser.add_argument("--runs", type=int, default=3, help="server starts to average with --serve")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = benchmark_env(tmp)
+        report_imports(env, args.top)
+
+        if args.serve:
+            timings = [time_to_healthy(env) for _ in range(args.runs)]
+            print(f"\nTime to first healthy response: "
+                  f"min {min(timings) * 1000:.0f} ms, avg {sum(timings) / len(timings) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
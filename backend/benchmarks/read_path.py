@@ -0,0 +1,165 @@
+"""Read path benchmark: ORM entities vs Core column rows for credential list and export reads.
+
+Run from the backend directory:
+
+    python benchmarks/read_path.py               # 10,000 credentials
+    python benchmarks/read_path.py --rows 50000
+"""
+import argparse
+import asyncio
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure(tmp: str) -> None:
+    os.environ.setdefault("MASTER_PASSWORD", "benchmark")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-at-least-32-chars")
+    os.environ.setdefault("ENCRYPTION_KEY", "benchmark-encryption-key-32-chars!")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tmp}/benchmark.db"
+    sys.path.insert(0, BACKEND_DIR)
+
+
+async def seed(rows: int) -> None:
+    from sqlalchemy import insert
+
+    from app.api.credentials import encrypt_credential
+    from app.db.database import async_session, init_db
+    from app.models import Category, Credential, CredentialType
+
+    await init_db()
+    types = list(CredentialType)
+    async with async_session() as session:
+        result = await session.execute(
+            insert(Category).returning(Category.id),
+            [{"name": f"category-{i}", "color": "#3B82F6"} for i in range(10)],
+        )
+        category_ids = result.scalars().all()
+        await session.execute(insert(Credential), [
+            encrypt_credential({
+                "name": f"credential-{i}",
+                "type": types[i % len(types)],
+                "host": f"host-{i}.example.com",
+                "port": 1521,
+                "username": f"user{i}",
+                "password": f"password-{i}",
+                "extra_data": {"service_name": f"svc{i}"} if i % 2 else None,
+                "category_id": category_ids[i % len(category_ids)],
+                "tags": ["bench", f"t{i % 7}"],
+                "description": "benchmark row",
+            })
+            for i in range(rows)
+        ])
+        await session.commit()
+
+
+async def load_orm():
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.db.database import async_session
+    from app.models import Credential
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(Credential).options(selectinload(Credential.category)).order_by(Credential.id)
+        )
+        return result.scalars().all()
+
+
+def decrypt_orm(credentials) -> list[dict]:
+    from app.api.credentials import decrypt_credential
+
+    return [decrypt_credential(c) for c in credentials]
+
+
+async def load_core():
+    from app.db.database import async_session
+    from app.models import Credential
+    from app.services.credential_rows import select_credential_rows
+
+    async with async_session() as session:
+        result = await session.execute(select_credential_rows().order_by(Credential.id))
+        return result.all()
+
+
+def decrypt_core(rows) -> list[dict]:
+    from app.services.credential_rows import decrypt_rows
+
+    return decrypt_rows(rows)
+
+
+async def measure(load, decrypt, rows: int, runs: int) -> dict:
+    """Best-of-``runs`` timings, plus allocations of one traced run."""
+    load_times, decrypt_times = [], []
+    for _ in range(runs):
+        gc.collect()
+        started = time.perf_counter()
+        loaded = await load()
+        loaded_at = time.perf_counter()
+        decrypt(loaded)
+        load_times.append(loaded_at - started)
+        decrypt_times.append(time.perf_counter() - loaded_at)
+        del loaded
+
+    gc.collect()
+    tracemalloc.start()
+    loaded = await load()
+    retained, peak = tracemalloc.get_traced_memory()
+    blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    tracemalloc.stop()
+    del loaded
+
+    return {
+        "load_ms": min(load_times) * 1000,
+        "decrypt_ms": min(decrypt_times) * 1000,
+        "load_us_per_row": min(load_times) / rows * 1e6,
+        "retained_bytes_per_row": retained / rows,
+        "peak_bytes_per_row": peak / rows,
+        "blocks_per_row": blocks / rows,
+    }
+
+
+async def run(rows: int, runs: int) -> None:
+    from app.db.database import engine
+
+    started = time.perf_counter()
+    await seed(rows)
+    print(f"Seeded {rows} credentials in {time.perf_counter() - started:.1f} s\n")
+
+    results = {
+        "ORM + selectinload": await measure(load_orm, decrypt_orm, rows, runs),
+        "Core rows": await measure(load_core, decrypt_core, rows, runs),
+    }
+    await engine.dispose()
+
+    print(f"{'':20} {'load ms':>9} {'us/row':>8} {'decrypt ms':>11} {'retained B/row':>15} "
+          f"{'peak B/row':>11} {'blocks/row':>11}")
+    for name, r in results.items():
+        print(f"{name:20} {r['load_ms']:9.1f} {r['load_us_per_row']:8.1f} {r['decrypt_ms']:11.1f} "
+              f"{r['retained_bytes_per_row']:15.0f} {r['peak_bytes_per_row']:11.0f} {r['blocks_per_row']:11.1f}")
+
+    orm, core = results.values()
+    print(f"\nLoad time: {orm['load_ms'] / core['load_ms']:.1f}x faster, "
+          f"retained memory: {orm['retained_bytes_per_row'] / core['retained_bytes_per_row']:.1f}x smaller, "
+          f"decrypt: {orm['decrypt_ms'] / core['decrypt_ms']:.2f}x faster")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000, help="credentials to seed")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per read path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(tmp)
+        asyncio.run(run(args.rows, args.runs))
+
+
+if __name__ == "__main__":
+    main()
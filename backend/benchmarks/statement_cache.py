@@ -0,0 +1,114 @@
+"""Single-credential lookup benchmark: per-request statements vs prebuilt cached statements.
+
+Run from the backend directory:
+
+    python benchmarks/statement_cache.py
+    python benchmarks/statement_cache.py --lookups 5000
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+
+from read_path import configure, seed
+
+
+def build_legacy(credential_id: int):
+    """The lookup as it was built on every request before it was prebuilt."""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.models import Credential
+
+    return (
+        select(Credential)
+        .options(selectinload(Credential.category))
+        .where(Credential.id == credential_id)
+    )
+
+
+def statement_overhead(lookups: int) -> tuple[float, float]:
+    """Microseconds per statement to build it and derive its compiled-cache key."""
+    from app.api.credentials import CREDENTIAL_BY_ID
+
+    started = time.perf_counter()
+    for i in range(lookups):
+        build_legacy(i)._generate_cache_key()
+    legacy = (time.perf_counter() - started) / lookups * 1e6
+
+    started = time.perf_counter()
+    for _ in range(lookups):
+        CREDENTIAL_BY_ID._generate_cache_key()
+    prebuilt = (time.perf_counter() - started) / lookups * 1e6
+    return legacy, prebuilt
+
+
+async def lookup_legacy(session, credential_id: int) -> dict:
+    from app.api.credentials import decrypt_credential
+
+    result = await session.execute(build_legacy(credential_id))
+    return decrypt_credential(result.scalar_one())
+
+
+async def lookup_prebuilt(session, credential_id: int) -> dict:
+    from app.api.credentials import CREDENTIAL_BY_ID
+    from app.services.credential_rows import decrypt_rows
+
+    result = await session.execute(CREDENTIAL_BY_ID, {"credential_id": credential_id})
+    return decrypt_rows([result.first()])[0]
+
+
+async def time_lookups(lookup, rows: int, lookups: int, runs: int) -> float:
+    """Best-of-``runs`` microseconds per lookup, each in a fresh session like a request."""
+    from app.db.database import async_session
+
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        for i in range(lookups):
+            async with async_session() as session:
+                await lookup(session, i % rows + 1)
+        best = min(best, time.perf_counter() - started)
+    return best / lookups * 1e6
+
+
+async def run(rows: int, lookups: int, runs: int) -> None:
+    from app.db.database import engine
+    from app.db.statement_cache import statement_cache_stats
+
+    await seed(rows)
+
+    legacy_build, prebuilt_build = statement_overhead(lookups)
+    print(f"Statement build + cache key: {legacy_build:.1f} us per-request, {prebuilt_build:.1f} us prebuilt")
+
+    # Warm the compiled cache for both forms before timing
+    await time_lookups(lookup_legacy, rows, 10, 1)
+    await time_lookups(lookup_prebuilt, rows, 10, 1)
+    statement_cache_stats.outcomes.clear()
+
+    legacy = await time_lookups(lookup_legacy, rows, lookups, runs)
+    prebuilt = await time_lookups(lookup_prebuilt, rows, lookups, runs)
+    print(f"Lookup by id ({lookups} lookups, best of {runs}):")
+    print(f"  per-request select + selectinload: {legacy:8.1f} us")
+    print(f"  prebuilt Core row statement:       {prebuilt:8.1f} us  ({legacy / prebuilt:.2f}x)")
+
+    stats = statement_cache_stats.snapshot(engine)
+    print(f"\nCompiled cache while timing: {stats['hits']} hits, {stats['misses']} misses, "
+          f"{stats['cached_statements']} cached statements")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000, help="credentials to seed")
+    parser.add_argument("--lookups", type=int, default=2_000, help="lookups per timed run")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per statement form")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        configure(tmp)
+        asyncio.run(run(args.rows, args.lookups, args.runs))
+
+
+if __name__ == "__main__":
+    main()
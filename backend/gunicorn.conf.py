@@ -0,0 +1,65 @@
+"""Gunicorn configuration for multi-worker deployments.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The worker count defaults to the number of CPUs available to the container
+(honouring cgroup CPU limits) and can be overridden with WEB_CONCURRENCY.
+"""
+import asyncio
+import math
+import os
+
+
+def _available_cpus() -> float:
+    """Return the CPU budget of this container, falling back to the CPU affinity mask."""
+    # cgroup v2
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+
+    return len(os.sched_getaffinity(0))
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or max(1, math.ceil(_available_cpus()))
+
+# Import the app (and derive the encryption key) once in the master process
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-"
+
+
+def on_starting(server):
+    """Prepare shared state before workers are forked."""
+    from app.db.database import engine, init_db
+    from app.services.crypto import get_crypto_service
+
+    # PBKDF2 runs once here; forked workers inherit the derived key
+    get_crypto_service()
+
+    async def prepare_database():
+        await init_db()
+        # Connections must not be shared across fork()
+        await engine.dispose()
+
+    asyncio.run(prepare_database())
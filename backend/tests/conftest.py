@@ -0,0 +1,69 @@
+import asyncio
+import json
+import os
+import tempfile
+
+# Settings are read at import time, so the environment is prepared before the app is imported
+DATA_DIR = tempfile.mkdtemp(prefix="whatsmypasswd-tests-")
+MASTER_PASSWORD = "test-master-password"
+os.environ.update(
+    MASTER_PASSWORD=MASTER_PASSWORD,
+    SECRET_KEY="test-secret-key-0123456789abcdef0123",
+    ENCRYPTION_KEY="test-encryption-key-0123456789ab",
+    DATABASE_URL=f"sqlite+aiosqlite:///{DATA_DIR}/default.db",
+    VAULTS=json.dumps({"other": f"sqlite+aiosqlite:///{DATA_DIR}/other.db"}),
+    LEADER_LOCK_PATH=os.path.join(DATA_DIR, ".leader.lock"),
+    BACKUP_DIR=os.path.join(DATA_DIR, "backups"),
+    JOB_STORAGE_DIR=os.path.join(DATA_DIR, "jobs"),
+    BACKUP_INTERVAL_HOURS="0",
+    MAINTENANCE_INTERVAL_HOURS="0",
+)
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # One loop for the whole run: the app keeps loop-bound state (queues, locks, pools) in singletons
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def application(event_loop):
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def access_token(application) -> str:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=application), base_url="http://test") as client:
+        response = await client.post("/api/auth/login", json={"password": MASTER_PASSWORD})
+        return response.json()["access_token"]
+
+
+@pytest_asyncio.fixture
+async def client(application, access_token):
+    """API client logged in with the master password."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=application),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {access_token}"},
+    ) as client:
+        yield client
+
+
+@pytest_asyncio.fixture
+async def make_credential(client):
+    """Create a credential through the API and return its response body."""
+    async def create(**fields) -> dict:
+        fields.setdefault("type", "linux")
+        response = await client.post("/api/credentials", json=fields)
+        assert response.status_code == 201, response.text
+        return response.json()
+    return create
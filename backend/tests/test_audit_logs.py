@@ -0,0 +1,64 @@
+import csv
+import io
+
+import orjson
+import pytest
+from sqlalchemy import event
+
+from app.api import audit_logs
+from app.db.database import current_engine
+from app.models import AuditAction
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_export_holds_no_connection_between_batches(client, make_credential, monkeypatch):
+    credential = await make_credential(name="audit-export")
+    for _ in range(4):
+        await client.get(f"/api/credentials/{credential['id']}")
+    monkeypatch.setattr(audit_logs, "EXPORT_BATCH_SIZE", 2)
+
+    filters = audit_logs.AuditLogFilters(
+        credential_id=credential["id"], action=AuditAction.VIEW, from_=None, to=None
+    )
+    query = filters.apply(audit_logs.AUDIT_LOG_ROWS)
+    checked_out = 0
+
+    def count(delta):
+        def listener(*args):
+            nonlocal checked_out
+            checked_out += delta
+        return listener
+
+    engine = current_engine().sync_engine
+    on_checkout, on_checkin = count(1), count(-1)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    chunks = []
+    try:
+        async for chunk in audit_logs.stream_audit_logs(query, "ndjson"):
+            # Paused here like a slow client: no connection (and so no read transaction) is held
+            assert checked_out == 0
+            chunks.append(chunk)
+    finally:
+        event.remove(engine, "checkout", on_checkout)
+        event.remove(engine, "checkin", on_checkin)
+
+    rows = [orjson.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert len(chunks) == 2
+    assert [row["action"] for row in rows] == ["view"] * 4
+    assert [row["id"] for row in rows] == sorted({row["id"] for row in rows})
+
+
+async def test_csv_export_has_one_header(client, monkeypatch):
+    monkeypatch.setattr(audit_logs, "EXPORT_BATCH_SIZE", 3)
+    response = await client.get("/api/audit-logs/export", params={"format": "csv"})
+    assert response.status_code == 200
+    lines = list(csv.reader(io.StringIO(response.text)))
+    assert lines[0] == list(audit_logs.EXPORT_COLUMNS)
+    assert lines.count(lines[0]) == 1
+    ids = [int(line[0]) for line in lines[1:]]
+    assert ids == sorted(ids) and len(ids) == len(set(ids))
+
+    response = await client.get("/api/audit-logs/export", params={"format": "csv", "credential_id": 10**9})
+    assert response.text.strip() == ",".join(audit_logs.EXPORT_COLUMNS)
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from app.services.background import BackgroundScheduler, LeaderLock
+
+
+def test_leader_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "locks" / ".leader.lock")
+    first, second = LeaderLock(path), LeaderLock(path)
+
+    assert first.try_acquire()
+    assert first.held
+    assert not second.try_acquire()
+    assert not second.held
+
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+@pytest.mark.asyncio
+async def test_only_the_leader_runs_jobs(tmp_path):
+    path = str(tmp_path / ".leader.lock")
+    runs = {"leader": 0, "follower": 0}
+
+    def count(name):
+        async def job():
+            runs[name] += 1
+        return job
+
+    leader = BackgroundScheduler(LeaderLock(path), tick_seconds=0.01)
+    follower = BackgroundScheduler(LeaderLock(path), tick_seconds=0.01)
+    leader.add_job("count", 0.01, count("leader"))
+    follower.add_job("count", 0.01, count("follower"))
+
+    await leader.start()
+    await asyncio.sleep(0.05)
+    await follower.start()
+    await asyncio.sleep(0.1)
+    assert leader.is_leader and not follower.is_leader
+    assert runs["leader"] > 0 and runs["follower"] == 0
+
+    # The follower takes over once the leader is gone
+    await leader.stop()
+    await asyncio.sleep(0.1)
+    assert follower.is_leader and runs["follower"] > 0
+    await follower.stop()
@@ -0,0 +1,104 @@
+import gzip
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from app.services import backup
+from app.services.backup import (
+    BackupInProgress,
+    BackupKeepsRestarting,
+    backup_lock,
+    backup_running,
+    copy_database,
+    list_backups,
+    run_backup,
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "vault.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, a TEXT)")
+        conn.executemany("INSERT INTO t (a) VALUES (?)", [("x" * 500,) for _ in range(4000)])
+    return path
+
+
+def take_backup(source, backup_dir, keep=7) -> dict:
+    return run_backup(str(source), str(backup_dir), keep, pages_per_step=16, step_sleep=0, busy_timeout_ms=1000)
+
+
+def test_backup_is_a_restorable_copy(source, tmp_path):
+    taken = take_backup(source, tmp_path / "backups")
+    restored = tmp_path / "restored.db"
+    restored.write_bytes(gzip.decompress((tmp_path / "backups" / taken["name"]).read_bytes()))
+    with sqlite3.connect(restored) as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 4000
+    # Nothing but the backup and the lock file is left behind
+    assert sorted(p.name for p in (tmp_path / "backups").iterdir()) == [".backup.lock", taken["name"]]
+
+
+def test_old_backups_are_rotated(source, tmp_path):
+    taken = [take_backup(source, tmp_path / "backups", keep=2)["name"] for _ in range(3)]
+    assert [b["name"] for b in list_backups(str(tmp_path / "backups"))] == taken[:0:-1]
+
+
+def test_one_backup_at_a_time(source, tmp_path):
+    backup_dir = tmp_path / "backups"
+    backup_dir.mkdir()
+    assert not backup_running(str(backup_dir))
+    with backup_lock(str(backup_dir)):
+        assert backup_running(str(backup_dir))
+        with pytest.raises(BackupInProgress):
+            take_backup(source, backup_dir)
+    assert list_backups(str(backup_dir)) == []
+
+
+def copy_under_writes(source, target, journal_mode: str) -> int:
+    """Copy page by page while another connection keeps writing."""
+    with sqlite3.connect(source) as conn:
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    writing, stop = threading.Event(), threading.Event()
+
+    def write():
+        writer = sqlite3.connect(source, timeout=5)
+        while not stop.is_set():
+            with writer:
+                writer.execute("INSERT INTO t (a) VALUES ('y')")
+            writing.set()
+            time.sleep(0.001)
+        writer.close()
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    writing.wait()
+    src, dst = sqlite3.connect(source, timeout=5), sqlite3.connect(target)
+    try:
+        return copy_database(src, dst, pages_per_step=1, step_sleep=0.005)
+    finally:
+        stop.set()
+        thread.join()
+        src.close()
+        dst.close()
+
+
+def test_restarts_are_bounded_in_wal_mode(source, tmp_path):
+    restarts = copy_under_writes(source, tmp_path / "copy.db", "wal")
+    assert restarts > backup.BACKUP_MAX_RESTARTS
+    with sqlite3.connect(tmp_path / "copy.db") as conn:
+        assert conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] >= 4000
+
+
+def test_large_databases_are_not_copied_in_one_step_outside_wal(source, tmp_path, monkeypatch):
+    monkeypatch.setattr(backup, "BACKUP_MAX_BLOCKING_PAGES", 1)
+    with pytest.raises(BackupKeepsRestarting):
+        copy_under_writes(source, tmp_path / "copy.db", "delete")
+
+
+def test_small_databases_are_copied_in_one_step_outside_wal(source, tmp_path):
+    assert copy_under_writes(source, tmp_path / "copy.db", "delete") > backup.BACKUP_MAX_RESTARTS
+    with sqlite3.connect(tmp_path / "copy.db") as conn:
+        assert conn.execute("SELECT count(*) FROM t").fetchone()[0] >= 4000
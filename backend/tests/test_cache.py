@@ -0,0 +1,85 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.services.cache import CoalescingCache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_callers_share_one_computation():
+    cache = CoalescingCache(ttl=60)
+    release = asyncio.Event()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await release.wait()
+        return len(calls)
+
+    waiters = [asyncio.ensure_future(cache.get_or_compute("key", compute)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+    assert await asyncio.gather(*waiters) == [1] * 5
+    # Cached afterwards, and other keys compute on their own
+    assert await cache.get_or_compute("key", compute) == 1
+    assert await cache.get_or_compute("other", compute) == 2
+
+
+@pytest.fixture
+def list_queries(monkeypatch):
+    """Count the list computations (each opens one session) of the credentials and categories APIs."""
+    from app.api import categories, credentials
+
+    calls = []
+    for module in (credentials, categories):
+        def counting(original=module.async_session):
+            calls.append(1)
+            return original()
+        monkeypatch.setattr(module, "async_session", counting)
+    return calls
+
+
+async def test_identical_list_requests_share_one_query(client, make_credential, list_queries):
+    search = f"cache-{uuid.uuid4().hex[:12]}"
+    await make_credential(name=search)
+
+    responses = await asyncio.gather(*(client.get("/api/credentials", params={"search": search}) for _ in range(5)))
+    assert {r.status_code for r in responses} == {200}
+    assert all(r.json()["total"] == 1 for r in responses)
+    assert len(list_queries) == 1
+
+    # A different query key misses
+    await client.get("/api/credentials", params={"search": search, "page_size": 10})
+    assert len(list_queries) == 2
+
+    # So does a write, which moves the ETag
+    await make_credential(name=f"{search}-2")
+    response = await client.get("/api/credentials", params={"search": search})
+    assert response.json()["total"] == 2
+    assert len(list_queries) == 3
+
+
+async def test_list_cache_is_per_vault(client, monkeypatch, list_queries):
+    from datetime import datetime, timezone
+
+    from app.api import conditional
+
+    # Both vaults at the same version counter, one no earlier test cached
+    version = uuid.uuid4().int % 10**9
+
+    async def same_version(db, resource):
+        return version, datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(conditional, "get_version", same_version)
+
+    name = f"cat-{uuid.uuid4().hex[:12]}"
+    response = await client.post("/api/categories", json={"name": name}, headers={"X-Vault": "other"})
+    assert response.status_code == 201
+
+    default = await client.get("/api/categories")
+    other = await client.get("/api/categories", headers={"X-Vault": "other"})
+    assert len(list_queries) == 2
+    assert name in [c["name"] for c in other.json()]
+    assert name not in [c["name"] for c in default.json()]
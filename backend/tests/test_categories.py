@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+async def create_category(client) -> dict:
+    response = await client.post("/api/categories", json={"name": f"cat-{uuid.uuid4().hex[:12]}"})
+    assert response.status_code == 201
+    return response.json()
+
+
+async def test_get_category_etag_is_per_row(client, make_credential):
+    category = await create_category(client)
+    other = await create_category(client)
+
+    response = await client.get(f"/api/categories/{category['id']}")
+    etag = response.headers["ETag"]
+    response = await client.get(f"/api/categories/{category['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # Another category changing leaves this one's ETag alone
+    await client.put(f"/api/categories/{other['id']}", json={"color": "#010203"})
+    response = await client.get(f"/api/categories/{category['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # So does nothing else but its own changes and its credential count
+    await make_credential(name=f"cred-{uuid.uuid4().hex}", category_id=category["id"])
+    response = await client.get(f"/api/categories/{category['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["credential_count"] == 1
+    etag = response.headers["ETag"]
+
+    await client.put(f"/api/categories/{category['id']}", json={"color": "#040506"})
+    response = await client.get(f"/api/categories/{category['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["color"] == "#040506"
+
+
+async def test_get_missing_category_is_404_even_if_etag_matches(client):
+    category = await create_category(client)
+    etag = (await client.get(f"/api/categories/{category['id']}")).headers["ETag"]
+    await client.delete(f"/api/categories/{category['id']}")
+
+    for headers in ({"If-None-Match": etag}, {"If-None-Match": "*"}):
+        response = await client.get(f"/api/categories/{category['id']}", headers=headers)
+        assert response.status_code == 404
@@ -0,0 +1,207 @@
+import asyncio
+import re
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models import CredentialType
+from app.services.connectivity import CheckStatus, CheckTarget, ConnectivityChecker, sign_v4
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def checker() -> ConnectivityChecker:
+    return ConnectivityChecker(concurrency=4, timeout=5, type_timeouts={}, cache_ttl=60)
+
+
+@pytest.fixture
+def ftp_server(tmp_path):
+    """pyftpdlib server in a thread with user ``alice`` / ``secret``; yields (port, home)."""
+    pytest.importorskip("pyftpdlib")
+    from pyftpdlib.authorizers import DummyAuthorizer
+    from pyftpdlib.handlers import FTPHandler
+    from pyftpdlib.servers import FTPServer
+
+    authorizer = DummyAuthorizer()
+    authorizer.add_user("alice", "secret", str(tmp_path), perm="elradfmw")
+    handler = type("Handler", (FTPHandler,), {"authorizer": authorizer})
+    server = FTPServer(("127.0.0.1", 0), handler)
+    stop = threading.Event()
+
+    def serve():
+        while not stop.is_set():
+            server.serve_forever(timeout=0.05, blocking=False)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server.address[1], tmp_path
+    stop.set()
+    thread.join()
+    server.close_all()
+
+
+def ftp_target(port: int, password: str, username: str = "alice") -> CheckTarget:
+    return CheckTarget(
+        id=1, type=CredentialType.FTP, host="127.0.0.1", port=port, username=username, password=password
+    )
+
+
+async def test_ftp_login(checker, ftp_server):
+    port, _ = ftp_server
+    assert (await checker.check(ftp_target(port, "secret"))).status == CheckStatus.OK
+    assert (await checker.check(ftp_target(port, "wrong"))).status == CheckStatus.AUTH_FAILED
+
+
+async def test_ftp_rejects_line_breaks(checker, ftp_server):
+    port, home = ftp_server
+    for target in (ftp_target(port, "secret\r\nMKD injected"), ftp_target(port, "secret", "alice\nMKD injected")):
+        result = await checker.check(target)
+        assert result.status == CheckStatus.ERROR
+        assert "line break" in result.detail
+    assert not (home / "injected").exists()
+
+
+async def test_ftp_unreachable(checker, unused_tcp_port):
+    result = await checker.check(ftp_target(unused_tcp_port, "secret"))
+    assert result.status == CheckStatus.UNREACHABLE
+
+
+@asynccontextmanager
+async def ssh_server():
+    """asyncssh server accepting ``deploy`` / ``s3cret``; yields (port, host key).
+
+    A context manager rather than an async fixture so the server runs on the test's own loop.
+    """
+    asyncssh = pytest.importorskip("asyncssh")
+
+    class PasswordServer(asyncssh.SSHServer):
+        def begin_auth(self, username):
+            return True
+
+        def password_auth_supported(self):
+            return True
+
+        def validate_password(self, username, password):
+            return (username, password) == ("deploy", "s3cret")
+
+    host_key = asyncssh.generate_private_key("ssh-ed25519")
+    server = await asyncssh.create_server(PasswordServer, "127.0.0.1", 0, server_host_keys=[host_key])
+    yield server.sockets[0].getsockname()[1], host_key
+    server.close()
+    await server.wait_closed()
+
+
+def ssh_target(port: int, password: str) -> CheckTarget:
+    return CheckTarget(
+        id=2, type=CredentialType.LINUX, host="127.0.0.1", port=port, username="deploy", password=password
+    )
+
+
+async def test_ssh_login_reports_unverified_host_key(checker):
+    async with ssh_server() as (port, _):
+        result = await checker.check(ssh_target(port, "s3cret"))
+        assert result.status == CheckStatus.OK
+        assert result.detail == "Host key not verified"
+        assert (await checker.check(ssh_target(port, "wrong"))).status == CheckStatus.AUTH_FAILED
+
+
+async def test_ssh_known_hosts(checker, tmp_path, monkeypatch):
+    import asyncssh
+
+    from app.config import get_settings
+
+    known_hosts = tmp_path / "known_hosts"
+    monkeypatch.setattr(get_settings(), "verify_ssh_known_hosts", str(known_hosts))
+
+    async with ssh_server() as (port, host_key):
+        known_hosts.write_bytes(f"[127.0.0.1]:{port} ".encode() + host_key.export_public_key())
+        result = await checker.check(ssh_target(port, "s3cret"))
+        assert (result.status, result.detail) == (CheckStatus.OK, None)
+
+        other_key = asyncssh.generate_private_key("ssh-ed25519")
+        known_hosts.write_bytes(f"[127.0.0.1]:{port} ".encode() + other_key.export_public_key())
+        result = await checker.check(ssh_target(port, "s3cret"))
+        assert result.status == CheckStatus.ERROR
+        assert result.detail.startswith("Host key not verified")
+
+
+@asynccontextmanager
+async def s3_endpoint():
+    """Minimal S3 stand-in that checks SigV4 signatures; key ``AKID`` / ``SECRET``, bucket ``backups``."""
+    secrets = {"AKID": "SECRET"}
+    buckets = {"backups"}
+
+    async def handle(reader, writer):
+        head = (await reader.readuntil(b"\r\n\r\n")).decode()
+        request_line, *lines = head.split("\r\n")
+        method, path, _ = request_line.split(" ")
+        headers = {k.lower(): v.strip() for k, v in (line.split(":", 1) for line in lines if line)}
+
+        access_key = re.search(r"Credential=([^/]+)/", headers.get("authorization", ""))
+        access_key = access_key.group(1) if access_key else None
+        signed_at = datetime.strptime(headers["x-amz-date"], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        expected = sign_v4(
+            method, f"http://{headers['host']}{path}", "us-east-1", access_key or "",
+            secrets.get(access_key, ""), now=signed_at,
+        )
+        if access_key not in secrets or expected["authorization"] != headers["authorization"]:
+            status = "403 Forbidden"
+        elif path == "/" or path.strip("/") in buckets:
+            status = "200 OK"
+        else:
+            status = "404 Not Found"
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    yield f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    server.close()
+    await server.wait_closed()
+
+
+def s3_target(endpoint: str, secret_key: str, bucket=None) -> CheckTarget:
+    extra = {"endpoint": endpoint, "access_key": "AKID", "secret_key": secret_key}
+    if bucket:
+        extra["bucket"] = bucket
+    return CheckTarget(id=3, type=CredentialType.S3, extra_data=extra)
+
+
+async def test_s3_signed_requests(checker):
+    async with s3_endpoint() as endpoint:
+        assert (await checker.check(s3_target(endpoint, "SECRET"))).status == CheckStatus.OK
+        assert (await checker.check(s3_target(endpoint, "SECRET", "backups"))).status == CheckStatus.OK
+        assert (await checker.check(s3_target(endpoint, "WRONG", "backups"))).status == CheckStatus.AUTH_FAILED
+        result = await checker.check(s3_target(endpoint, "SECRET", "missing"))
+        assert result.status == CheckStatus.ERROR
+        assert "not found" in result.detail
+
+
+async def test_verify_rechecks_after_edit_in_same_second(client, make_credential, ftp_server):
+    port, _ = ftp_server
+    credential = await make_credential(
+        name=f"ftp-{uuid.uuid4().hex}", type="ftp", host="127.0.0.1", port=port,
+        username="alice", password="wrong",
+    )
+
+    async def verify() -> dict:
+        response = await client.post("/api/credentials/verify", json={"ids": [credential["id"]]})
+        assert response.status_code == 200, response.text
+        return response.json()["results"][0]
+
+    assert (await verify())["status"] == CheckStatus.AUTH_FAILED
+    response = await client.put(f"/api/credentials/{credential['id']}", json={"password": "secret"})
+    assert response.status_code == 200
+    # updated_at did not necessarily change, the change log sequence did
+    result = await verify()
+    assert (result["status"], result["cached"]) == (CheckStatus.OK, False)
+    assert (await verify())["cached"] is True
+
+
+async def test_verify_requires_a_filter(client):
+    response = await client.post("/api/credentials/verify", json={})
+    assert response.status_code == 422
@@ -0,0 +1,326 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+async def test_write_responses_show_renamed_category(client, make_credential):
+    response = await client.post("/api/categories", json={"name": unique("cat"), "color": "#111111"})
+    assert response.status_code == 201
+    category = response.json()
+
+    credential = await make_credential(name=unique("cred"), category_id=category["id"])
+    assert credential["category_color"] == "#111111"
+
+    renamed = unique("renamed")
+    response = await client.put(f"/api/categories/{category['id']}", json={"name": renamed, "color": "#222222"})
+    assert response.status_code == 200
+
+    response = await client.put(f"/api/credentials/{credential['id']}", json={"username": "root"})
+    assert response.status_code == 200
+    assert (response.json()["category_name"], response.json()["category_color"]) == (renamed, "#222222")
+
+
+async def count_views(credential_id: int) -> int:
+    from sqlalchemy import func, select
+
+    from app.db.database import async_session
+    from app.models import AuditAction, AuditLog
+
+    async with async_session() as db:
+        return await db.scalar(
+            select(func.count()).where(AuditLog.credential_id == credential_id, AuditLog.action == AuditAction.VIEW)
+        )
+
+
+async def test_get_credential_etag_is_per_row(client, make_credential):
+    credential = await make_credential(name=unique("cred"))
+    other = await make_credential(name=unique("cred"))
+
+    response = await client.get(f"/api/credentials/{credential['id']}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    response = await client.get(f"/api/credentials/{credential['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    # The client still shows the secret, so a revalidated view is audited too
+    assert await count_views(credential["id"]) == 2
+
+    # Writes to other rows leave this ETag alone
+    await client.put(f"/api/credentials/{other['id']}", json={"username": "other"})
+    response = await client.get(f"/api/credentials/{credential['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # An edit in the same second still changes it
+    await client.put(f"/api/credentials/{credential['id']}", json={"username": "changed"})
+    response = await client.get(f"/api/credentials/{credential['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["username"] == "changed"
+
+
+async def test_get_credential_etag_follows_category(client, make_credential):
+    response = await client.post("/api/categories", json={"name": unique("cat")})
+    category = response.json()
+    credential = await make_credential(name=unique("cred"), category_id=category["id"])
+
+    etag = (await client.get(f"/api/credentials/{credential['id']}")).headers["ETag"]
+    await client.put(f"/api/categories/{category['id']}", json={"color": "#abcdef"})
+    response = await client.get(f"/api/credentials/{credential['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["category_color"] == "#abcdef"
+
+
+async def test_get_missing_credential_is_not_audited(client):
+    missing = 10**9
+    for headers in ({}, {"If-None-Match": "*"}):
+        response = await client.get(f"/api/credentials/{missing}", headers=headers)
+        assert response.status_code == 404
+    assert await count_views(missing) == 0
+
+
+async def sync_token() -> str:
+    from app.db.database import async_session
+    from app.services.changes import get_sequence_bounds
+
+    async with async_session() as db:
+        _, newest = await get_sequence_bounds(db)
+    return str(newest or 0)
+
+
+async def audit_actions(credential_ids: list[int] = (), names: list[str] = ()) -> list[tuple]:
+    from sqlalchemy import or_, select
+
+    from app.db.database import async_session
+    from app.models import AuditLog
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(AuditLog.credential_id, AuditLog.credential_name, AuditLog.action)
+            .where(or_(AuditLog.credential_id.in_(credential_ids), AuditLog.credential_name.in_(names)))
+            .order_by(AuditLog.id)
+        )
+        return [tuple(row) for row in result.all()]
+
+
+async def test_null_for_required_fields_is_rejected(client, make_credential):
+    credential = await make_credential(name=unique("cred"))
+    for body in ({"type": None}, {"tags": None}):
+        response = await client.post("/api/credentials/bulk/update", json={"ids": [credential["id"]], **body})
+        assert response.status_code == 422, body
+    for body in ({"name": None}, {"type": None}, {"tags": None}):
+        response = await client.put(f"/api/credentials/{credential['id']}", json=body)
+        assert response.status_code == 422, body
+
+    # Nullable fields can still be cleared
+    response = await client.post(
+        "/api/credentials/bulk/update", json={"ids": [credential["id"]], "description": None, "category_id": None}
+    )
+    assert response.status_code == 200
+
+
+async def test_bulk_update_is_audited_and_logged(client, make_credential):
+    from app.models import AuditAction
+
+    first = await make_credential(name=unique("cred"))
+    second = await make_credential(name=unique("cred"))
+    token = await sync_token()
+
+    response = await client.post(
+        "/api/credentials/bulk/update",
+        json={"ids": [first["id"], second["id"], second["id"], 10**9], "type": "ftp", "tags": ["bulk"]},
+    )
+    assert response.json() == {"affected": 2, "not_found": [10**9]}
+
+    updates = [row for row in await audit_actions([first["id"], second["id"]]) if row[2] == AuditAction.UPDATE]
+    assert sorted(updates) == sorted([
+        (first["id"], first["name"], AuditAction.UPDATE), (second["id"], second["name"], AuditAction.UPDATE),
+    ])
+
+    response = await client.get("/api/credentials/changes", params={"since": token})
+    changes = response.json()
+    assert {c["id"]: (c["type"], c["tags"]) for c in changes["upserts"]} == {
+        first["id"]: ("ftp", ["bulk"]), second["id"]: ("ftp", ["bulk"]),
+    }
+    assert changes["deletes"] == []
+
+
+async def test_bulk_delete_is_audited_and_logged(client, make_credential):
+    from app.models import AuditAction
+
+    first = await make_credential(name=unique("cred"))
+    second = await make_credential(name=unique("cred"))
+    token = await sync_token()
+
+    response = await client.post("/api/credentials/bulk/delete", json={"ids": [first["id"], second["id"]]})
+    assert response.json() == {"affected": 2, "not_found": []}
+
+    # Rows about the deleted credentials go with them; the delete is audited by name
+    assert sorted(await audit_actions([first["id"], second["id"]], [first["name"], second["name"]])) == sorted([
+        (None, first["name"], AuditAction.DELETE), (None, second["name"], AuditAction.DELETE),
+    ])
+
+    response = await client.get("/api/credentials/changes", params={"since": token})
+    changes = response.json()
+    assert changes["upserts"] == []
+    assert sorted(changes["deletes"]) == sorted([first["id"], second["id"]])
+
+
+async def test_snapshot_is_paged(client, make_credential):
+    await make_credential(name=unique("cred"))
+    await make_credential(name=unique("cred"))
+
+    seen, token, pages = [], "0", 0
+    while True:
+        response = await client.get("/api/credentials/changes", params={"since": token, "limit": 2})
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["upserts"]) <= 2 and body["deletes"] == []
+        seen += [c["id"] for c in body["upserts"]]
+        token, pages = body["next_token"], pages + 1
+        if pages == 1:
+            # Written while paging: not necessarily in the snapshot, but in the following sync
+            late = await make_credential(name=unique("late"))
+        if not body["has_more"]:
+            break
+
+    assert pages > 1 and len(seen) == len(set(seen)) and seen == sorted(seen)
+    assert ":" not in token
+    response = await client.get("/api/credentials/changes", params={"since": token})
+    assert late["id"] in [c["id"] for c in response.json()["upserts"]]
+
+
+async def test_changes_rejects_malformed_tokens(client):
+    for token in ("abc", "1:x", "1:2:3"):
+        response = await client.get("/api/credentials/changes", params={"since": token})
+        assert response.status_code == 400, token
+
+
+async def test_batch_get(client, make_credential):
+    from app.models import AuditAction
+
+    first = await make_credential(name=unique("cred"), host="10.0.0.1", password="first-secret")
+    second = await make_credential(name=unique("cred"), host="10.0.0.2", password="second-secret")
+    missing = 10**9
+
+    response = await client.post(
+        "/api/credentials/batch-get", json={"ids": [second["id"], missing, first["id"], second["id"]]}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    # Request order, duplicates dropped
+    assert [item["id"] for item in body["items"]] == [second["id"], first["id"]]
+    assert body["not_found"] == [missing]
+    assert body["items"][1]["password"] == "first-secret"
+
+    # Every fetched credential is audited once per request; missing ids are not
+    views = [row for row in await audit_actions([first["id"], second["id"], missing]) if row[2] == AuditAction.VIEW]
+    assert sorted(views) == sorted([
+        (first["id"], first["name"], AuditAction.VIEW), (second["id"], second["name"], AuditAction.VIEW),
+    ])
+
+
+async def test_batch_get_fields(client, make_credential):
+    credential = await make_credential(name=unique("cred"), host="10.0.0.1", password="secret")
+
+    response = await client.post(
+        "/api/credentials/batch-get", json={"ids": [credential["id"]], "fields": ["host", "category_name"]}
+    )
+    assert response.json()["items"] == [{"id": credential["id"], "host": "10.0.0.1", "category_name": None}]
+
+    response = await client.post("/api/credentials/batch-get", json={"ids": [credential["id"]], "fields": ["secret"]})
+    assert response.status_code == 400
+
+
+async def test_batch_get_limits_ids(client):
+    response = await client.post("/api/credentials/batch-get", json={"ids": list(range(1, 502))})
+    assert response.status_code == 422
+    response = await client.post("/api/credentials/batch-get", json={"ids": []})
+    assert response.status_code == 422
+
+
+async def test_filters_use_blind_indexes(client, make_credential):
+    host = f"{unique('host')}.example.com"
+    credential = await make_credential(name=unique("cred"), host=host, username="Deploy")
+
+    async def matches(**params) -> list[int]:
+        response = await client.get("/api/credentials", params=params)
+        assert response.status_code == 200
+        return [item["id"] for item in response.json()["items"]]
+
+    # Host names compare case-insensitively, user names exactly
+    assert await matches(host=f"  {host.upper()} ") == [credential["id"]]
+    assert await matches(host=host, username="Deploy") == [credential["id"]]
+    assert await matches(host=host, username="deploy") == []
+
+    # Indexes follow updates
+    await client.put(f"/api/credentials/{credential['id']}", json={"host": f"new-{host}"})
+    assert await matches(host=host) == []
+    assert await matches(host=f"new-{host}") == [credential["id"]]
+
+
+async def test_backfill_indexes_older_rows(client, make_credential):
+    from sqlalchemy import update
+
+    from app.db.database import async_session
+    from app.models import Credential
+    from app.services.indexing import backfill_search_columns
+
+    host = f"{unique('host')}.example.com"
+    credential = await make_credential(name=unique("cred"), host=host, username="admin", password="secret")
+
+    # As written before the index columns existed
+    table = Credential.__table__
+    async with async_session() as db:
+        await db.execute(
+            update(table)
+            .where(table.c.id == credential["id"])
+            .values(host_index=None, username_index=None, password_fingerprint=None, updated_at=table.c.updated_at)
+        )
+        await db.commit()
+    response = await client.get("/api/credentials", params={"host": host})
+    assert response.json()["total"] == 0
+
+    assert await backfill_search_columns() >= 1
+    assert await backfill_search_columns() == 0
+
+    response = await client.get("/api/credentials", params={"host": host, "username": "admin"})
+    assert [item["id"] for item in response.json()["items"]] == [credential["id"]]
+    # The backfill is not an edit
+    assert response.json()["items"][0]["updated_at"] == credential["updated_at"]
+
+
+async def test_columnar_rows_match_orm_output(client, make_credential):
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+
+    from app.api.credentials import decrypt_credential
+    from app.db.database import async_session
+    from app.models import Credential
+    from app.services.credential_rows import decrypt_rows, select_credential_rows
+
+    category = (await client.post("/api/categories", json={"name": unique("cat"), "color": "#123456"})).json()
+    ids = [
+        (await make_credential(
+            name=unique("full"), host="db.example.com", port=5432, username="app", password="secret",
+            extra_data={"key": "value", "nested": [1, 2]}, tags=["a", "b"], description="all fields",
+            category_id=category["id"],
+        ))["id"],
+        # Empty optional fields and no category
+        (await make_credential(name=unique("bare")))["id"],
+    ]
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(Credential).options(joinedload(Credential.category)).where(Credential.id.in_(ids))
+        )
+        expected = {c.id: decrypt_credential(c) for c in result.scalars()}
+        rows = (await db.execute(select_credential_rows().where(Credential.id.in_(ids)))).all()
+
+    assert {item["id"]: item for item in decrypt_rows(rows)} == expected
+    assert decrypt_rows([]) == []
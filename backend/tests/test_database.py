@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import make_url
+
+from app.config import get_settings
+from app.db import database
+
+
+@pytest.mark.parametrize(
+    ("setting", "fstype", "expected"),
+    [
+        ("auto", "ext4", "WAL"),
+        ("auto", "nfs4", "DELETE"),
+        ("auto", None, "WAL"),
+        ("WAL", "nfs", "WAL"),
+        ("delete", "ext4", "DELETE"),
+    ],
+)
+def test_journal_mode(monkeypatch, setting, fstype, expected):
+    monkeypatch.setattr(get_settings(), "sqlite_journal_mode", setting)
+    monkeypatch.setattr(database, "filesystem_type", lambda path: fstype)
+    assert database.resolve_journal_mode(make_url("sqlite+aiosqlite:///./data/vault.db")) == expected
+
+
+def test_filesystem_type_uses_longest_mount(monkeypatch, tmp_path):
+    mounts = tmp_path / "mounts"
+    mounts.write_text(
+        "overlay / overlay rw 0 0\n"
+        "server:/export /srv/data nfs4 rw 0 0\n"
+        "tmpfs /srv/data-local tmpfs rw 0 0\n"
+    )
+    monkeypatch.setattr(database, "MOUNTS_PATH", str(mounts))
+    assert database.filesystem_type("/srv/data/vaults") == "nfs4"
+    assert database.filesystem_type("/srv/data-local") == "tmpfs"
+    assert database.filesystem_type("/srv") == "overlay"
@@ -0,0 +1,102 @@
+import logging
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.db import diagnostics
+
+pytestmark = pytest.mark.asyncio
+
+
+@asynccontextmanager
+async def items_engine(tmp_path, slow_query_ms: float = 0):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/diagnostics.db")
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        await conn.execute(text("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')"))
+    diagnostics.install(engine, slow_query_ms)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+async def test_slow_queries_are_logged_with_their_plan(application, tmp_path, caplog):
+    # Every query counts as slow
+    async with items_engine(tmp_path, slow_query_ms=1e-9) as engine:
+        caplog.set_level(logging.WARNING, logger=diagnostics.__name__)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT name FROM items WHERE name = :name"), {"name": "a"})
+
+    [record] = [r for r in caplog.records if r.getMessage().startswith("Slow query")]
+    message = record.getMessage()
+    assert "SELECT name FROM items WHERE name = ?" in message
+    assert "SCAN items" in message
+
+
+async def test_failed_statements_do_not_skew_timings(application, tmp_path):
+    async with items_engine(tmp_path) as engine, engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT missing FROM items"))
+        assert not conn.sync_connection.info.get(diagnostics._START_KEY)
+
+        await conn.execute(text("SELECT 1"))
+        assert conn.sync_connection.info[diagnostics._START_KEY] == []
+
+
+def make_app(engine, **options) -> diagnostics.QueryDiagnosticsMiddleware:
+    async def items(request):
+        async with engine.connect() as conn:
+            for row_id in range(int(request.query_params["n"])):
+                await conn.execute(text("SELECT name FROM items WHERE id = :id"), {"id": row_id})
+        return PlainTextResponse("ok")
+
+    options = {"query_budget": 0, "repeat_threshold": 0, **options}
+    return diagnostics.QueryDiagnosticsMiddleware(Starlette(routes=[Route("/items", items)]), **options)
+
+
+def app_client(app) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_query_count_header(application, tmp_path):
+    async with items_engine(tmp_path) as engine, app_client(make_app(engine)) as client:
+        for n in (0, 3):
+            response = await client.get("/items", params={"n": n})
+            assert response.headers["X-Query-Count"] == str(n)
+
+
+async def test_repeated_statements_and_budget_overruns_warn(application, tmp_path, caplog):
+    caplog.set_level(logging.WARNING, logger=diagnostics.__name__)
+    async with items_engine(tmp_path) as engine:
+        async with app_client(make_app(engine, query_budget=4, repeat_threshold=3)) as client:
+            await client.get("/items", params={"n": 2})
+            assert caplog.records == []
+
+            await client.get("/items", params={"n": 5})
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("GET /items ran 5 queries (budget 4)" in m for m in messages)
+    assert any("ran the same statement 5 times, possible N+1: SELECT name FROM items" in m for m in messages)
+
+
+async def test_statement_cache_status(client, make_credential):
+    credential = await make_credential(name="statement-cache")
+    await client.get(f"/api/credentials/{credential['id']}")
+    before = (await client.get("/api/diagnostics/statement-cache")).json()
+
+    # The same lookups again compile nothing new
+    await client.get(f"/api/credentials/{credential['id']}")
+    after = (await client.get("/api/diagnostics/statement-cache")).json()
+
+    assert after["hits"] > before["hits"]
+    assert after["misses"] == before["misses"]
+    assert 0 < after["hit_ratio"] <= 1
+    assert 0 < after["cached_statements"] <= after["cache_capacity"]
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.api.auth import verify_stream_token
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_stream_ticket_opens_only_the_stream(client, access_token):
+    response = await client.post("/api/events/ticket")
+    assert response.status_code == 200
+    ticket = response.json()["ticket"]
+    assert response.json()["expires_in"] <= 60
+
+    assert verify_stream_token(None, ticket) is True
+    # A ticket is not an access token
+    response = await client.get("/api/categories", headers={"Authorization": f"Bearer {ticket}"})
+    assert response.status_code == 401
+
+
+async def test_stream_rejects_access_token_in_query(client, access_token):
+    client.headers.pop("Authorization")
+    for params in ({"access_token": access_token}, {"ticket": access_token}, {}):
+        response = await client.get("/api/events", params=params)
+        assert response.status_code == 401
+
+
+async def test_ticket_requires_login(client):
+    client.headers.pop("Authorization")
+    response = await client.post("/api/events/ticket")
+    assert response.status_code in (401, 403)
+
+
+async def test_broker_retries_reading_the_feed_position(client, make_credential, monkeypatch, caplog):
+    from app.services import events
+
+    failures = []
+    started = asyncio.Event()
+    latest_positions = events.EventBroker._latest_positions
+
+    async def flaky(self):
+        if len(failures) < 2:
+            failures.append(1)
+            raise OSError("database unavailable")
+        positions = await latest_positions(self)
+        started.set()
+        return positions
+
+    monkeypatch.setattr(events.EventBroker, "_latest_positions", flaky)
+    broker = events.EventBroker(queue_size=100, max_subscribers=1, poll_interval=0.01)
+    subscription = broker.subscribe()
+    try:
+        await asyncio.wait_for(started.wait(), 5)
+        credential = await make_credential(name="after-retry")
+        while True:
+            item = await asyncio.wait_for(subscription.get(), 5)
+            if item["event"] == "credential" and item["data"]["id"] == credential["id"]:
+                break
+    finally:
+        await broker.stop()
+    assert "Failed to read change feed position" in caplog.text
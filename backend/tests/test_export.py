@@ -0,0 +1,94 @@
+import asyncio
+import io
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.admission import AdmissionLimiter, export_limiter
+
+pytestmark = pytest.mark.asyncio
+
+
+def workbook(rows: list[tuple]) -> bytes:
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Type", "Name", "Host", "Port", "Username", "Password", "Category", "Tags", "Description", "Extra Data"])
+    for row in rows:
+        ws.append(row)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+async def test_upsert_import_counts(client):
+    prefix = uuid.uuid4().hex
+    rows = [
+        ("linux", f"{prefix}-{i}", "10.0.0.1", 22, "root", f"secret-{i}", None, "a, b", None, None)
+        for i in range(3)
+    ]
+
+    async def upsert(rows) -> dict:
+        response = await client.post(
+            "/api/export/excel",
+            params={"mode": "upsert", "key": "type,name"},
+            files={"file": ("credentials.xlsx", workbook(rows))},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    counts = await upsert(rows)
+    assert (counts["inserted"], counts["updated"], counts["unchanged"]) == (3, 0, 0)
+
+    # Importing the same file again changes nothing
+    counts = await upsert(rows)
+    assert (counts["inserted"], counts["updated"], counts["unchanged"]) == (0, 0, 3)
+
+    # Secrets compare by fingerprint, other fields by value
+    rows[0] = rows[0][:5] + ("rotated",) + rows[0][6:]
+    rows[1] = rows[1][:8] + ("new description",) + rows[1][9:]
+    counts = await upsert(rows)
+    assert (counts["inserted"], counts["updated"], counts["unchanged"]) == (0, 2, 1)
+
+
+async def test_admission_limiter_sheds_with_retry_after():
+    limiter = AdmissionLimiter("export", limit=1, queue_size=1, max_wait=0.05)
+    holder = limiter()
+    await holder.__anext__()
+
+    # Waits for the slot, then gives up
+    with pytest.raises(HTTPException) as rejected:
+        await limiter().__anext__()
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers == {"Retry-After": "1"}
+
+    # With the queue full, requests are shed right away
+    waiter = limiter()
+    waiting = asyncio.create_task(waiter.__anext__())
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as rejected:
+        await limiter().__anext__()
+    assert rejected.value.status_code == 503
+
+    await holder.aclose()
+    await waiting
+    assert limiter._semaphore.locked()
+    await waiter.aclose()
+    assert not limiter._semaphore.locked()
+
+
+async def test_busy_export_returns_503(client, monkeypatch):
+    monkeypatch.setattr(export_limiter, "_max_wait", 0.05)
+    holder = export_limiter()
+    await holder.__anext__()
+    try:
+        response = await client.get("/api/export/excel")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        await holder.aclose()
+
+    response = await client.get("/api/export/excel")
+    assert response.status_code == 200
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.database import async_session
+from app.models import Job, JobKind, JobStatus
+from app.services.jobs import JobManager, fail_stale_jobs
+
+pytestmark = pytest.mark.asyncio
+
+
+async def add_job(status: JobStatus, heartbeat_age: timedelta) -> str:
+    job_id = uuid.uuid4().hex
+    async with async_session() as session:
+        session.add(Job(
+            id=job_id, kind=JobKind.EXPORT, status=status, progress=0, worker_pid=1,
+            heartbeat_at=datetime.now(timezone.utc) - heartbeat_age,
+        ))
+        await session.commit()
+    return job_id
+
+
+async def get_job(job_id: str) -> Job:
+    async with async_session() as session:
+        return await session.get(Job, job_id)
+
+
+async def test_stale_jobs_are_failed(application):
+    stale = await add_job(JobStatus.RUNNING, timedelta(minutes=10))
+    queued = await add_job(JobStatus.PENDING, timedelta(minutes=10))
+    alive = await add_job(JobStatus.RUNNING, timedelta(seconds=1))
+    done = await add_job(JobStatus.SUCCEEDED, timedelta(minutes=10))
+
+    assert await fail_stale_jobs() >= 2
+    for job_id in (stale, queued):
+        job = await get_job(job_id)
+        assert job.status == JobStatus.FAILED
+        assert job.finished_at is not None and job.error
+    assert (await get_job(alive)).status == JobStatus.RUNNING
+    assert (await get_job(done)).status == JobStatus.SUCCEEDED
+
+
+async def test_running_jobs_keep_a_heartbeat(application, tmp_path):
+    manager = JobManager(workers=1, queue_size=1, storage_dir=str(tmp_path), ttl_hours=1, heartbeat_seconds=0.05)
+    await manager.start()
+    release = asyncio.Event()
+
+    async def wait(context):
+        await release.wait()
+
+    try:
+        job = await manager.submit(JobKind.EXPORT, wait)
+        assert job.worker_pid == os.getpid()
+        first_heartbeat = job.heartbeat_at
+        await asyncio.sleep(0.3)
+        running = await get_job(job.id)
+        assert running.status == JobStatus.RUNNING
+        assert running.heartbeat_at > first_heartbeat
+    finally:
+        release.set()
+        await asyncio.sleep(0.1)
+        await manager.stop()
+    assert (await get_job(job.id)).status == JobStatus.SUCCEEDED
+
+
+async def test_concurrent_submits_respect_the_queue_size(application, tmp_path):
+    from sqlalchemy import func, select
+
+    from app.services.jobs import JobQueueFull
+
+    manager = JobManager(workers=0, queue_size=2, storage_dir=str(tmp_path), ttl_hours=1, heartbeat_seconds=60)
+    await manager.start()
+
+    async def noop(context):
+        return None
+
+    try:
+        async with async_session() as session:
+            before = await session.scalar(select(func.count()).select_from(Job))
+        submits = (manager.submit(JobKind.EXPORT, noop) for _ in range(6))
+        results = await asyncio.gather(*submits, return_exceptions=True)
+        accepted = [r for r in results if isinstance(r, Job)]
+        assert len(accepted) == 2
+        assert all(isinstance(r, JobQueueFull) for r in results if not isinstance(r, Job))
+        # Rejected submits leave no job rows behind
+        async with async_session() as session:
+            assert await session.scalar(select(func.count()).select_from(Job)) == before + 2
+    finally:
+        await manager.stop()
+    for job in accepted:
+        assert (await get_job(job.id)).status == JobStatus.FAILED
@@ -0,0 +1,97 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from app.services.maintenance import report_path, run_maintenance
+
+
+def maintain(path, **options) -> dict:
+    return run_maintenance(
+        str(path), pages_per_step=100, step_sleep=0, analysis_limit=100, busy_timeout_ms=1000, **options
+    )
+
+
+def steps(report: dict, name: str) -> list[dict]:
+    return [step for step in report["steps"] if step["step"] == name]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "vault.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            CREATE TABLE t (id INTEGER PRIMARY KEY, a TEXT);
+            CREATE INDEX ix_t_a ON t (a COLLATE NOCASE);
+            CREATE INDEX ix_t_id_a ON t (id, a);
+            INSERT INTO t (a) VALUES ('b'), ('A'), ('c'), ('B'), ('a');
+        """)
+    return path
+
+
+def break_index(path) -> None:
+    """Make ix_t_a disagree with its table by changing its declared collation."""
+    with sqlite3.connect(path) as conn:
+        conn.executescript("""
+            PRAGMA writable_schema = ON;
+            UPDATE sqlite_master SET sql = 'CREATE INDEX ix_t_a ON t (a)' WHERE name = 'ix_t_a';
+            PRAGMA writable_schema = OFF;
+        """)
+
+
+def test_healthy_database(database):
+    report = maintain(database)
+    assert report["ok"]
+    assert [step["step"] for step in report["steps"]] == ["integrity_check", "analyze", "vacuum", "wal_checkpoint"]
+
+
+def test_broken_index_is_rebuilt(database):
+    break_index(database)
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] != "ok"
+
+    report = maintain(database)
+    first_check, second_check = steps(report, "integrity_check")
+    assert not first_check["ok"] and "ix_t_a" in first_check["messages"][0]
+    assert steps(report, "reindex")[0]["indexes"] == ["ix_t_a"]
+    assert second_check["ok"] and report["ok"]
+    with sqlite3.connect(database) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+
+def test_reindex_rebuilds_every_index(database):
+    report = maintain(database, reindex=True)
+    assert sorted(steps(report, "reindex")[0]["indexes"]) == ["ix_t_a", "ix_t_id_a"]
+    assert report["ok"]
+
+
+def test_other_damage_stops_maintenance(tmp_path):
+    path = tmp_path / "damaged.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, a TEXT)")
+        conn.executemany("INSERT INTO t (a) VALUES (?)", [("x" * 200,) for _ in range(200)])
+    with open(path, "r+b") as f:
+        page_size = 4096
+        f.seek(page_size * 3 + 100)
+        f.write(b"\xff" * 64)
+
+    report = maintain(path)
+    assert not report["ok"]
+    # Nothing is rewritten once the table data itself is damaged
+    assert [step["step"] for step in report["steps"]] == ["integrity_check"]
+
+
+@pytest.mark.asyncio
+async def test_vault_maintenance_writes_report(application):
+    from app.db.database import use_vault
+    from app.services.backup import database_path
+    from app.services.maintenance import maintain_database
+
+    async with use_vault("other"):
+        report = await maintain_database()
+        path = database_path()
+    assert report["ok"] and report["database"] == path
+    with open(report_path(path)) as f:
+        assert json.load(f)["finished_at"] == report["finished_at"]
+    assert os.stat(report_path(path)).st_mode & 0o077 == 0
@@ -0,0 +1,39 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.middleware import CompressionMiddleware
+
+pytestmark = pytest.mark.asyncio
+
+XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def make_app() -> CompressionMiddleware:
+    def body(media_type: str):
+        return lambda request: Response(b"x" * 4096, media_type=media_type)
+
+    app = Starlette(routes=[
+        Route("/json", body("application/json")),
+        Route("/xlsx", body(XLSX)),
+        Route("/api/events", body("text/event-stream")),
+    ])
+    return CompressionMiddleware(
+        app, minimum_size=1024, exclude_paths=("/api/events",), exclude_media_types=(XLSX,)
+    )
+
+
+async def test_compression_skips_excluded_paths_and_media_types():
+    transport = httpx.ASGITransport(app=make_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        headers = {"Accept-Encoding": "gzip"}
+        response = await client.get("/json", headers=headers)
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == b"x" * 4096
+
+        for path in ("/xlsx", "/api/events"):
+            response = await client.get(path, headers=headers)
+            assert "content-encoding" not in response.headers, path
+            assert response.headers["content-length"] == "4096"
@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def group_of(groups: list[dict], credential_id: int) -> set[int]:
+    for group in groups:
+        ids = {c["id"] for c in group["credentials"]}
+        if credential_id in ids:
+            assert group["count"] == len(ids)
+            return ids
+    return set()
+
+
+async def test_reuse_report_groups_shared_secrets(client, make_credential):
+    password = unique("shared")
+    first = await make_credential(name=unique("cred"), password=password)
+    second = await make_credential(name=unique("cred"), password=password, extra_data={"a": 1, "b": 2})
+    third = await make_credential(name=unique("cred"), password=unique("own"), extra_data={"b": 2, "a": 1})
+
+    response = await client.get("/api/reports/reuse")
+    assert response.status_code == 200
+    report = response.json()
+    assert group_of(report["password_reuse"], first["id"]) == {first["id"], second["id"]}
+    assert group_of(report["password_reuse"], third["id"]) == set()
+    # Extra data fingerprints do not depend on key order
+    assert group_of(report["extra_data_reuse"], second["id"]) == {second["id"], third["id"]}
+    assert report["unindexed"] == 0
+
+
+async def test_reuse_report_finds_duplicates(client, make_credential):
+    host = f"{unique('host')}.example.com"
+    # No port groups with port 0, no user name with an empty one; the host index ignores case
+    no_port = await make_credential(name=unique("cred"), host=host)
+    port_zero = await make_credential(name=unique("cred"), host=host.upper(), port=0)
+    ssh = await make_credential(name=unique("cred"), host=host, port=22, username="root")
+    ssh_again = await make_credential(name=unique("cred"), host=host, port=22, username="root")
+    other_user = await make_credential(name=unique("cred"), host=host, port=22, username="admin")
+    other_type = await make_credential(name=unique("cred"), host=host, type="ftp")
+
+    duplicates = (await client.get("/api/reports/reuse")).json()["duplicates"]
+    assert group_of(duplicates, no_port["id"]) == {no_port["id"], port_zero["id"]}
+    assert group_of(duplicates, ssh["id"]) == {ssh["id"], ssh_again["id"]}
+    assert group_of(duplicates, other_user["id"]) == set()
+    assert group_of(duplicates, other_type["id"]) == set()
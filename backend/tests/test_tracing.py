@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.services import tracing
+from app.services.tracing import InMemoryExporter, Tracer, TracingMiddleware, install_sql_tracing
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def tracer(monkeypatch) -> Tracer:
+    """The process tracer, switched to the memory exporter."""
+    tracer = Tracer(InMemoryExporter())
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    return tracer
+
+
+async def test_spans_nest_under_the_current_span(tracer):
+    def in_thread():
+        with tracer.span("thread"):
+            pass
+
+    with tracer.span("outer") as outer:
+        with tracer.span("inner", rows=3) as inner:
+            await asyncio.to_thread(in_thread)
+        with pytest.raises(ValueError), tracer.span("failing"):
+            raise ValueError("boom")
+    assert tracing.current_span() is None
+
+    [trace] = tracer.exporter.traces(limit=10)
+    assert trace["trace_id"] == outer.trace_id and trace["name"] == "outer"
+    spans = {span["name"]: span for span in trace["spans"]}
+    assert list(spans) == ["outer", "inner", "thread", "failing"]
+    assert spans["outer"]["parent_id"] is None
+    assert spans["inner"]["parent_id"] == outer.span_id and spans["inner"]["attributes"] == {"rows": 3}
+    assert spans["thread"]["parent_id"] == inner.span_id
+    assert spans["failing"]["parent_id"] == outer.span_id
+    assert spans["failing"]["error"] == "ValueError: boom"
+
+
+async def test_memory_exporter_keeps_recent_traces(tracer):
+    for name in ("first", "second", "third"):
+        with tracer.span(name):
+            pass
+    assert [t["name"] for t in tracer.exporter.traces(limit=2)] == ["third", "second"]
+
+    exporter = InMemoryExporter(maxlen=2)
+    for name in ("first", "second", "third"):
+        Tracer(exporter).end_span(Tracer(exporter).start_span(name))
+    assert [span.name for span in exporter.spans] == ["second", "third"]
+
+
+async def test_request_and_sql_spans(application, tracer, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/tracing.db")
+    install_sql_tracing(engine)
+
+    async def handler(request):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            with pytest.raises(OperationalError):
+                await conn.execute(text("SELECT missing"))
+            assert not conn.sync_connection.info[tracing._SQL_SPANS_KEY]
+        return PlainTextResponse("ok")
+
+    app = TracingMiddleware(Starlette(routes=[Route("/items", handler)]), tracer)
+    trace_id, parent_id = "0af7651916cd43dd8448eb211c80319c", "b7ad6b7169203331"
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/items", headers={"traceparent": f"00-{trace_id}-{parent_id}-01"})
+    finally:
+        await engine.dispose()
+
+    # The caller's trace is continued
+    assert response.headers["X-Trace-Id"] == trace_id
+    [trace] = tracer.exporter.traces(limit=10)
+    request_span = next(span for span in trace["spans"] if span["parent_id"] == parent_id)
+    assert request_span["name"] == "GET /items"
+    assert request_span["attributes"]["http.status_code"] == 200
+
+    queries = [span for span in trace["spans"] if span["name"] == "db.query"]
+    assert [span["attributes"]["db.statement"] for span in queries] == ["SELECT 1", "SELECT missing"]
+    assert all(span["parent_id"] == request_span["span_id"] for span in queries)
+    assert queries[0]["error"] is None and "no such column" in queries[1]["error"]
+
+
+async def test_traces_endpoint(client, monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", Tracer(None))
+    response = await client.get("/api/diagnostics/traces")
+    assert response.status_code == 404
+
+    tracer = Tracer(InMemoryExporter())
+    monkeypatch.setattr(tracing, "_tracer", tracer)
+    with tracer.span("export"):
+        with tracer.span("crypto.decrypt"):
+            pass
+    response = await client.get("/api/diagnostics/traces")
+    assert response.status_code == 200
+    # The request's own spans (token check) are traces too
+    [trace] = [t for t in response.json() if t["name"] == "export"]
+    assert [span["name"] for span in trace["spans"]] == ["export", "crypto.decrypt"]
+    assert (await client.get("/api/diagnostics/traces", params={"min_ms": 10**6})).json() == []
@@ -0,0 +1,98 @@
+import sqlite3
+import uuid
+
+import pytest
+
+from app.db.database import create_vault_engine, init_db
+
+pytestmark = pytest.mark.asyncio
+
+
+async def names_in(client, vault=None) -> set[str]:
+    headers = {"X-Vault": vault} if vault else {}
+    response = await client.get("/api/credentials", params={"page_size": 100}, headers=headers)
+    assert response.status_code == 200
+    return {item["name"] for item in response.json()["items"]}
+
+
+async def test_vaults_are_isolated(client):
+    default_name, other_name = f"default-{uuid.uuid4().hex}", f"other-{uuid.uuid4().hex}"
+    response = await client.post("/api/credentials", json={"name": default_name, "type": "linux"})
+    assert response.status_code == 201
+    response = await client.post(
+        "/api/credentials", json={"name": other_name, "type": "linux"}, headers={"X-Vault": "other"}
+    )
+    assert response.status_code == 201
+    other_id = response.json()["id"]
+
+    assert default_name in await names_in(client) and other_name not in await names_in(client)
+    assert other_name in await names_in(client, "other") and default_name not in await names_in(client, "other")
+
+    # Ids are per vault: the same id in the default vault is another credential or none
+    response = await client.get(f"/api/credentials/{other_id}", params={"vault": "other"})
+    assert response.json()["name"] == other_name
+    response = await client.get(f"/api/credentials/{other_id}")
+    assert response.status_code == 404 or response.json()["name"] != other_name
+
+    response = await client.get("/api/credentials", headers={"X-Vault": "missing"})
+    assert response.status_code == 404
+
+
+def auto_vacuum(path) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+
+async def test_new_vault_files_use_incremental_auto_vacuum(application, tmp_path):
+    path = tmp_path / "new.db"
+    engine = create_vault_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        await init_db(engine)
+    finally:
+        await engine.dispose()
+    assert auto_vacuum(path) == 2
+
+
+async def test_existing_files_are_converted_by_full_vacuum(application, tmp_path):
+    from app.services.maintenance import run_maintenance
+
+    path = tmp_path / "old.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY)")
+    engine = create_vault_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        await init_db(engine)
+    finally:
+        await engine.dispose()
+    assert auto_vacuum(path) == 0
+
+    def vacuum_mode(**options) -> str:
+        report = run_maintenance(str(path), 100, 0, 100, 1000, **options)
+        return next(step for step in report["steps"] if step["step"] == "vacuum")["mode"]
+
+    assert vacuum_mode() == "skipped"
+    assert vacuum_mode(full_vacuum=True) == "full"
+    assert auto_vacuum(path) == 2
+
+
+async def test_collection_etags_name_the_vault(client, monkeypatch):
+    from datetime import datetime, timezone
+
+    from app.api import conditional
+
+    # Both vaults at the same version counter
+    async def same_version(db, resource):
+        return 7, datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    monkeypatch.setattr(conditional, "get_version", same_version)
+
+    for path in ("/api/credentials", "/api/categories", "/api/audit-logs"):
+        response = await client.get(path)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        assert "X-Vault" in response.headers["Vary"] and "Authorization" in response.headers["Vary"]
+
+        assert (await client.get(path, headers={"If-None-Match": etag})).status_code == 304
+        response = await client.get(path, headers={"If-None-Match": etag, "X-Vault": "other"})
+        assert response.status_code == 200, path
+        assert response.headers["ETag"] != etag
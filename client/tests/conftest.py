@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+CREDENTIAL_PATH = re.compile(r"^/api/credentials/(\d+)$")
+
+
+class FakeApi:
+    """Stand-in for the server's login, get and batch-get endpoints.
+
+    Requests are recorded with the client port they arrived from, so tests
+    can tell whether connections were reused.
+    """
+
+    def __init__(self):
+        self.credentials = {
+            i: {"id": i, "name": f"cred-{i}", "password": f"secret-{i}", "vault": None} for i in range(1, 1101)
+        }
+        self.requests: list[tuple[str, str, dict, int]] = []
+        self.logins = 0
+        self.expires_in = 3600
+        self.valid_tokens: set[str] = set()
+        self.lock = threading.Lock()
+
+    def bodies(self, path: str) -> list[dict]:
+        """Bodies of the recorded requests to ``path``."""
+        return [body for _, request_path, body, _ in self.requests if request_path == path]
+
+    def item(self, credential_id: int, vault: str | None) -> dict:
+        return {**self.credentials[credential_id], "vault": vault}
+
+    def handle(self, method: str, path: str, headers, body: dict) -> tuple[int, dict]:
+        if path == "/api/auth/login":
+            with self.lock:
+                self.logins += 1
+                token = f"token-{self.logins}"
+                self.valid_tokens.add(token)
+            return 200, {"access_token": token, "token_type": "bearer", "expires_in": self.expires_in}
+
+        if headers.get("Authorization", "").removeprefix("Bearer ") not in self.valid_tokens:
+            return 401, {"detail": "Invalid token"}
+        vault = headers.get("X-Vault")
+
+        match = CREDENTIAL_PATH.match(path)
+        if method == "GET" and match:
+            credential_id = int(match.group(1))
+            if credential_id not in self.credentials:
+                return 404, {"detail": "Credential not found"}
+            return 200, self.item(credential_id, vault)
+
+        if method == "POST" and path == "/api/credentials/batch-get":
+            if len(body["ids"]) > 500:
+                return 422, {"detail": "Too many ids"}
+            items = [self.item(i, vault) for i in body["ids"] if i in self.credentials]
+            if body.get("fields") is not None:
+                items = [{k: v for k, v in item.items() if k in body["fields"] or k == "id"} for item in items]
+            return 200, {"items": items, "not_found": [i for i in body["ids"] if i not in self.credentials]}
+
+        return 404, {"detail": "Not Found"}
+
+
+@pytest.fixture
+def api():
+    fake = FakeApi()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+        disable_nagle_algorithm = True
+
+        def _serve(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else {}
+            with fake.lock:
+                fake.requests.append((self.command, self.path, body, self.client_address[1]))
+            status, payload = fake.handle(self.command, self.path, self.headers, body)
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = _serve
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    fake.url = f"http://127.0.0.1:{server.server_port}"
+    yield fake
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from whatsmypasswd_client import AsyncClient, Client, NotFound, WhatsmypasswdError
+from whatsmypasswd_client import _base
+
+BATCH_GET = "/api/credentials/batch-get"
+
+
+def test_connections_and_tokens_are_reused(api):
+    with Client(api.url, "password") as client:
+        for credential_id in range(1, 21):
+            assert client.get_password(credential_id) == f"secret-{credential_id}"
+
+    assert api.logins == 1
+    # One pooled keep-alive connection for the login and all 20 lookups
+    assert len({port for *_, port in api.requests}) == 1
+
+
+def test_token_is_renewed(api):
+    # Expires within the refresh margin: every call logs in again first
+    api.expires_in = 30
+    with Client(api.url, "password", refresh_margin=60) as client:
+        client.get(1)
+        client.get(2)
+    assert api.logins == 2
+
+    api.expires_in = 3600
+    with Client(api.url, "password") as client:
+        client.get(1)
+        # Server-side revocation: one new login, then the request is retried
+        api.valid_tokens.clear()
+        assert client.get(2)["id"] == 2
+    assert api.logins == 4
+
+
+def test_errors(api):
+    with Client(api.url, "password") as client:
+        with pytest.raises(NotFound):
+            client.get(10**6)
+        with pytest.raises(WhatsmypasswdError) as error:
+            client.request("POST", BATCH_GET, json={"ids": list(range(501))})
+        assert error.value.status_code == 422
+
+
+def test_get_many_is_chunked(api):
+    ids = list(range(1, 1201)) + [1, 2]
+    with Client(api.url, "password") as client:
+        found = client.get_many(ids)
+
+    assert list(found) == list(range(1, 1101))
+    assert [len(body["ids"]) for body in api.bodies(BATCH_GET)] == [500, 500, 200]
+
+
+def test_get_many_fields(api):
+    with Client(api.url, "password", cache_ttl=60) as client:
+        assert client.get_many([1, 2], fields=["password"]) == {
+            1: {"id": 1, "password": "secret-1"}, 2: {"id": 2, "password": "secret-2"},
+        }
+        # Partial results are not cached
+        assert client.get(1)["name"] == "cred-1"
+    assert api.bodies(BATCH_GET) == [{"ids": [1, 2], "fields": ["password"]}]
+
+
+def test_cache(api, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(_base.time, "monotonic", lambda: now[0])
+
+    with Client(api.url, "password", cache_ttl=30) as client:
+        client.get(1)
+        client.get(1)
+        # Only the ids not cached yet are fetched
+        assert list(client.get_many([1, 2, 3])) == [1, 2, 3]
+        assert api.bodies(BATCH_GET) == [{"ids": [2, 3]}]
+        assert [path for _, path, *_ in api.requests].count("/api/credentials/1") == 1
+
+        # Expired entries are fetched again
+        now[0] += 31
+        client.get_many([1, 2])
+        assert api.bodies(BATCH_GET)[-1] == {"ids": [1, 2]}
+
+        client.clear_cache()
+        client.get(3)
+        assert [path for _, path, *_ in api.requests].count("/api/credentials/3") == 1
+
+
+def test_cache_is_per_vault(api):
+    with Client(api.url, "password", cache_ttl=30) as default, \
+            Client(api.url, "password", vault="other", cache_ttl=30) as other:
+        # Clients share nothing, but a shared cache must not mix vaults either
+        other._cache = default._cache
+        assert default.get(1)["vault"] is None
+        assert other.get(1)["vault"] == "other"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_gets_share_batch_requests(api):
+    async with AsyncClient(api.url, "password") as client:
+        items = await asyncio.gather(*(client.get(i) for i in [1, 2, 3, 2, 1]))
+        assert [item["id"] for item in items] == [1, 2, 3, 2, 1]
+        assert api.bodies(BATCH_GET) == [{"ids": [1, 2, 3]}]
+
+        # A missing id fails only its own caller
+        results = await asyncio.gather(client.get(4), client.get(10**6), return_exceptions=True)
+        assert results[0]["id"] == 4 and isinstance(results[1], NotFound)
+
+        # A full batch is sent without waiting for the window
+        await asyncio.gather(*(client.get(i) for i in range(1, 601)))
+    assert [len(body["ids"]) for body in api.bodies(BATCH_GET)] == [3, 2, 500, 100]
+    assert api.logins == 1
+
+
+@pytest.mark.asyncio
+async def test_async_get_many_is_chunked_and_cached(api):
+    async with AsyncClient(api.url, "password", cache_ttl=30) as client:
+        found = await client.get_many(list(range(1, 1201)))
+        assert len(found) == 1100
+        assert sorted(len(body["ids"]) for body in api.bodies(BATCH_GET)) == [200, 500, 500]
+
+        assert (await client.get(7))["password"] == "secret-7"
+        assert len(api.bodies(BATCH_GET)) == 3
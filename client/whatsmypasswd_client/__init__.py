@@ -0,0 +1,10 @@
+from whatsmypasswd_client._base import NotFound, WhatsmypasswdError
+from whatsmypasswd_client.async_client import AsyncClient
+from whatsmypasswd_client.client import Client
+
+__all__ = [
+    "AsyncClient",
+    "Client",
+    "NotFound",
+    "WhatsmypasswdError",
+]
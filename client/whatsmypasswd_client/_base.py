@@ -0,0 +1,153 @@
+import importlib.util
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+# Largest id list the batch-get endpoint accepts
+BATCH_SIZE = 500
+
+
+class WhatsmypasswdError(Exception):
+    """An API request failed."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(f"HTTP {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class NotFound(WhatsmypasswdError):
+    """The requested credential does not exist."""
+
+
+class TTLCache:
+    """Thread-safe in-memory LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, ttl: float, maxsize: int = 4096):
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self._ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class BaseClient:
+    """State shared by the sync and async clients: token, cache and response handling."""
+
+    def __init__(
+        self,
+        base_url: str,
+        password: str,
+        vault: Optional[str] = None,
+        cache_ttl: float = 0.0,
+        refresh_margin: float = 60.0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.vault = vault
+        self._password = password
+        self._refresh_margin = refresh_margin
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._cache = TTLCache(cache_ttl) if cache_ttl > 0 else None
+
+    @classmethod
+    def settings_from_env(cls) -> dict:
+        """Constructor arguments from WHATSMYPASSWD_URL, _PASSWORD, _VAULT and _CACHE_TTL."""
+        settings = {
+            "base_url": os.environ["WHATSMYPASSWD_URL"],
+            "password": os.environ["WHATSMYPASSWD_PASSWORD"],
+            "vault": os.environ.get("WHATSMYPASSWD_VAULT") or None,
+        }
+        if os.environ.get("WHATSMYPASSWD_CACHE_TTL"):
+            settings["cache_ttl"] = float(os.environ["WHATSMYPASSWD_CACHE_TTL"])
+        return settings
+
+    def _client_options(self, timeout: float, http2: Optional[bool], max_connections: int) -> dict:
+        import httpx
+
+        headers = {"X-Vault": self.vault} if self.vault else {}
+        return {
+            "base_url": self.base_url,
+            "timeout": timeout,
+            # HTTP/2 multiplexes concurrent lookups over one connection when h2 is installed
+            "http2": http2_available() if http2 is None else http2,
+            "limits": httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            "headers": headers,
+        }
+
+    def _token_valid(self) -> bool:
+        return self._token is not None and time.monotonic() < self._token_expires_at - self._refresh_margin
+
+    def _store_token(self, response) -> None:
+        body = self._json(response)
+        self._token = body["access_token"]
+        self._token_expires_at = time.monotonic() + body["expires_in"]
+
+    def _auth_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self._token}"}
+
+    @staticmethod
+    def _json(response) -> Any:
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get("detail")
+            except ValueError:
+                detail = response.text
+            error = NotFound if response.status_code == 404 else WhatsmypasswdError
+            raise error(response.status_code, detail)
+        if response.status_code == 204:
+            return None
+        return response.json()
+
+    # Cache keys include the vault: ids repeat across vaults
+    def _cached(self, ids: Iterable[int]) -> dict[int, dict]:
+        if self._cache is None:
+            return {}
+        found = {}
+        for credential_id in ids:
+            item = self._cache.get((self.vault, credential_id))
+            if item is not None:
+                found[credential_id] = item
+        return found
+
+    def _remember(self, items: Iterable[dict]) -> None:
+        if self._cache is not None:
+            for item in items:
+                self._cache.set((self.vault, item["id"]), item)
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+
+def batches(ids: list[int]) -> Iterable[list[int]]:
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
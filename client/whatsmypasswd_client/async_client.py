@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+from whatsmypasswd_client._base import BATCH_SIZE, BaseClient, NotFound, batches
+
+# Seconds get() waits for other lookups to join the same batch-get request
+BATCH_WINDOW = 0.002
+
+
+class AsyncClient(BaseClient):
+    """Asynchronous API client; concurrent ``get`` calls are coalesced into batch-get requests.
+
+        async with AsyncClient.from_env() as client:
+            secrets = await asyncio.gather(*(client.get(i) for i in ids))
+
+    Lookups issued within ``batch_window`` seconds of each other (or until
+    500 ids are pending) are answered by one ``POST /api/credentials/batch-get``.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        password: str,
+        vault: Optional[str] = None,
+        cache_ttl: float = 0.0,
+        timeout: float = 10.0,
+        http2: Optional[bool] = None,
+        max_connections: int = 10,
+        refresh_margin: float = 60.0,
+        batch_window: float = BATCH_WINDOW,
+    ):
+        super().__init__(base_url, password, vault, cache_ttl, refresh_margin)
+        self._http = httpx.AsyncClient(**self._client_options(timeout, http2, max_connections))
+        self._login_lock = asyncio.Lock()
+        self._batch_window = batch_window
+        self._pending: dict[int, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls, **overrides) -> "AsyncClient":
+        return cls(**{**cls.settings_from_env(), **overrides})
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self._http.aclose()
+
+    async def login(self) -> None:
+        """Obtain a fresh access token."""
+        response = await self._http.post("/api/auth/login", json={"password": self._password})
+        self._store_token(response)
+
+    async def _ensure_token(self) -> None:
+        if not self._token_valid():
+            async with self._login_lock:
+                if not self._token_valid():
+                    await self.login()
+
+    async def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send an authenticated request and return the decoded JSON body."""
+        await self._ensure_token()
+        response = await self._http.request(method, path, headers=self._auth_headers(), **kwargs)
+        if response.status_code == 401:
+            # Token revoked or the server's secret rotated: log in again once
+            await self.login()
+            response = await self._http.request(method, path, headers=self._auth_headers(), **kwargs)
+        return self._json(response)
+
+    async def get(self, credential_id: int) -> dict:
+        """One credential with decrypted secrets. Raises NotFound."""
+        cached = self._cached([credential_id])
+        if cached:
+            return cached[credential_id]
+
+        future = self._pending.get(credential_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[credential_id] = future
+            if len(self._pending) >= BATCH_SIZE:
+                if self._flush_handle is not None:
+                    self._flush_handle.cancel()
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self._batch_window, self._flush)
+        # Shielded so one cancelled caller does not fail others waiting on the same id
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = asyncio.create_task(self._resolve(pending))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _resolve(self, pending: dict[int, asyncio.Future]) -> None:
+        try:
+            result = await self.request("POST", "/api/credentials/batch-get", json={"ids": list(pending)})
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self._remember(result["items"])
+        items = {item["id"]: item for item in result["items"]}
+        for credential_id, future in pending.items():
+            if future.done():
+                continue
+            if credential_id in items:
+                future.set_result(items[credential_id])
+            else:
+                future.set_exception(NotFound(404, "Credential not found"))
+
+    async def get_many(self, ids: list[int], fields: Optional[list[str]] = None) -> dict[int, dict]:
+        """Credentials by id in as few requests as possible; missing ids are left out.
+
+        ``fields`` limits the response (and the decryption work) to those
+        fields; such partial results bypass the cache.
+        """
+        ids = list(dict.fromkeys(ids))
+        found = self._cached(ids) if fields is None else {}
+        missing = [i for i in ids if i not in found]
+        extra = {"fields": fields} if fields is not None else {}
+        results = await asyncio.gather(*(
+            self.request("POST", "/api/credentials/batch-get", json={"ids": batch, **extra})
+            for batch in batches(missing)
+        ))
+        for result in results:
+            if fields is None:
+                self._remember(result["items"])
+            found.update((item["id"], item) for item in result["items"])
+        return {i: found[i] for i in ids if i in found}
+
+    async def get_password(self, credential_id: int) -> Optional[str]:
+        return (await self.get(credential_id))["password"]
+
+    async def list(self, page: int = 1, page_size: int = 100, **filters) -> dict:
+        """One page of credentials; filters as in ``GET /api/credentials``."""
+        params = {"page": page, "page_size": page_size, **{k: v for k, v in filters.items() if v is not None}}
+        return await self.request("GET", "/api/credentials", params=params)
+
+    async def iter_all(self, page_size: int = 100, **filters) -> AsyncIterator[dict]:
+        """Every credential matching ``filters``, page by page."""
+        page = 1
+        while True:
+            result = await self.list(page=page, page_size=page_size, **filters)
+            self._remember(result["items"])
+            for item in result["items"]:
+                yield item
+            if page >= result["total_pages"]:
+                return
+            page += 1
+
+    async def find(self, name: str, **filters) -> dict:
+        """The credential with exactly this name. Raises NotFound."""
+        async for item in self.iter_all(search=name, **filters):
+            if item["name"] == name:
+                return item
+        raise NotFound(404, f"No credential named {name!r}")
+
+    async def categories(self) -> list[dict]:
+        return await self.request("GET", "/api/categories")
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Iterator, Optional
+
+import httpx
+
+from whatsmypasswd_client._base import BaseClient, NotFound, batches
+
+
+class Client(BaseClient):
+    """Synchronous API client with a pooled connection and automatic login.
+
+    The JWT is obtained on first use and renewed ``refresh_margin`` seconds
+    before it expires. With ``cache_ttl`` set, credentials fetched by id are
+    reused for that many seconds (served from the cache, such reads are not
+    audited again by the server).
+
+        with Client("https://vault.example.com", password) as client:
+            secrets = client.get_many([1, 2, 3])
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        password: str,
+        vault: Optional[str] = None,
+        cache_ttl: float = 0.0,
+        timeout: float = 10.0,
+        http2: Optional[bool] = None,
+        max_connections: int = 10,
+        refresh_margin: float = 60.0,
+    ):
+        super().__init__(base_url, password, vault, cache_ttl, refresh_margin)
+        self._http = httpx.Client(**self._client_options(timeout, http2, max_connections))
+        self._login_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **overrides) -> "Client":
+        return cls(**{**cls.settings_from_env(), **overrides})
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._http.close()
+
+    def login(self) -> None:
+        """Obtain a fresh access token."""
+        response = self._http.post("/api/auth/login", json={"password": self._password})
+        self._store_token(response)
+
+    def _ensure_token(self) -> None:
+        if not self._token_valid():
+            with self._login_lock:
+                if not self._token_valid():
+                    self.login()
+
+    def request(self, method: str, path: str, **kwargs) -> Any:
+        """Send an authenticated request and return the decoded JSON body."""
+        self._ensure_token()
+        response = self._http.request(method, path, headers=self._auth_headers(), **kwargs)
+        if response.status_code == 401:
+            # Token revoked or the server's secret rotated: log in again once
+            self.login()
+            response = self._http.request(method, path, headers=self._auth_headers(), **kwargs)
+        return self._json(response)
+
+    def get(self, credential_id: int) -> dict:
+        """One credential with decrypted secrets. Raises NotFound."""
+        cached = self._cached([credential_id])
+        if cached:
+            return cached[credential_id]
+        item = self.request("GET", f"/api/credentials/{credential_id}")
+        self._remember([item])
+        return item
+
+    def get_many(self, ids: list[int], fields: Optional[list[str]] = None) -> dict[int, dict]:
+        """Credentials by id in as few requests as possible; missing ids are left out.
+
+        ``fields`` limits the response (and the decryption work) to those
+        fields; such partial results bypass the cache.
+        """
+        ids = list(dict.fromkeys(ids))
+        found = self._cached(ids) if fields is None else {}
+        missing = [i for i in ids if i not in found]
+        for batch in batches(missing):
+            body = {"ids": batch, **({"fields": fields} if fields is not None else {})}
+            items = self.request("POST", "/api/credentials/batch-get", json=body)["items"]
+            if fields is None:
+                self._remember(items)
+            found.update((item["id"], item) for item in items)
+        return {i: found[i] for i in ids if i in found}
+
+    def get_password(self, credential_id: int) -> Optional[str]:
+        return self.get(credential_id)["password"]
+
+    def list(self, page: int = 1, page_size: int = 100, **filters) -> dict:
+        """One page of credentials; filters as in ``GET /api/credentials``."""
+        params = {"page": page, "page_size": page_size, **{k: v for k, v in filters.items() if v is not None}}
+        return self.request("GET", "/api/credentials", params=params)
+
+    def iter_all(self, page_size: int = 100, **filters) -> Iterator[dict]:
+        """Every credential matching ``filters``, page by page."""
+        page = 1
+        while True:
+            result = self.list(page=page, page_size=page_size, **filters)
+            self._remember(result["items"])
+            yield from result["items"]
+            if page >= result["total_pages"]:
+                return
+            page += 1
+
+    def find(self, name: str, **filters) -> dict:
+        """The credential with exactly this name. Raises NotFound."""
+        for item in self.iter_all(search=name, **filters):
+            if item["name"] == name:
+                return item
+        raise NotFound(404, f"No credential named {name!r}")
+
+    def categories(self) -> list[dict]:
+        return self.request("GET", "/api/categories")